@@ -76,6 +76,29 @@ class DatExportHandler:
             default=None,
         )
 
+        parser.add_argument(
+            '--io-stats',
+            help='Print a summary of the file system reads',
+            action='store_true',
+            dest='io_stats',
+        )
+
+        parser.add_argument(
+            '--io-stats-file',
+            help='Write the file system read stats as JSON to the given file',
+            dest='io_stats_file',
+            default=None,
+        )
+
+        parser.add_argument(
+            '--workers',
+            help='Number of processes to read the .dat files with; 0 to use '
+                 'one process per CPU',
+            type=int,
+            dest='workers',
+            default=1,
+        )
+
     def handle(self, args):
         ver = config.get_option('version')
 
@@ -110,8 +133,11 @@ class DatExportHandler:
 
         console(prefix + 'Loading file system...')
 
-        file_system = FileSystem(root_path=path)
-        
+        file_system = FileSystem(
+            root_path=path,
+            stats=args.io_stats or args.io_stats_file is not None,
+        )
+
         console(prefix + 'Reading .dat files')
 
         dat_files = {}
@@ -120,26 +146,32 @@ class DatExportHandler:
         if lang != 'English':
             #ggpk_data = index.get_dir_record("Data/%s" % lang)
             dir_path = "Data/%s/" % lang
-        remove = []
-        for name in tqdm(args.files):
-            file_path = dir_path + name
-            try:
-                data = file_system.get_file(file_path)
-            except FileNotFoundError:
-                console('Skipping "%s" (missing)' % file_path, msg=Msg.warning)
-                remove.append(name)
-                continue
-
-            df = dat.DatFile(name)
-
-            df.read(file_path_or_raw=data, use_dat_value=False)
-
+        # Read the files grouped by bundle, so every bundle is only touched
+        # once
+        names = {dir_path + name: name for name in args.files}
+        files = (
+            (names[file_path], data) for file_path, data in
+            file_system.get_files(names, ignore_missing=True)
+        )
+        for name, df in tqdm(
+                dat.read_dat_files(files, workers=args.workers),
+                total=len(names)):
             dat_files[name] = df
 
-        for file_name in remove:
-            args.files.remove(file_name)
+        for name in list(args.files):
+            if name not in dat_files:
+                console('Skipping "%s" (missing)' % (dir_path + name),
+                        msg=Msg.warning)
+                args.files.remove(name)
+
+        if file_system.stats is not None:
+            if args.io_stats:
+                console(prefix + 'File system stats:\n' +
+                        file_system.stats.get_summary())
+            if args.io_stats_file:
+                file_system.stats.dump(args.io_stats_file)
 
-        return dat_files
+        return {name: dat_files[name] for name in args.files}
 
 
 # =============================================================================
@@ -1446,6 +1446,9 @@ class BaseParser:
 
     _TC_KWARGS = {}
 
+    # Number of images collected before they are written with _write_dds_many
+    _DDS_BATCH_SIZE = 64
+
     _files = []
     _translations = []
 
@@ -1534,9 +1537,32 @@ class BaseParser:
         )
 
     def _write_dds(self, data, out_path, parsed_args):
+        self._write_extracted_dds(
+            self.file_system.extract_dds(data), out_path, parsed_args)
+
+    def _write_dds_many(self, images, parsed_args):
+        """
+        Writes multiple .dds files, extracting shared textures only once.
+
+        Parameters
+        ----------
+        images : dict[str, str]
+            Mapping of output path -> .dds file path
+        parsed_args : argparse.Namespace
+            Parsed command line arguments
+        """
+        out_paths = {}
+        for out_path, path in images.items():
+            out_paths.setdefault(path, []).append(out_path)
+
+        for path, data in self.file_system.extract_dds_many(out_paths):
+            for out_path in out_paths[path]:
+                self._write_extracted_dds(data, out_path, parsed_args)
+
+    def _write_extracted_dds(self, data, out_path, parsed_args):
         out_path = fix_path(out_path)
         with open(out_path, 'wb') as f:
-            f.write(self.file_system.extract_dds(data))
+            f.write(data)
 
             console('Wrote "%s"' % out_path)
 
@@ -2769,6 +2769,9 @@ class ItemsParser(SkillParserShared):
 
         console('Processing item information...')
 
+        # out path -> .dds file path, written in batches while processing
+        images = OrderedDict()
+
         for base_item_type in items:
             name = base_item_type['Name']
             cls_id = base_item_type['ItemClassesKey']['Id']
@@ -2849,15 +2852,16 @@ class ItemsParser(SkillParserShared):
                     )
                     continue
 
-                self._write_dds(
-                    data=self.file_system.get_file(
-                        base_item_type['ItemVisualIdentityKey']['DDSFile']),
-                    out_path=os.path.join(self._img_path, (
-                        infobox.get('inventory_icon') or page) +
-                        ' inventory icon.dds',
-                    ),
-                    parsed_args=parsed_args,
-                )
+                images[os.path.join(self._img_path, (
+                    infobox.get('inventory_icon') or page) +
+                    ' inventory icon.dds',
+                )] = base_item_type['ItemVisualIdentityKey']['DDSFile']
+                if len(images) >= self._DDS_BATCH_SIZE:
+                    self._write_dds_many(images, parsed_args)
+                    images.clear()
+
+        if images:
+            self._write_dds_many(images, parsed_args)
 
         return r
 
@@ -39,6 +39,10 @@ Classes
 
 .. autoclass: Bundle
 
+.. autoclass: BundleCache
+
+.. autoclass: BundleDiskCache
+
 .. autoclass: Index
 
 Index Records
@@ -51,6 +55,15 @@ Index Records
 .. autoclass: FileRecord
 
 .. autoclass: DirectoryRecord
+
+.. autoclass: IndexRecordTable
+
+Functions
+-------------------------------------------------------------------------------
+
+.. autofunction: fnv1a_64
+
+.. autofunction: fnv1a_64_many
 """
 
 # =============================================================================
@@ -58,21 +71,37 @@ Index Records
 # =============================================================================
 
 # python
+import hashlib
+import mmap
+import operator
 import struct
 import os
+import subprocess
+import threading
+import warnings
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from io import BytesIO
+from itertools import islice
 from tempfile import TemporaryDirectory
-from typing import List, Union, Dict, Tuple
+from typing import List, Union, Dict, Tuple, Iterable, Iterator, Sequence, Set
 
 # 3rd party
-from fnvhash import fnv1a_64
-
 try:
     import cffi
 except ImportError:
     cffi = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # self
 from PyPoE.shared.mixins import ReprMixin
 from PyPoE.shared.decorators import doc
@@ -87,7 +116,11 @@ __all__ = [
 
     'IndexRecord', 'BundleRecord', 'FileRecord', 'DirectoryRecord',
 
-    'Bundle', 'Index'
+    'IndexRecordTable',
+
+    'Bundle', 'BundleCache', 'BundleDiskCache', 'Index',
+
+    'fnv1a_64', 'fnv1a_64_many',
 ]
 
 if cffi:
@@ -103,6 +136,89 @@ if cffi:
 else:
     ooz = None
 
+# Name or path of the ooz commandline tool used if the library is unavailable
+OOZ_COMMAND = 'ooz'
+
+# Decompressed size of the blocks of an oodle stream
+OODLE_BLOCK_SIZE = 0x40000
+
+FNV1_64_INIT = 0xcbf29ce484222325
+FNV_64_PRIME = 0x100000001b3
+FNV_64_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Minimum number of values for which hashing with numpy is faster
+FNV_NUMPY_THRESHOLD = 64
+
+# =============================================================================
+# Functions
+# =============================================================================
+
+
+def fnv1a_64(data: bytes,
+             _prime: int = FNV_64_PRIME,
+             _mask: int = FNV_64_MASK) -> int:
+    """
+    Calculates the 64 bit FNV1a hash value of the given data.
+
+    Parameters
+    ----------
+    data
+        The data to hash
+
+    Returns
+    -------
+    Calculated 64 bit FNV1a hash value
+    """
+    hval = FNV1_64_INIT
+    for byte in data:
+        hval = ((hval ^ byte) * _prime) & _mask
+    return hval
+
+
+def fnv1a_64_many(data: Sequence[bytes]) -> List[int]:
+    """
+    Calculates the 64 bit FNV1a hash values of multiple values at once.
+
+    If numpy is available, larger batches are hashed in a vectorized manner,
+    otherwise this falls back to :func:`fnv1a_64` for each value.
+
+    Parameters
+    ----------
+    data
+        The values to hash
+
+    Returns
+    -------
+    Calculated 64 bit FNV1a hash values in the order of the given values
+    """
+    if np is None or len(data) < FNV_NUMPY_THRESHOLD:
+        return [fnv1a_64(value) for value in data]
+
+    lengths = np.fromiter(map(len, data), dtype=np.int64, count=len(data))
+    # Hash the values grouped by their length, so every group is a plain
+    # matrix with one row per value and no padding is needed
+    order = np.argsort(lengths, kind='stable')
+    lengths = lengths[order]
+    raw = np.frombuffer(
+        b''.join([data[i] for i in order.tolist()]), dtype=np.uint8)
+    starts = np.flatnonzero(np.diff(lengths, prepend=-1))
+    ends = np.append(starts[1:], len(lengths))
+
+    hvals = np.empty(len(data), dtype=np.uint64)
+    prime = np.uint64(FNV_64_PRIME)
+    offset = 0
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        length = int(lengths[start])
+        count = end - start
+        values = raw[offset:offset + count * length].reshape(count, length)
+        offset += count * length
+        group = np.full(count, FNV1_64_INIT, dtype=np.uint64)
+        for i in range(length):
+            group ^= values[:, i]
+            group *= prime
+        hvals[order[start:end]] = group
+    return hvals.tolist()
+
 # =============================================================================
 # Classes
 # =============================================================================
@@ -145,8 +261,16 @@ class ENCODE_TYPES(IntEnum):
 
 
 class Bundle(AbstractFileReadOnly):
-    def __init__(self, *args, **kwargs):
+    """
+    Attributes
+    ----------
+    workers : int
+        Number of threads used to decompress chunks; 0 to use one thread per
+        CPU
+    """
+    def __init__(self, *args, workers: int = 1, **kwargs):
         super().__init__(*args, *kwargs)
+        self.workers: int = workers
         self.encoder: Union[ENCODE_TYPES, None] = None
         self.unknown: Union[int, None] = None
         self.size_decompressed: Union[int, None] = None
@@ -158,17 +282,55 @@ class Bundle(AbstractFileReadOnly):
         self.unknown5: Union[int, None] = None
         self.unknown6: Union[int, None] = None
         self.chunks: Union[Tuple[int, ...], None] = None
-        self.data: Union[Dict[int, bytes], bytes] = {}
+        self.data: Union[Dict[int, memoryview], bytes, bytearray,
+                         mmap.mmap] = {}
+        self.decompressed_chunks: Dict[int, bytes] = {}
+        self._raw: Union[memoryview, None] = None
+        # Whether the compressed data is memory mapped from the file
+        self._raw_mapped: bool = False
+        self._digest: Union[str, None] = None
 
     @property
     def is_decompressed(self) -> bool:
-        return isinstance(self.data, bytes)
+        return isinstance(self.data, (bytes, bytearray, mmap.mmap))
+
+    @property
+    def digest(self) -> str:
+        """
+        Returns
+        -------
+        Hex digest of the compressed bundle file
+
+        Raises
+        ------
+        ValueError
+            if the bundle was decompressed before the digest was requested
+        """
+        if self._digest is None:
+            if self._raw is None:
+                raise ValueError('Compressed data is no longer available')
+            self._digest = hashlib.blake2b(
+                self._raw, digest_size=16).hexdigest()
+        return self._digest
 
     def _read(self, buffer: BytesIO):
         if self.is_decompressed:
             raise ValueError('Bundle has been decompressed already')
 
-        raw = buffer.read()
+        # The chunks reference the buffer instead of being copied; files on
+        # disk are memory mapped.
+        self._raw_mapped = False
+        if isinstance(buffer, BytesIO):
+            raw = buffer.getbuffer()
+        else:
+            try:
+                raw = memoryview(mmap.mmap(
+                    buffer.fileno(), 0, access=mmap.ACCESS_READ))
+                self._raw_mapped = True
+            except (AttributeError, OSError, ValueError):
+                raw = memoryview(buffer.read())
+        self._raw = raw
+        self._digest = None
 
         self.uncompressed_size, self.data_size, self.head_size = \
             struct.unpack_from('<III', raw, offset=0)
@@ -198,10 +360,264 @@ class Bundle(AbstractFileReadOnly):
 
             offset = offset2
 
-    def decompress(self, start: int = 0, end: int = None):
+    @property
+    def memory_size(self) -> int:
+        """
+        Returns
+        -------
+        The number of bytes of compressed and decompressed data held in
+        memory by this bundle. Memory mapped data is not counted, since the
+        operating system can drop it from memory at any time.
+        """
+        if self.is_decompressed:
+            if isinstance(self.data, mmap.mmap):
+                return 0
+            return len(self.data)
+
+        size = 0
+        if self.data and not self._raw_mapped:
+            size += self.size_compressed
+        count = len(self.decompressed_chunks)
+        if count:
+            size += count * self.chunk_size
+            last = self.entry_count - 1
+            if last in self.decompressed_chunks:
+                size -= self.chunk_size - self.get_chunk_size(last)
+        return size
+
+    def get_chunk_size(self, chunk: int) -> int:
+        """
+        Returns the decompressed size of the given chunk.
+
+        Parameters
+        ----------
+        chunk
+            Chunk index
+
+        Returns
+        -------
+        The size of the chunk once decompressed
+        """
+        if chunk == self.entry_count - 1:
+            return self.size_decompressed - chunk * self.chunk_size
+        return self.chunk_size
+
+    def get_chunk_range(self, offset: int, size: int) -> Tuple[int, int]:
+        """
+        Returns the range of chunks that cover the given section of the
+        decompressed data.
+
+        Parameters
+        ----------
+        offset
+            Offset in the decompressed data
+        size
+            Size of the section
+
+        Returns
+        -------
+        The start chunk and the end chunk (exclusive), suitable for passing to
+        :meth:`decompress`
+
+        Raises
+        ------
+        ValueError
+            if the section is outside of the bundle
+        """
+        if offset < 0 or size < 0 or offset + size > self.size_decompressed:
+            raise ValueError(
+                'Section %s:%s is outside of the bundle (size %s)' % (
+                    offset, offset + size, self.size_decompressed
+                )
+            )
+        start = offset // self.chunk_size
+        end = max(start + 1, -(-(offset + size) // self.chunk_size))
+        return start, min(end, self.entry_count)
+
+    def _decompress_chunk(self, chunk: int) -> bytes:
+        """
+        Decompresses a single chunk with the ooz library.
+
+        Parameters
+        ----------
+        chunk
+            Chunk index
+
+        Returns
+        -------
+        The decompressed chunk data
+        """
+        size = self.get_chunk_size(chunk)
+        out = ffi.new('uint8_t[]', size+64)
+        self._decompress_chunk_into(chunk, out)
+        return ffi.buffer(out)[:-64]
+
+    def _decompress_chunk_into(self, chunk: int, dst: 'ffi.CData'):
+        """
+        Decompresses a single chunk with the ooz library into the given
+        buffer.
+
+        The library may write up to 64 bytes past the end of the chunk, the
+        buffer must account for this.
+
+        Parameters
+        ----------
+        chunk
+            Chunk index
+        dst
+            Pointer to the location to decompress the chunk to
+        """
+        src = self.data[chunk]
+        rtrcode = ooz.Ooz_Decompress(
+            ffi.from_buffer(src),  # src_buff
+            len(src),  # src_len
+            dst,  # dst
+            self.get_chunk_size(chunk),  # dst_size
+            0,
+            0,
+            0,
+            ffi.cast('uint8_t *', 0),
+            0,
+            ffi.cast('void *', 0),
+            ffi.cast('void *', 0),
+            ffi.cast('void *', 0),
+            0,
+            0,
+        )
+
+        if rtrcode == 0:
+            raise ValueError('Decode error - returned 0 bytes')
+
+    def _decompress_chunks(self,
+                           chunks: List[int],
+                           workers: int = 1) -> \
+            Iterator[Tuple[int, bytes]]:
+        """
+        Decompresses the given chunks with the ooz library if available,
+        otherwise with the ooz commandline tool.
+
+        The ooz library releases the GIL while decompressing, so with more than
+        one worker the chunks are decompressed concurrently on a thread pool.
+
+        Parameters
+        ----------
+        chunks
+            Chunk indexes
+        workers
+            Number of threads to use; 0 to use one thread per CPU
+
+        Returns
+        -------
+        Iterator over the chunk index and decompressed chunk data in the order
+        of the given chunks
+        """
+        if not ooz:
+            return iter(self._decompress_chunks_cli(chunks).items())
+
+        if workers == 0:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(chunks) <= 1:
+            return ((i, self._decompress_chunk(i)) for i in chunks)
+
+        return self._decompress_chunks_threaded(chunks, workers)
+
+    def _decompress_chunks_threaded(self,
+                                    chunks: List[int],
+                                    workers: int) -> \
+            Iterator[Tuple[int, bytes]]:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from zip(chunks, executor.map(self._decompress_chunk, chunks))
+
+    def _decompress_chunks_cli(self, chunks: List[int]) -> Dict[int, bytes]:
+        """
+        Decompresses the given chunks with the ooz commandline tool.
+
+        Oodle streams consist of blocks of :data:`OODLE_BLOCK_SIZE` bytes that
+        each carry their own header, so consecutive chunks of that size can be
+        concatenated and decompressed with a single run of the tool. Other
+        chunk sizes require one run per chunk.
+
+        Parameters
+        ----------
+        chunks
+            Chunk indexes
+
+        Returns
+        -------
+        Mapping of chunk index to the decompressed chunk data
+
+        Raises
+        ------
+        OSError
+            if the ooz commandline tool is not available
+        ValueError
+            if the ooz commandline tool failed to decompress the data
+        """
+        runs = []
+        for i in sorted(chunks):
+            if runs and runs[-1][-1] == i - 1 and \
+                    self.chunk_size == OODLE_BLOCK_SIZE:
+                runs[-1].append(i)
+            else:
+                runs.append([i])
+
+        out = {}
+        with TemporaryDirectory() as tempdir:
+            for run in runs:
+                fn = os.path.join(tempdir, 'chunk%s' % run[0])
+                sizes = [self.get_chunk_size(i) for i in run]
+
+                with open('%s.in' % fn, 'wb') as f:
+                    f.write(struct.pack('<Q', sum(sizes)))
+                    for i in run:
+                        f.write(self.data[i])
+
+                try:
+                    subprocess.run(
+                        [OOZ_COMMAND, '-d', '%s.in' % fn, '%s.out' % fn],
+                        check=True,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                except FileNotFoundError:
+                    raise OSError(
+                        'Neither the ooz library nor the ooz commandline tool '
+                        '"%s" is available' % OOZ_COMMAND
+                    )
+                except subprocess.CalledProcessError as e:
+                    raise ValueError(
+                        'Decode error - ooz exited with %s' % e.returncode
+                    )
+
+                with open('%s.out' % fn, 'rb') as f:
+                    data = f.read()
+
+                if len(data) != sum(sizes):
+                    raise ValueError(
+                        'Decode error - expected %s bytes, got %s bytes' % (
+                            sum(sizes), len(data)
+                        )
+                    )
+
+                offset = 0
+                for i, size in zip(run, sizes):
+                    out[i] = data[offset:offset+size]
+                    offset += size
+
+        return out
+
+    def decompress(self,
+                   start: int = 0,
+                   end: int = None,
+                   workers: int = None):
         """
         Decompresses this bundle's contents.
 
+        Chunks that have been decompressed already are not decompressed again.
+        Once all chunks are decompressed, the data attribute will hold the
+        full decompressed contents of the bundle in a single buffer.
+
         This requires either the oozdll to be available or the ooz commandline
         tool.
 
@@ -211,62 +627,326 @@ class Bundle(AbstractFileReadOnly):
             Start chunk
         end
             End chunk
+        workers
+            Number of threads to decompress the chunks with; 0 to use one
+            thread per CPU. Defaults to the workers attribute.
+        """
+        if end is None:
+            end = self.entry_count
+
+        self.decompress_chunks(range(start, end), workers=workers)
+
+    def decompress_chunks(self, chunks: Iterable[int], workers: int = None):
+        """
+        Decompresses the given chunks of this bundle.
+
+        See :meth:`decompress`.
+
+        Parameters
+        ----------
+        chunks
+            Chunk indexes
+        workers
+            Number of threads to decompress the chunks with; 0 to use one
+            thread per CPU. Defaults to the workers attribute.
         """
         if not self.data:
             raise ValueError()
 
-        if end is None:
-            end = self.entry_count
+        if self.is_decompressed:
+            return
+
+        if workers is None:
+            workers = self.workers
 
-        last = self.entry_count - 1
+        chunks = sorted(
+            set(chunks).difference(self.decompressed_chunks)
+        )
+
+        if not chunks:
+            return
+
+        if len(self.decompressed_chunks) + len(chunks) < self.entry_count:
+            self.decompressed_chunks.update(
+                self._decompress_chunks(chunks, workers))
+            return
+
+        # All remaining chunks are decompressed straight into the output buffer
         if ooz:
-            for i in range(start, end):
-                if i != last:
-                    size = self.chunk_size
-                else:
-                    size = self.size_decompressed % self.chunk_size
-
-                out = ffi.new('uint8_t[]', size+64)
-                rtrcode = ooz.Ooz_Decompress(
-                    self.data[i],  # src_buff
-                    len(self.data[i]),  # src_len
-                    out,  # dst
-                    size,  # dst_size
-                    0,
-                    0,
-                    0,
-                    ffi.cast('uint8_t *', 0),
-                    0,
-                    ffi.cast('void *', 0),
-                    ffi.cast('void *', 0),
-                    ffi.cast('void *', 0),
-                    0,
-                    0,
-                )
+            out = self._decompress_chunks_into(chunks, workers)
+        else:
+            out = bytearray(self.size_decompressed)
+            for i, data in self._decompress_chunks(chunks, workers):
+                offset = i * self.chunk_size
+                out[offset:offset+len(data)] = data
+
+        for i, data in self.decompressed_chunks.items():
+            offset = i * self.chunk_size
+            out[offset:offset+len(data)] = data
+        self.decompressed_chunks = {}
+
+        self.data = out
+        self._raw = None
+
+    def _decompress_chunks_into(self,
+                                chunks: List[int],
+                                workers: int = 1) -> bytearray:
+        """
+        Decompresses the given chunks with the ooz library directly into a
+        buffer for the entire bundle.
+
+        With a single worker, chunks are decompressed in ascending order, so
+        whatever the library writes past the end of a chunk will be
+        overwritten by the next chunk.
+
+        With more workers, the chunks are decompressed concurrently in rounds
+        of chunks far enough apart that none of them writes past its end into
+        another chunk of the same round. The bytes after the end of every
+        chunk of a round are saved before the round and restored afterwards,
+        so chunks of other rounds are left intact.
+
+        Parameters
+        ----------
+        chunks
+            Sorted chunk indexes
+        workers
+            Number of threads to use; 0 to use one thread per CPU
 
-                if rtrcode == 0:
-                    raise ValueError('Decode error - returned 0 bytes')
+        Returns
+        -------
+        The buffer for the decompressed data of the bundle
+        """
+        if workers == 0:
+            workers = os.cpu_count() or 1
+
+        out = bytearray(self.size_decompressed + 64)
+        with ffi.from_buffer(out) as dst:
+            if workers <= 1 or len(chunks) <= 1:
+                for i in chunks:
+                    self._decompress_chunk_into(i, dst + i * self.chunk_size)
+            else:
+                def decompress(i):
+                    self._decompress_chunk_into(i, dst + i * self.chunk_size)
+
+                rounds = 1 - (-64 // self.chunk_size)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for r in range(rounds):
+                        round_chunks = [i for i in chunks if i % rounds == r]
+                        tails = []
+                        for i in round_chunks:
+                            end = i * self.chunk_size + self.get_chunk_size(i)
+                            tails.append((end, bytes(out[end:end+64])))
+                        # Raise the first error, if any
+                        list(executor.map(decompress, round_chunks))
+                        for end, tail in tails:
+                            out[end:end+64] = tail
+        del out[self.size_decompressed:]
+        return out
+
+    def get_data(self,
+                 offset: int,
+                 size: int,
+                 copy: bool = True) -> Union[bytes, memoryview]:
+        """
+        Returns a section of the decompressed data.
+
+        Only the chunks covering the section will be decompressed.
 
-                self.data[i] = ffi.buffer(out)[:-64]
+        Parameters
+        ----------
+        offset
+            Offset in the decompressed data
+        size
+            Size of the section
+        copy
+            Whether to return a copy of the data. If False a memoryview of
+            the decompressed data is returned instead. It is read-only,
+            except for fully decompressed bundles before Python 3.8.
+
+        Returns
+        -------
+        The decompressed data of the section
+        """
+        if size == 0:
+            data = b''
+        elif self.is_decompressed:
+            data = memoryview(self.data)[offset:offset+size]
         else:
-            with TemporaryDirectory() as tempdir:
-                for i in range(start, end):
-                    fn = os.path.join(tempdir,'chunk%s' % i)
-
-                    with open('%s.in' % fn, 'wb') as f:
-                        if i != last:
-                            size = 262144
-                        else:
-                            size = self.size_decompressed % 262144
-                        f.write(struct.pack('<Q', size))
-                        f.write(self.data[i])
+            start, end = self.get_chunk_range(offset, size)
+            self.decompress(start, end)
+            if self.is_decompressed:
+                data = memoryview(self.data)[offset:offset+size]
+            else:
+                offset -= start * self.chunk_size
+                if end - start == 1:
+                    data = memoryview(self.decompressed_chunks[start])
+                else:
+                    data = memoryview(b''.join([
+                        self.decompressed_chunks[i] for i in range(start, end)
+                    ]))
+                data = data[offset:offset+size]
+
+        if copy:
+            return bytes(data)
+        data = memoryview(data)
+        # Fully decompressed bundles are held in a bytearray; memoryview has
+        # no toreadonly before Python 3.8
+        if not data.readonly and hasattr(data, 'toreadonly'):
+            data = data.toreadonly()
+        return data
+
+
+class BundleCache(ReprMixin):
+    """
+    Least recently used cache of read bundles with a memory budget.
 
-                    os.system('ooz -d %(fn)s.in %(fn)s.out' % {'fn': fn})
+    The memory held by each bundle grows as more of its chunks are
+    decompressed, so the budget is enforced whenever a bundle is added or
+    :meth:`trim` is called. The sizes are kept as a running total; only the
+    bundles used since the last trim are measured again. The most recently
+    used bundle is never evicted.
 
-                    with open('%s.out' % fn, 'rb') as f:
-                        self.data[i] = f.read()
+    Attributes
+    ----------
+    max_size : int or None
+        The memory budget in bytes; None for no limit
+    bundles : OrderedDict[str, Bundle]
+        Mapping of bundle name to bundle in least recently used order
+    hits : int
+        Number of lookups that found a cached bundle
+    misses : int
+        Number of lookups that did not find a cached bundle
+    evictions : int
+        Number of bundles evicted to stay within the budget
+    """
 
-        self.data = b''.join(self.data.values())
+    DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+    _REPR_EXTRA_ATTRIBUTES = OrderedDict((
+        ('size', None),
+        ('hits', None),
+        ('misses', None),
+        ('evictions', None),
+    ))
+
+    def __init__(self, max_size: Union[int, None] = DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        max_size
+            The memory budget in bytes; None for no limit
+        """
+        self.max_size: Union[int, None] = max_size
+        self.bundles: 'OrderedDict[str, Bundle]' = OrderedDict()
+        # name -> size of the bundle when it was last measured
+        self._sizes: Dict[str, int] = {}
+        # Names of the bundles used since they were last measured
+        self._used: Set[str] = set()
+        self._size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.bundles
+
+    def __len__(self) -> int:
+        return len(self.bundles)
+
+    @property
+    def size(self) -> int:
+        """
+        Returns
+        -------
+        The number of bytes currently held by the cached bundles
+        """
+        self._measure()
+        return self._size
+
+    def get(self, name: str) -> Union[Bundle, None]:
+        """
+        Returns the cached bundle and marks it as most recently used.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+
+        Returns
+        -------
+        The cached bundle or None if it isn't cached
+        """
+        try:
+            bundle = self.bundles[name]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bundles.move_to_end(name)
+        self._used.add(name)
+        return bundle
+
+    def add(self, name: str, bundle: Bundle):
+        """
+        Adds a bundle as most recently used and evicts bundles if required.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+        bundle
+            The bundle to cache
+        """
+        self.bundles[name] = bundle
+        self.bundles.move_to_end(name)
+        self._used.add(name)
+        self.trim()
+
+    def trim(self):
+        """
+        Evicts the least recently used bundles until the cache fits into the
+        memory budget.
+        """
+        if self.max_size is None:
+            return
+
+        self._measure()
+        while self._size > self.max_size and len(self.bundles) > 1:
+            name, bundle = self.bundles.popitem(last=False)
+            self._size -= self._sizes.pop(name)
+            self.evictions += 1
+
+    def _measure(self):
+        """
+        Updates the running total with the sizes of the bundles used since
+        they were last measured.
+        """
+        for name in self._used:
+            bundle = self.bundles.get(name)
+            size = 0 if bundle is None else bundle.memory_size
+            self._size += size - self._sizes.get(name, 0)
+            if bundle is None:
+                self._sizes.pop(name, None)
+            else:
+                self._sizes[name] = size
+        self._used.clear()
+
+    def clear(self):
+        """
+        Removes all bundles from the cache.
+        """
+        self.bundles.clear()
+        self._sizes.clear()
+        self._used.clear()
+        self._size = 0
+
+    def reset_stats(self):
+        """
+        Resets the hit, miss and eviction counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
 
 class PATH_TYPES(IntEnum):
@@ -278,6 +958,178 @@ class IndexRecord(ReprMixin):
     SIZE = None
 
 
+class BundleDiskCache(ReprMixin):
+    """
+    Persistent cache of decompressed bundles on disk.
+
+    Entries are keyed by the bundle name, compressed size and the digest of the
+    compressed bundle file, so an updated bundle never matches a stale entry.
+    Loaded entries are memory mapped instead of being decompressed again.
+
+    Once the cache exceeds its size limit, the least recently used entries are
+    removed.
+
+    Attributes
+    ----------
+    path : str
+        Directory of the cache
+    max_size : int or None
+        Size limit of the cache in bytes; None for no limit
+    hits : int
+        Number of bundles loaded from the cache
+    misses : int
+        Number of bundles not found in the cache
+    """
+
+    DEFAULT_MAX_SIZE = 4 * 1024 * 1024 * 1024
+
+    EXTENSION = '.bin'
+
+    _REPR_EXTRA_ATTRIBUTES = OrderedDict((
+        ('hits', None),
+        ('misses', None),
+    ))
+
+    def __init__(self,
+                 path: str,
+                 max_size: Union[int, None] = DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        path
+            Directory of the cache. It will be created if it doesn't exist.
+        max_size
+            Size limit of the cache in bytes; None for no limit
+        """
+        self.path: str = path
+        self.max_size: Union[int, None] = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+        os.makedirs(path, exist_ok=True)
+
+    def get_path(self, name: str, bundle: Bundle) -> str:
+        """
+        Returns the path of the cache entry for a bundle.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+        bundle
+            The bundle, which must not be decompressed yet
+
+        Returns
+        -------
+        Path of the cache entry
+        """
+        return os.path.join(self.path, '%s-%x-%s%s' % (
+            name.replace('/', '.'), bundle.size_compressed, bundle.digest,
+            self.EXTENSION,
+        ))
+
+    def load(self, name: str, bundle: Bundle) -> bool:
+        """
+        Loads the decompressed data of the bundle from the cache.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+        bundle
+            The read bundle
+
+        Returns
+        -------
+        Whether the bundle was found in the cache
+        """
+        path = self.get_path(name, bundle)
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size != bundle.size_decompressed:
+                    raise ValueError('Size mismatch')
+                if bundle.size_decompressed:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = b''
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return False
+
+        bundle.data = data
+        bundle.decompressed_chunks = {}
+        bundle._raw = None
+        self.hits += 1
+        return True
+
+    def store(self, name: str, bundle: Bundle):
+        """
+        Decompresses the bundle and stores the decompressed data in the
+        cache. Least recently used entries are removed afterwards if the
+        cache exceeds its size limit.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+        bundle
+            The read bundle, which must not be decompressed yet
+        """
+        path = self.get_path(name, bundle)
+        bundle.decompress()
+
+        tmp_path = '%s.%s.tmp' % (path, os.getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(bundle.data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self.prune()
+
+    def prune(self):
+        """
+        Removes the least recently used entries until the cache fits into
+        its size limit.
+        """
+        if self.max_size is None:
+            return
+
+        entries = []
+        size = 0
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith(self.EXTENSION):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            size += stat.st_size
+
+        entries.sort()
+        for mtime, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Entry may be in use
+                continue
+            size -= entry_size
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(self.EXTENSION):
+                os.remove(entry.path)
+
+
 class BundleRecord(IndexRecord):
     """
     Attributes
@@ -285,10 +1137,9 @@ class BundleRecord(IndexRecord):
     parent : Index
     name : str
     size : int
-    contents : Bundle
     BYTES : int
     """
-    __slots__ = ['parent', 'name', 'size',  'contents', 'BYTES']
+    __slots__ = ['parent', 'name', 'size', 'BYTES']
 
     _REPR_EXTRA_ATTRIBUTES = {x: None for x in __slots__}
 
@@ -305,8 +1156,6 @@ class BundleRecord(IndexRecord):
 
         self.BYTES: int = name_length + 8
 
-        self.contents: Union[Bundle, None] = None
-
     @property
     def file_name(self) -> str:
         """
@@ -325,19 +1174,31 @@ class BundleRecord(IndexRecord):
         """
         return 'Bundles2/' + self.file_name
 
-    def read(self, file_path_or_raw: Union[str, bytes]):
+    def read(self,
+             file_path_or_raw: Union[str, bytes],
+             workers: int = 1) -> Bundle:
         """
-        Reads the contents of this bundle if they haven't been read already
+        Reads the contents of this bundle.
+
+        The contents will not be decompressed right away; chunks are
+        decompressed on demand when file data is requested. The returned
+        bundle is not stored on the record, use a :class:`BundleCache` to
+        keep bundles around.
 
         Parameters
         ----------
         file_path_or_raw
             see Bundle.read
+        workers
+            Number of threads to decompress chunks with, see Bundle.workers
+
+        Returns
+        -------
+        The read bundle
         """
-        if self.contents is None:
-            self.contents = Bundle()
-            self.contents.read(file_path_or_raw)
-            self.contents.decompress()
+        bundle = Bundle(workers=workers)
+        bundle.read(file_path_or_raw)
+        return bundle
 
 
 class FileRecord(IndexRecord):
@@ -364,17 +1225,28 @@ class FileRecord(IndexRecord):
         self.file_offset: int = data[2]
         self.file_size: int = data[3]
 
-    def get_file(self) -> bytes:
+    def get_file(self,
+                 bundle: Bundle,
+                 copy: bool = True) -> Union[bytes, memoryview]:
         """
-        Returns the file contents associated with this record. For this to work
-        the parent's bundle must loaded.
+        Returns the file contents associated with this record.
+
+        Only the chunks of the bundle that contain the file will be
+        decompressed.
+
+        Parameters
+        ----------
+        bundle
+            The read bundle of this record's :class:`BundleRecord`
+        copy
+            Whether to return a copy of the contents or a read-only
+            memoryview of the decompressed bundle data
 
         Returns
         -------
         The contents of the file associated with this record.
         """
-        return self.bundle.contents.data[
-               self.file_offset:self.file_offset+self.file_size]
+        return bundle.get_data(self.file_offset, self.file_size, copy=copy)
 
 
 class DirectoryRecord(IndexRecord):
@@ -410,8 +1282,9 @@ class DirectoryRecord(IndexRecord):
             The common path of all file paths contained within this directory
         """
         # Paths can be empty
-        if self._paths:
-            return self.paths[0].rsplit('/', maxsplit=1)[0]
+        paths = self.paths
+        if paths:
+            return paths[0].rsplit('/', maxsplit=1)[0]
         else:
             return ''
 
@@ -423,6 +1296,8 @@ class DirectoryRecord(IndexRecord):
             A list of all files with their full paths (relative to the game
             root) contained within this directory
         """
+        if self._paths is None:
+            self._paths = self.parent.get_directory_paths(self)
         return [x.decode() for x in self._paths]
 
     @property
@@ -435,14 +1310,184 @@ class DirectoryRecord(IndexRecord):
         return [x.rsplit('/', maxsplit=1)[-1] for x in self.paths]
 
 
+class IndexRecordTable(Mapping):
+    """
+    Read-only mapping of path hashes to index records that is backed by the
+    raw record table of the index.
+
+    Only the sorted hashes are kept in a compact array; the
+    :class:`IndexRecord` instances are created when they are looked up.
+    Created records are reused, so repeated lookups return the same
+    instance. Unless the table keeps all records, they are only reused as
+    long as they are referenced elsewhere.
+    """
+    def __init__(self,
+                 record_class: type,
+                 raw: bytes,
+                 parent: 'Index',
+                 offset: int,
+                 count: int,
+                 hashes: Sequence[int] = None,
+                 keep_records: bool = False):
+        """
+        Parameters
+        ----------
+        record_class
+            The :class:`IndexRecord` subclass of the records in the table
+        raw
+            The raw index data
+        parent
+            The parent index
+        offset
+            Offset of the table within the raw data
+        count
+            Number of records in the table
+        hashes
+            The hashes of the records if the records are known to be sorted
+            by hash already
+        keep_records
+            Whether to keep every created record instead of only the ones
+            still referenced elsewhere
+        """
+        self.record_class: type = record_class
+        self.parent: Index = parent
+        self._raw: bytes = raw
+        self._offset: int = offset
+        # position -> record
+        self._records: Mapping[int, IndexRecord] = \
+            {} if keep_records else weakref.WeakValueDictionary()
+
+        if hashes is not None:
+            self._rows = None
+            self._hashes = hashes
+            return
+
+        # The hash is the first field of each record, so all hashes can be
+        # read with a single unpack
+        hashes = struct.unpack_from(
+            '<' + 'Q%sx' % (record_class.SIZE - 8) * count, raw, offset
+        )
+        if any(map(operator.gt, hashes, islice(hashes, 1, None))):
+            self._rows: Union[array, None] = array(
+                'I', sorted(range(0, count), key=hashes.__getitem__)
+            )
+            # There are at least two records if they are out of order
+            self._hashes: array = array(
+                'Q', operator.itemgetter(*self._rows)(hashes))
+        else:
+            self._rows = None
+            self._hashes = array('Q', hashes)
+
+    def __getitem__(self, item: int) -> IndexRecord:
+        i = self.get_position(item)
+        record = self._records.get(i)
+        if record is None:
+            row = i if self._rows is None else self._rows[i]
+            record = self.record_class(
+                self._raw, self.parent,
+                self._offset + row*self.record_class.SIZE
+            )
+            self._records[i] = record
+        return record
+
+    def __contains__(self, item: int) -> bool:
+        i = bisect_left(self._hashes, item)
+        return i != len(self._hashes) and self._hashes[i] == item
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._hashes)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def get_position(self, item: int) -> int:
+        """
+        Returns the position of the given hash in the sorted hashes.
+
+        Parameters
+        ----------
+        item
+            Hash of the record
+
+        Returns
+        -------
+        The position of the hash
+
+        Raises
+        ------
+        KeyError
+            if the hash is not in the table
+        """
+        i = bisect_left(self._hashes, item)
+        if i == len(self._hashes) or self._hashes[i] != item:
+            raise KeyError(item)
+        return i
+
+    def get_raw_records(self) -> bytes:
+        """
+        Returns
+        -------
+        The raw records of the table, sorted by hash
+        """
+        size = self.record_class.SIZE
+        start = self._offset
+        if self._rows is None:
+            return bytes(self._raw[start:start + len(self._hashes)*size])
+        return b''.join([
+            self._raw[start + i*size:start + (i+1)*size] for i in self._rows
+        ])
+
+    def get_raw_hashes(self) -> bytes:
+        """
+        Returns
+        -------
+        The sorted hashes as native unsigned 64 bit integers
+        """
+        if isinstance(self._hashes, array):
+            return self._hashes.tobytes()
+        return bytes(self._hashes)
+
+
 class Index(Bundle):
+    """
+    Attributes
+    ----------
+    cache_dir : str or None
+        Directory to store the parsed index in, so it can be memory mapped
+        instead of being parsed again on the next read. None to disable.
+    bundles : dict[int, BundleRecord]
+        Mapping of bundle id to bundle record
+    files : IndexRecordTable
+        Mapping of path hash to file record
+    directories : IndexRecordTable
+        Mapping of path hash to directory record
+    """
     PATH = 'Bundles2/_.index.bin'
 
-    def __init__(self, *args, **kwargs):
+    # Number of path hashes to remember. The hashes don't depend on the
+    # index, so they are shared between instances.
+    HASH_CACHE_SIZE = 0x10000
+    _hash_cache: 'OrderedDict[Tuple[Union[str, bytes], PATH_TYPES], int]' = \
+        OrderedDict()
+    _hash_cache_lock = threading.Lock()
+
+    CACHE_MAGIC = b'PyPoEIDX'
+    CACHE_VERSION = 2
+    # bundles, files, file hashes, directories, directory hashes,
+    # path spans, paths
+    _CACHE_SECTIONS = 7
+
+    def __init__(self, *args, cache_dir: Union[str, None] = None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.cache_dir: Union[str, None] = cache_dir
         self.bundles: Dict[int, BundleRecord] = {}
-        self.files: Dict[int, FileRecord] = {}
-        self.directories: Dict[int, DirectoryRecord] = {}
+        self.files: Mapping[int, FileRecord] = {}
+        self.directories: Mapping[int, DirectoryRecord] = {}
+        self._bundle_data: bytes = b''
+        self._directory_data: bytes = b''
+        self._path_spans: Union[Sequence[int], None] = None
+        self._path_data: Union[memoryview, None] = None
+        self._cache_mmap: Union[mmap.mmap, None] = None
 
     def get_dir_record(self, path: Union[str, bytes]) -> DirectoryRecord:
         """
@@ -496,6 +1541,9 @@ class Index(Bundle):
         """
         Calculates the 64 bit FNA1a hash value for a given path
 
+        Recently calculated hash values are remembered, see
+        :attr:`HASH_CACHE_SIZE`.
+
         Parameters
         ----------
         path
@@ -509,6 +1557,79 @@ class Index(Bundle):
         -------
         Calculated 64bit FNV1a hash value
         """
+        key = (path, type)
+        with self._hash_cache_lock:
+            try:
+                hval = self._hash_cache[key]
+            except KeyError:
+                pass
+            else:
+                self._hash_cache.move_to_end(key)
+                return hval
+
+        hval = fnv1a_64(self._get_hash_data(path, type))
+        self._add_hash(key, hval)
+        return hval
+
+    def get_hashes(self,
+                   paths: Iterable[Union[str, bytes]],
+                   type: PATH_TYPES = None) -> List[int]:
+        """
+        Calculates the 64 bit FNA1a hash values for multiple paths at once.
+
+        Hash values that haven't been calculated recently are calculated in
+        a single batch, see :func:`fnv1a_64_many`.
+
+        Parameters
+        ----------
+        paths
+            paths to calculate the hashes for
+        type
+            type of the paths (i.e. whether these are files or directories)
+
+            if not given, it is attempted to infer from each path
+
+        Returns
+        -------
+        Calculated 64bit FNV1a hash values in order of the given paths
+        """
+        hvals = []
+        missing: Dict[Tuple[Union[str, bytes], PATH_TYPES], List[int]] = \
+            OrderedDict()
+        with self._hash_cache_lock:
+            for i, path in enumerate(paths):
+                key = (path, type)
+                try:
+                    hvals.append(self._hash_cache[key])
+                except KeyError:
+                    hvals.append(None)
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._hash_cache.move_to_end(key)
+
+        if missing:
+            values = fnv1a_64_many([
+                self._get_hash_data(*key) for key in missing
+            ])
+            for (key, indexes), hval in zip(missing.items(), values):
+                for i in indexes:
+                    hvals[i] = hval
+                self._add_hash(key, hval)
+
+        return hvals
+
+    def _add_hash(self,
+                  key: Tuple[Union[str, bytes], PATH_TYPES],
+                  hval: int):
+        cache = self._hash_cache
+        with self._hash_cache_lock:
+            cache[key] = hval
+            while len(cache) > self.HASH_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _get_hash_data(self,
+                       path: Union[str, bytes],
+                       type: PATH_TYPES = None) -> bytes:
         if isinstance(path, str):
             path = path.encode('utf-8')
         elif not isinstance(path, bytes):
@@ -523,17 +1644,38 @@ class Index(Bundle):
             path = path.lower()
         path += b'++'
 
-        return fnv1a_64(path)
+        return path
 
     def _read(self, buffer: BytesIO):
         if self.bundles:
             raise ValueError('Index bundle has been read already.')
-        super()._read(buffer)
-        self.decompress()
-        raw = self.data
 
-        bundle_count = struct.unpack_from('<I', raw)[0]
-        offset = 4
+        if self.cache_dir is None:
+            self._parse(buffer)
+            return
+
+        raw = buffer.read()
+        cache_path = os.path.join(self.cache_dir, 'index-%s-%s.bin' % (
+            len(raw), hashlib.sha1(raw).hexdigest()
+        ))
+        try:
+            self._read_cache(cache_path)
+        except (OSError, ValueError, TypeError, struct.error):
+            self.bundles = {}
+            self._path_spans = None
+            self._path_data = None
+            self._cache_mmap = None
+            self._parse(BytesIO(raw))
+            try:
+                self._write_cache(cache_path)
+            except OSError as e:
+                warnings.warn(
+                    'Failed to write index cache "%s": %s' % (cache_path, e)
+                )
+
+    def _read_bundle_records(self, raw: bytes, offset: int = 0) -> int:
+        bundle_count = struct.unpack_from('<I', raw, offset=offset)[0]
+        offset += 4
 
         for i in range(0, bundle_count):
             br = BundleRecord(raw, self, offset)
@@ -541,32 +1683,208 @@ class Index(Bundle):
             self.bundles[i] = br
             offset += br.BYTES
 
+        return offset
+
+    def _parse(self, buffer: BytesIO):
+        super()._read(buffer)
+        self.decompress()
+        raw = self.data
+
+        offset = self._read_bundle_records(raw)
+        self._bundle_data = bytes(raw[:offset])
+
         file_count = struct.unpack_from('<I', raw, offset=offset)[0]
         offset += 4
 
-        for i in range(0, file_count):
-            fr = FileRecord(raw, self, offset)
-            self.files[fr.hash] = fr
-            offset += fr.SIZE
+        self.files = IndexRecordTable(
+            FileRecord, raw, self, offset, file_count)
+        offset += file_count * FileRecord.SIZE
 
         count = struct.unpack_from('<I', raw, offset=offset)[0]
         offset += 4
-        for i in range(0, count):
-            dr = DirectoryRecord(raw, self, offset)
-            self.directories[dr.hash] = dr
-            offset += dr.SIZE
 
-        directory_bundle = Bundle()
-        directory_bundle.read(raw[offset:])
+        # Directory records remember their unpacked paths, so keep them
+        self.directories = IndexRecordTable(
+            DirectoryRecord, raw, self, offset, count, keep_records=True)
+        offset += count * DirectoryRecord.SIZE
+
+        directory_bundle = Bundle(workers=self.workers)
+        directory_bundle.read(bytes(raw[offset:]))
         directory_bundle.decompress()
+        self._directory_data = bytes(directory_bundle.data)
 
-        for directory_record in self.directories.values():
-            directory_record._paths = self._make_paths(
-                directory_bundle.data[
-                    directory_record.offset:
-                    directory_record.offset + directory_record.size
-                ]
-            )
+    def get_directory_paths(self,
+                            directory_record: DirectoryRecord) -> List[bytes]:
+        """
+        Unpacks the paths of the files contained in the given directory.
+
+        Parameters
+        ----------
+        directory_record
+            The directory record to unpack the paths for
+
+        Returns
+        -------
+        A list of unpacked paths
+        """
+        if self._path_spans is not None:
+            i = self.directories.get_position(directory_record.hash)
+            start = self._path_spans[i*2]
+            end = self._path_spans[i*2+1]
+            if start == end:
+                return []
+            return bytes(self._path_data[start:end]).split(b'\x00')
+
+        return self._make_paths(self._directory_data[
+            directory_record.offset:
+            directory_record.offset + directory_record.size
+        ])
+
+    def get_directory_path(self, directory_record: DirectoryRecord) -> str:
+        """
+        Returns the path of the given directory.
+
+        Only the first path of the directory is unpacked.
+
+        Parameters
+        ----------
+        directory_record
+            The directory record to get the path for
+
+        Returns
+        -------
+        The directory path; empty for files in the root directory
+        """
+        if self._path_spans is not None:
+            i = self.directories.get_position(directory_record.hash)
+            path = bytes(self._path_data[
+                self._path_spans[i*2]:self._path_spans[i*2+1]
+            ]).split(b'\x00', 1)[0]
+        else:
+            # Stop unpacking after the first path
+            path = next(self._iter_paths(self._directory_data[
+                directory_record.offset:
+                directory_record.offset + directory_record.size
+            ]), b'')
+        if b'/' not in path:
+            return ''
+        return path.rsplit(b'/', 1)[0].decode()
+
+    def _read_cache(self, path: str):
+        """
+        Memory maps a cache file written by :meth:`_write_cache`.
+
+        Parameters
+        ----------
+        path
+            Path of the cache file
+
+        Raises
+        ------
+        OSError
+            if the cache file can not be opened
+        ValueError
+            if the cache file is invalid or truncated
+        """
+        with open(path, 'rb') as f:
+            self._cache_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._cache_mmap)
+        size = len(view)
+        magic, version, length = struct.unpack_from('<8sIQ', view)
+        if magic != self.CACHE_MAGIC or version != self.CACHE_VERSION:
+            raise ValueError('Invalid index cache file "%s"' % path)
+        if length != size:
+            raise ValueError('Truncated index cache file "%s"' % path)
+
+        spans = struct.unpack_from(
+            '<%sQ' % (self._CACHE_SECTIONS*2), view, 20)
+        sections = []
+        for i in range(0, len(spans), 2):
+            if spans[i] + spans[i+1] > size:
+                raise ValueError('Invalid index cache file "%s"' % path)
+            sections.append(view[spans[i]:spans[i]+spans[i+1]])
+
+        # Every section must match the number of records given by the hashes
+        file_count, remainder = divmod(len(sections[2]), 8)
+        dir_count, dir_remainder = divmod(len(sections[4]), 8)
+        if remainder or dir_remainder or \
+                len(sections[1]) != file_count * FileRecord.SIZE or \
+                len(sections[3]) != dir_count * DirectoryRecord.SIZE or \
+                len(sections[5]) != dir_count * 8:
+            raise ValueError('Invalid index cache file "%s"' % path)
+
+        path_spans = sections[5].cast('I')
+        if path_spans and path_spans[-1] != len(sections[6]):
+            raise ValueError('Invalid index cache file "%s"' % path)
+
+        if self._read_bundle_records(sections[0]) != len(sections[0]):
+            raise ValueError('Invalid index cache file "%s"' % path)
+        self.files = IndexRecordTable(
+            FileRecord, sections[1], self, 0, file_count,
+            hashes=sections[2].cast('Q'),
+        )
+        self.directories = IndexRecordTable(
+            DirectoryRecord, sections[3], self, 0, dir_count,
+            hashes=sections[4].cast('Q'), keep_records=True,
+        )
+        self._path_spans = path_spans
+        self._path_data = sections[6]
+
+    def _write_cache(self, path: str):
+        """
+        Writes the parsed index into a cache file.
+
+        The records are stored sorted by hash together with the hashes and the
+        unpacked paths of every directory, so they can be used directly from
+        the memory mapped file.
+
+        Parameters
+        ----------
+        path
+            Path of the cache file
+        """
+        path_spans = array('I')
+        path_data = []
+        position = 0
+        for h in self.directories:
+            paths = b'\x00'.join(
+                self.get_directory_paths(self.directories[h]))
+            path_spans.append(position)
+            position += len(paths)
+            path_spans.append(position)
+            path_data.append(paths)
+
+        sections = [
+            self._bundle_data,
+            self.files.get_raw_records(),
+            self.files.get_raw_hashes(),
+            self.directories.get_raw_records(),
+            self.directories.get_raw_hashes(),
+            path_spans.tobytes(),
+            b''.join(path_data),
+        ]
+
+        offset = 20 + self._CACHE_SECTIONS*16
+        spans = []
+        for section in sections:
+            # Keep the sections aligned for the array casts
+            offset += -offset % 8
+            spans.append(offset)
+            spans.append(len(section))
+            offset += len(section)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = '%s.%s.tmp' % (path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            # The total length detects truncated files
+            f.write(struct.pack(
+                '<8sIQ', self.CACHE_MAGIC, self.CACHE_VERSION, offset))
+            f.write(struct.pack('<%sQ' % len(spans), *spans))
+            for i, section in enumerate(sections):
+                f.write(b'\x00' * (spans[i*2] - f.tell()))
+                f.write(section)
+        os.replace(temp_path, path)
 
     def _make_paths(self, raw: bytes) -> List[bytes]:
         """
@@ -580,8 +1898,22 @@ class Index(Bundle):
         -------
         A list of unpacked paths
         """
+        return list(self._iter_paths(raw))
+
+    def _iter_paths(self, raw: bytes) -> Iterator[bytes]:
+        """
+        Unpacks the paths one by one, see :meth:`_make_paths`.
+
+        Parameters
+        ----------
+        raw
+            packed paths
+
+        Yields
+        ------
+        The unpacked paths
+        """
         temp = []
-        paths = []
         base = False
         offset = 0
         rawlen = len(raw)-4
@@ -610,9 +1942,7 @@ class Index(Bundle):
             if base:
                 temp.append(string)
             else:
-                paths.append(string)
-
-        return paths
+                yield string
 
 
 if __name__ == '__main__':
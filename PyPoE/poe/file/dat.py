@@ -56,11 +56,17 @@ Public API
 
 .. autofunction:: set_default_spec
 
+.. autofunction:: read_dat_files
+
 Internal API
 -------------------------------------------------------------------------------
 
 .. autoclass:: DatReader
 
+.. autoclass:: DatColumn
+
+.. autoclass:: DatRecordList
+
 .. autoclass:: DatValue
 """
 
@@ -69,14 +75,24 @@ Internal API
 # =============================================================================
 
 # Python
+import os
 import struct
+import sys
 import warnings
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from enum import IntEnum
+from functools import partial
+from itertools import islice, repeat
 from io import BytesIO
 from collections import OrderedDict, defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 
 # 3rd-party
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # self
 from PyPoE.shared.decorators import deprecated, doc
@@ -93,11 +109,12 @@ from PyPoE.poe.file.specification.errors import SpecificationError, \
 # =============================================================================
 
 _default_spec = None
+_default_spec_version = None
 
 __all__ = [
     'DAT_FILE_MAGIC_NUMBER',
     'DatFile', 'RelationalReader',
-    'set_default_spec',
+    'set_default_spec', 'read_dat_files',
 ]
 
 DAT_FILE_MAGIC_NUMBER = b'\xBB\xbb\xBB\xbb\xBB\xbb\xBB\xbb'
@@ -375,7 +392,7 @@ class DatRecord(list):
         The rowid of this DatRecord instance
     """
 
-    __slots__ = ['parent', 'rowid']
+    __slots__ = ['parent', 'rowid', '__weakref__']
 
     def __init__(self, parent, rowid):
         """
@@ -447,6 +464,281 @@ class DatRecord(list):
         return self.parent.table_columns.keys()
 
 
+class DatRecordList(Sequence):
+    """
+    The rows of a dat file read in lazy mode, see :class:`DatReader`.
+
+    A row is decoded into a :class:`DatRecord` when it is first accessed.
+    Decoded rows are kept as long as they are referenced elsewhere (for
+    example by an index) and the most recently accessed rows are kept in a
+    bounded cache; other rows are decoded again on the next access.
+
+    Attributes
+    ----------
+    reader : DatReader
+        The parent DatReader instance the rows belong to
+    cache_size : int
+        Number of recently accessed rows to keep
+    transforms : list[tuple[int, callable]]
+        Functions applied to the value of a column of every row once it is
+        decoded as pairs of column index and function
+    """
+
+    DEFAULT_CACHE_SIZE = 1024
+
+    def __init__(self, reader, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Parameters
+        ----------
+        reader : DatReader
+            The parent DatReader instance the rows belong to
+        cache_size : int
+            Number of recently accessed rows to keep
+        """
+        self.reader = reader
+        self.cache_size = cache_size
+        self.transforms = []
+        self._rows = weakref.WeakValueDictionary()
+        self._recent = OrderedDict()
+
+    def __repr__(self):
+        return 'DatRecordList<%s>(file_name="%s", rows=%s)' % (
+            hex(id(self)), self.reader.file_name, len(self),
+        )
+
+    def __len__(self):
+        return self.reader.table_rows
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._get_row(i) for i in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('row index out of range')
+        return self._get_row(item)
+
+    def __iter__(self):
+        for rowid in range(len(self)):
+            yield self._get_row(rowid)
+
+    def _get_row(self, rowid):
+        """
+        Returns the decoded row from the cache or decodes it.
+
+        Parameters
+        ----------
+        rowid : int
+            The row to get
+
+        Returns
+        -------
+        DatRecord
+            The decoded row
+        """
+        row = self._rows.get(rowid)
+        if row is None:
+            row = self.reader._process_row(rowid)
+            for index, function in self.transforms:
+                row[index] = function(row[index])
+            self._rows[rowid] = row
+
+        if self.cache_size:
+            self._recent[rowid] = row
+            self._recent.move_to_end(rowid)
+            if len(self._recent) > self.cache_size:
+                self._recent.popitem(last=False)
+
+        return row
+
+    def add_transform(self, index, function):
+        """
+        Adds a function that replaces the value of a column of every row,
+        including the rows that have been decoded already.
+
+        Parameters
+        ----------
+        index : int
+            Index of the column
+        function : callable
+            Function that receives the value and returns the new value
+        """
+        for row in list(self._rows.values()):
+            row[index] = function(row[index])
+        self.transforms.append((index, function))
+
+    @property
+    def decoded_rows(self):
+        """
+        Returns
+        -------
+        int
+            Number of rows that are currently decoded
+        """
+        return len(self._rows)
+
+
+class DatColumn(ReprMixin):
+    """
+    A column of a dat file read in columnar mode, see :class:`DatReader`.
+
+    The fixed-width values of the column are a view into the table section of
+    the file. Strings, lists and other values stored in the data section are
+    only decoded when a row of the column is accessed.
+
+    Attributes
+    ----------
+    reader : DatReader
+        The parent DatReader instance this column belongs to
+    name : str
+        Name of the column
+    casts : list[tuple[DatReader.CastTypes, int, str]]
+        The casts of the column as created from the specification
+    data : numpy.ndarray
+        The fixed-width values of the column; the offsets into the data
+        section for pointers and the size and offset pairs for lists
+    mask : numpy.ndarray or None
+        Boolean array that is True for rows where the value is null (i.e.
+        0xFEFEFEFE and similar) for columns of values and generic pointers,
+        otherwise None
+    offset : int
+        Offset of the column within a row in bytes
+    """
+
+    _REPR_ARGUMENTS_IGNORE = {'reader', 'casts', 'data'}
+
+    def __init__(self, reader, name, casts, data, offset):
+        """
+        Parameters
+        ----------
+        reader : DatReader
+            The parent DatReader instance this column belongs to
+        name : str
+            Name of the column
+        casts : list[tuple[DatReader.CastTypes, int, str]]
+            The casts of the column as created from the specification
+        data : numpy.ndarray
+            The fixed-width values of the column
+        offset : int
+            Offset of the column within a row in bytes
+        """
+        self.reader = reader
+        self.name = name
+        self.casts = casts
+        self.data = data
+        self.offset = offset
+        self.mask = None
+
+        if casts[0][0] in (DatReader.CastTypes.VALUE,
+                           DatReader.CastTypes.POINTER_SELF):
+            self.mask = self._get_mask(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        for rowid in range(len(self.data)):
+            yield self[rowid]
+
+    def __getitem__(self, rowid):
+        """
+        Returns the value of the given row as it would be read in row mode.
+
+        Parameters
+        ----------
+        rowid : int
+            The row to get the value of
+
+        Returns
+        -------
+        object
+            The decoded value
+        """
+        if rowid < 0:
+            rowid += len(self.data)
+        if self.mask is not None and not self.reader.use_dat_value:
+            return None if self.mask[rowid] else self.data[rowid].item()
+
+        value = self.data[rowid]
+        if value.ndim:
+            cell_data = tuple(value.tolist())
+        else:
+            cell_data = (value.item(), )
+        return self.reader._cast_from_spec(
+            self.reader.specification.fields[self.name],
+            self.casts,
+            data=cell_data,
+            offset=self.reader._table_offset +
+            rowid * self.reader.table_record_length + self.offset,
+        )
+
+    @classmethod
+    def _get_mask(cls, data):
+        """
+        Returns where the values are null.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The values
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array that is True where the value is null
+        """
+        mask = np.zeros(data.shape, dtype=bool)
+        if data.dtype.kind in 'iu':
+            info = np.iinfo(data.dtype)
+            for value in DatReader._NULL_VALUES:
+                if info.min <= value <= info.max:
+                    mask |= data == value
+        elif data.dtype.kind == 'f':
+            for value in DatReader._NULL_VALUES:
+                # Only values a float can be equal to
+                if float(value) == value:
+                    mask |= data == value
+        return mask
+
+    def masked(self):
+        """
+        Returns the values as masked array with the null values masked.
+
+        Returns
+        -------
+        numpy.ma.MaskedArray
+            The masked values
+
+        Raises
+        ------
+        TypeError
+            if the column has values stored in the data section
+        """
+        if self.mask is None:
+            raise TypeError(
+                'Column "%s" has values stored in the data section' %
+                self.name
+            )
+        return np.ma.MaskedArray(self.data, mask=self.mask)
+
+    def to_list(self):
+        """
+        Returns the decoded values of all rows.
+
+        Returns
+        -------
+        list
+            The decoded values
+        """
+        if self.mask is not None and not self.reader.use_dat_value:
+            values = self.data.tolist()
+            for rowid in np.flatnonzero(self.mask).tolist():
+                values[rowid] = None
+            return values
+        return list(self)
+
+
 class DatReader(ReprMixin):
     """
     Attributes
@@ -461,12 +753,25 @@ class DatReader(ReprMixin):
         Whether the index is automatically build after reading
     x64 : bool
         Whether this the reader is running in 64 bit mode
+    columnar : bool
+        Whether the reader is running in columnar mode
+    lazy : bool
+        Whether the reader is running in lazy mode
+    column_data : OrderedDict[str, DatColumn]
+        Mapping of column name to :class:`DatColumn` instances in columnar
+        mode
+    table : numpy.ndarray or None
+        Structured array of the table section in columnar mode
     file_name :  str
         File name
     file_length :  int
         File length in bytes
-    table_data : list[DatRecord[object]]
-        List of rows containing DatRecord entries.
+    table_data : list[DatRecord[object]] or DatRecordList
+        List of rows containing DatRecord entries. Empty in columnar mode,
+        a :class:`DatRecordList` that decodes the rows on access in lazy mode.
+    data_parsed : list[DatValue]
+        The DatValue instances of the data section when use_dat_value is
+        enabled. Not filled in lazy mode.
     table_length :  int
         Length of table in bytes
     table_record_length :  int
@@ -503,6 +808,15 @@ class DatReader(ReprMixin):
         'double': ['d', 8],
     }
 
+    # Values that are read as None
+    _NULL_VALUES = frozenset((
+        -0x1010102, 0xFEFEFEFE, -0x101010101010102, 0xFEFEFEFEFEFEFEFE,
+        0xFFFFFFFF,
+    ))
+
+    # (file name, x64) -> (file specification, row decoder)
+    _row_decoders = {}
+
     class CastTypes(IntEnum):
         VALUE = 1
         STRING = 2
@@ -511,7 +825,8 @@ class DatReader(ReprMixin):
         POINTER_SELF = 5
 
     def __init__(self, file_name, *args, use_dat_value=True, specification=None,
-                 auto_build_index=False, x64=False):
+                 auto_build_index=False, x64=False, columnar=False,
+                 lazy=False):
         """
         Parameters
         ----------
@@ -526,6 +841,13 @@ class DatReader(ReprMixin):
             reading.
         x64 : bool
             Whether the reader should run in 64 bit mode for dat64 files.
+        columnar : bool
+            Whether to map the table section onto typed numpy arrays per
+            column (see :class:`DatColumn`) instead of reading the rows.
+            Requires numpy. Indexes are not built in columnar mode.
+        lazy : bool
+            Whether to decode the rows only when they are accessed, see
+            :class:`DatRecordList`. Building an index decodes all rows.
 
         Raises
         ------
@@ -534,11 +856,19 @@ class DatReader(ReprMixin):
         """
         self.auto_build_index = auto_build_index
         self.x64 = x64
+        self.columnar = columnar
+        self.lazy = lazy
+        self.column_data = OrderedDict()
+        self.table = None
         self.index = {}
         self.data_parsed = []
         self.data_offset = 0
         self.file_length = 0
         self._file_raw = b''
+        # offset -> (string, offset of the null terminator)
+        self._string_cache = {}
+        # offset of a string -> offset of its null terminator
+        self._string_terminators = None
         self.table_data = []
 
         self.table_length = 0
@@ -591,6 +921,9 @@ class DatReader(ReprMixin):
                     'columns_unique'):
             setattr(self, var, getattr(specification, var))
 
+        # Set once rows are read, see read
+        self._row_decoder = None
+
     def __iter__(self):
         return iter(self.table_data)
 
@@ -720,18 +1053,7 @@ class DatReader(ReprMixin):
             else:
                 value = ivalue
         elif casts[0][0] == self.CastTypes.STRING:
-            # Beginning of the sequence, +1 to adjust for it
-            offset_new = self._file_raw.find(b'\x00\x00\x00\x00', offset)
-            # Account for 0 size strings
-            if offset == offset_new:
-                string = ''
-            else:
-                # It's possible that a string ends in \x00 and the next starts
-                # with \x00
-                # UTF-16 must be at least a multiple of 2
-                while (offset_new-offset) % 2:
-                    offset_new = self._file_raw.find(b'\x00\x00\x00\x00', offset_new+1)
-                string = self._file_raw[offset:offset_new].decode('utf-16')
+            string, offset_new = self._read_string(offset)
             # Store the offset including the null terminator
             if self.use_dat_value:
                 value = DatValue(string, offset, offset_new-offset+4, parent, specification)
@@ -755,7 +1077,8 @@ class DatReader(ReprMixin):
                         value.children.append(self._cast_from_spec(specification, casts[1:], value, data_offset+i*casts[1:][0][1]))
                 elif casts[0][0] == self.CastTypes.POINTER:
                     value.child = self._cast_from_spec(specification, casts[1:], value, data_offset)
-                self.data_parsed.append(value)
+                if not self.lazy:
+                    self.data_parsed.append(value)
             else:
                 if casts[0][0] == self.CastTypes.POINTER_LIST:
                     value = []
@@ -770,7 +1093,319 @@ class DatReader(ReprMixin):
 
         return value
 
+    def _read_string(self, offset):
+        """
+        Reads a null terminated UTF-16 string from the data section.
+
+        Strings are cached by their offset and interned, since many rows
+        refer to the same strings. If numpy is available and all rows are
+        read (i.e. not in lazy or columnar mode), the null terminators of the
+        strings referenced by the table are looked up in advance by
+        :meth:`_get_string_terminators`.
+
+        Parameters
+        ----------
+        offset : int
+            Offset of the string in the file
+
+        Returns
+        -------
+        str
+            The string
+        int
+            Offset of the null terminator
+        """
+        try:
+            return self._string_cache[offset]
+        except KeyError:
+            pass
+
+        offset_new = -1
+        if np is not None and not (self.lazy or self.columnar):
+            offset_new = self._get_string_terminators().get(offset, -1)
+
+        if offset_new == -1:
+            # Beginning of the sequence, +1 to adjust for it
+            offset_new = self._file_raw.find(b'\x00\x00\x00\x00', offset)
+            # It's possible that a string ends in \x00 and the next starts
+            # with \x00
+            # UTF-16 must be at least a multiple of 2
+            while (offset_new-offset) % 2:
+                offset_new = self._file_raw.find(
+                    b'\x00\x00\x00\x00', offset_new+1)
+
+        # Account for 0 size strings
+        if offset == offset_new:
+            string = ''
+        else:
+            string = sys.intern(
+                self._file_raw[offset:offset_new].decode('utf-16'))
+
+        result = self._string_cache[offset] = (string, offset_new)
+        return result
+
+    def _get_string_terminators(self):
+        """
+        Finds the null terminators of the strings the string columns of the
+        table point to. Requires numpy.
+
+        Strings in lists are not included and are looked up when they are
+        read.
+
+        Returns
+        -------
+        dict[int, int]
+            Offset of a string -> offset of its null terminator
+        """
+        if self._string_terminators is not None:
+            return self._string_terminators
+
+        self._string_terminators = {}
+        columns = [
+            key for key, (spec, casts) in zip(self.table_columns, self.cast_spec)
+            if len(casts) == 2 and casts[0][0] == self.CastTypes.POINTER and
+            casts[1][0] == self.CastTypes.STRING
+        ]
+        if not columns or not self.table_rows:
+            return self._string_terminators
+
+        dtype, _ = self._get_table_dtype()
+        table = np.frombuffer(
+            self._file_raw,
+            dtype=dtype,
+            count=self.table_rows,
+            offset=self._table_offset,
+        )
+        offsets = np.unique(np.concatenate(
+            [table[key].astype(np.int64) for key in columns]
+        )) + self.data_offset
+        offsets = offsets[offsets < self.file_length]
+
+        self._string_terminators = self._find_string_terminators(offsets)
+        return self._string_terminators
+
+    def _find_string_terminators(self, offsets):
+        """
+        Finds the null terminators of the strings at the given offsets in
+        one pass over the data section. Requires numpy.
+
+        Parameters
+        ----------
+        offsets : numpy.ndarray
+            The sorted offsets of the strings in the data section
+
+        Returns
+        -------
+        dict[int, int]
+            Offset of a string -> offset of its null terminator
+        """
+        data = np.frombuffer(
+            self._file_raw, dtype=np.uint8, offset=self.data_offset)
+        zero = data == 0
+        # Offsets of all (overlapping) 4 null byte sequences
+        candidates = np.flatnonzero(
+            zero[:-3] & zero[1:-2] & zero[2:-1] & zero[3:]
+        ) + self.data_offset
+
+        terminators = {}
+        # UTF-16 must be at least a multiple of 2, so the terminator is the
+        # first one after the offset at an offset of the same parity
+        for parity in (0, 1):
+            parity_candidates = candidates[candidates % 2 == parity]
+            parity_offsets = offsets[offsets % 2 == parity]
+            i = np.searchsorted(parity_candidates, parity_offsets)
+            found = i < len(parity_candidates)
+            terminators.update(zip(
+                parity_offsets[found].tolist(),
+                parity_candidates[i[found]].tolist(),
+            ))
+        return terminators
+
+    def _get_row_decoder(self):
+        """
+        Returns the row decoder for the specification of this file from the
+        cache or compiles it.
+
+        Returns
+        -------
+        callable
+            The row decoder, see :meth:`_compile_row_decoder`
+        """
+        key = (self.file_name, self.x64)
+        cached = self._row_decoders.get(key)
+        # Specifications may have been reloaded since
+        if cached is None or cached[0] is not self.specification:
+            cached = (self.specification, self._compile_row_decoder())
+            self._row_decoders[key] = cached
+        return cached[1]
+
+    def _compile_row_decoder(self):
+        """
+        Generates a function that decodes a row of this file with straight-line
+        code for the casts of the specification.
+
+        The values are the same as :meth:`_process_row` creates without
+        :class:`DatValue` instances.
+
+        Returns
+        -------
+        callable
+            Function that receives the reader and the row index and returns
+            the :class:`DatRecord`
+        """
+        namespace = {
+            '_DatRecord': DatRecord,
+            '_NULL': self._NULL_VALUES,
+            '_unpack_row': struct.Struct(self.cast_row).unpack_from,
+        }
+        lines = [
+            'def decode_row(reader, rowid):',
+            '    row = _DatRecord(reader, rowid)',
+        ]
+
+        if self.cast_size:
+            lines.extend((
+                '    data_offset = reader.data_offset',
+                '    r = _unpack_row(reader._file_raw, %s + rowid * %s)' % (
+                    self._table_offset, self.cast_size),
+            ))
+
+            values = []
+            i = 0
+            for n, (spec, casts) in enumerate(self.cast_spec):
+                value = 'v%s' % n
+                decoder = '_decode%s' % n
+                if casts[0][0] in (self.CastTypes.VALUE,
+                                   self.CastTypes.POINTER_SELF):
+                    lines.extend((
+                        '    %s = r[%s]' % (value, i),
+                        '    if %s in _NULL:' % value,
+                        '        %s = None' % value,
+                    ))
+                elif casts[0][0] == self.CastTypes.POINTER:
+                    namespace[decoder] = self._compile_value_decoder(casts[1:])
+                    lines.append('    %s = %s(reader, r[%s] + data_offset)' % (
+                        value, decoder, i))
+                elif casts[0][0] == self.CastTypes.POINTER_LIST:
+                    namespace[decoder] = self._compile_list_decoder(casts[1:])
+                    lines.append(
+                        '    %s = %s(reader, r[%s], r[%s] + data_offset)' % (
+                            value, decoder, i, i + 1)
+                    )
+                    i += 1
+                i += 1
+                values.append(value)
+
+            lines.append('    row.extend((%s, ))' % ', '.join(values))
+
+        lines.append('    return row')
+
+        exec(compile(
+            '\n'.join(lines), '<row decoder for %s>' % self.file_name, 'exec'
+        ), namespace)
+        return namespace['decode_row']
+
+    def _compile_value_decoder(self, casts):
+        """
+        Returns a function that decodes a value stored in the data section.
+
+        Parameters
+        ----------
+        casts : list[tuple[DatReader.CastTypes, int, str]]
+            The casts of the value
+
+        Returns
+        -------
+        callable
+            Function that receives the reader and the offset of the value and
+            returns the value
+        """
+        cast_type, size, cast = casts[0]
+        null = self._NULL_VALUES
+
+        if cast_type == self.CastTypes.STRING:
+            def decode(reader, offset):
+                return reader._read_string(offset)[0]
+        elif cast_type in (self.CastTypes.VALUE, self.CastTypes.POINTER_SELF):
+            unpack = struct.Struct('<' + cast).unpack_from
+
+            def decode(reader, offset):
+                value = unpack(reader._file_raw, offset)[0]
+                return None if value in null else value
+        elif cast_type == self.CastTypes.POINTER:
+            unpack = struct.Struct('<' + cast).unpack_from
+            decode_child = self._compile_value_decoder(casts[1:])
+
+            def decode(reader, offset):
+                return decode_child(
+                    reader,
+                    unpack(reader._file_raw, offset)[0] + reader.data_offset,
+                )
+        else:
+            unpack = struct.Struct('<' + cast).unpack_from
+            decode_list = self._compile_list_decoder(casts[1:])
+
+            def decode(reader, offset):
+                length, pointer = unpack(reader._file_raw, offset)
+                return decode_list(reader, length, pointer + reader.data_offset)
+
+        return decode
+
+    def _compile_list_decoder(self, casts):
+        """
+        Returns a function that decodes a list stored in the data section.
+
+        Parameters
+        ----------
+        casts : list[tuple[DatReader.CastTypes, int, str]]
+            The casts of the list items
+
+        Returns
+        -------
+        callable
+            Function that receives the reader, length and offset of the list
+            and returns the list
+        """
+        cast_type, size, cast = casts[0]
+        null = self._NULL_VALUES
+
+        if cast_type in (self.CastTypes.VALUE, self.CastTypes.POINTER_SELF):
+            # Unpack all items at once
+            def decode(reader, length, offset):
+                if not length:
+                    return []
+                return [
+                    None if value in null else value
+                    for value in struct.unpack_from(
+                        '<%s%s' % (length, cast), reader._file_raw, offset)
+                ]
+        elif cast_type == self.CastTypes.POINTER:
+            decode_child = self._compile_value_decoder(casts[1:])
+
+            def decode(reader, length, offset):
+                if not length:
+                    return []
+                data_offset = reader.data_offset
+                return [
+                    decode_child(reader, pointer + data_offset)
+                    for pointer in struct.unpack_from(
+                        '<%s%s' % (length, cast), reader._file_raw, offset)
+                ]
+        else:
+            decode_item = self._compile_value_decoder(casts)
+
+            def decode(reader, length, offset):
+                return [
+                    decode_item(reader, offset + i * size)
+                    for i in range(length)
+                ]
+
+        return decode
+
     def _process_row(self, rowid):
+        if self._row_decoder is not None:
+            return self._row_decoder(self, rowid)
+
         offset = 4 + rowid * self.table_record_length
         row_data = DatRecord(self, rowid)
         data_raw = self._file_raw[offset:offset+self.table_record_length]
@@ -796,6 +1431,42 @@ class DatReader(ReprMixin):
         return row_data
 
     def read(self, raw):
+        self._read_header(raw)
+
+        self.table_data = []
+
+        # Prepare data section
+        self.data_parsed = list()
+
+        if self.columnar:
+            self._read_columns()
+            return self.table_data
+
+        # DatValue instances are created by _cast_from_spec
+        if not self.use_dat_value:
+            self._row_decoder = self._get_row_decoder()
+
+        if self.lazy:
+            self.table_data = DatRecordList(self)
+        else:
+            for i in range(0, self.table_rows):
+                self.table_data.append(self._process_row(i))
+
+        if self.auto_build_index:
+            self.build_index()
+
+        return self.table_data
+
+    def _read_header(self, raw):
+        """
+        Reads the row count and the table and data section offsets and
+        validates them against the specification.
+
+        Parameters
+        ----------
+        raw : bytes or BytesIO
+            The contents of the file
+        """
         # TODO consider memory issues for saving raw contents
         if isinstance(raw, bytes):
             self._file_raw = raw
@@ -804,6 +1475,8 @@ class DatReader(ReprMixin):
         else:
             raise TypeError('Raw must be bytes or BytesIO instance, got %s' %
                             type)
+        self._string_cache = {}
+        self._string_terminators = None
 
         # Jump to last byte to get length
         self.file_length = len(self._file_raw)
@@ -840,19 +1513,175 @@ class DatReader(ReprMixin):
                 }
             )
 
-        self.table_data = []
+    def _get_column_values(self):
+        """
+        Returns the values of the read rows per column in a compact form that
+        can be sent to another process, see :meth:`_read_column_values`.
 
-        # Prepare data section
+        If numpy is available, columns of plain values are sent as typed
+        arrays with a mask of the null values, strings as the unique strings
+        and an array of indexes into them and lists of values as flat arrays.
+        Other columns are sent as tuples.
+
+        Returns
+        -------
+        list[tuple]
+            Every column as a tuple of its kind followed by its data
+        """
+        columns = []
+        for i, (key, (spec, casts)) in enumerate(
+                zip(self.table_columns, self.cast_spec)):
+            values = [row[i] for row in self.table_data]
+            if np is None:
+                columns.append(('values', tuple(values)))
+            elif len(casts) == 1 and casts[0][0] in (
+                    self.CastTypes.VALUE, self.CastTypes.POINTER_SELF):
+                columns.append((
+                    'array',
+                    np.array(
+                        [0 if value is None else value for value in values],
+                        dtype='<' + casts[0][2],
+                    ),
+                    np.array([value is None for value in values], dtype=bool),
+                ))
+            elif len(casts) == 2 and casts[1][0] == self.CastTypes.STRING:
+                strings = {}
+                codes = np.array(
+                    [strings.setdefault(value, len(strings))
+                     for value in values],
+                    dtype=np.uint32,
+                )
+                columns.append(('strings', tuple(strings), codes))
+            elif len(casts) == 2 and \
+                    casts[0][0] == self.CastTypes.POINTER_LIST and \
+                    casts[1][0] == self.CastTypes.VALUE:
+                flat = [item for value in values for item in value]
+                mask = np.array([item is None for item in flat], dtype=bool)
+                columns.append((
+                    'list',
+                    np.array(
+                        [0 if item is None else item for item in flat],
+                        dtype='<' + casts[1][2],
+                    ),
+                    mask,
+                    np.array([len(value) for value in values], dtype=np.int64),
+                ))
+            else:
+                columns.append(('values', tuple(values)))
+        return columns
+
+    def _read_column_values(self, raw, columns):
+        """
+        Creates the rows from values read by another reader instead of
+        decoding them.
+
+        Parameters
+        ----------
+        raw : bytes or BytesIO
+            The contents of the file
+        columns : list[tuple]
+            The columns as returned by :meth:`_get_column_values`
+
+        Returns
+        -------
+        list[DatRecord]
+            The rows
+        """
+        self._read_header(raw)
+
+        self.table_data = []
         self.data_parsed = list()
 
-        for i in range(0, self.table_rows):
-            self.table_data.append(self._process_row(i))
+        column_values = []
+        for column in columns:
+            kind = column[0]
+            if kind == 'array':
+                values = column[1].tolist()
+                for i in np.flatnonzero(column[2]).tolist():
+                    values[i] = None
+            elif kind == 'strings':
+                strings = column[1]
+                values = [strings[code] for code in column[2].tolist()]
+            elif kind == 'list':
+                flat = column[1].tolist()
+                for i in np.flatnonzero(column[2]).tolist():
+                    flat[i] = None
+                flat = iter(flat)
+                values = [
+                    list(islice(flat, length))
+                    for length in column[3].tolist()
+                ]
+            else:
+                values = column[1]
+            column_values.append(values)
+
+        values = zip(*column_values) if column_values else \
+            repeat((), self.table_rows)
+        for rowid, row_values in enumerate(values):
+            row = DatRecord(self, rowid)
+            row.extend(row_values)
+            self.table_data.append(row)
 
         if self.auto_build_index:
             self.build_index()
 
         return self.table_data
 
+    def _get_table_dtype(self):
+        """
+        Returns the structured numpy dtype of a row of the table section.
+
+        Returns
+        -------
+        numpy.dtype
+            The dtype with a field for every column
+        list[int]
+            The offset of every column in a row
+        """
+        fields = []
+        offsets = []
+        offset = 0
+        for key, (spec, casts) in zip(self.table_columns, self.cast_spec):
+            cast = casts[0][2]
+            if len(cast) == 1:
+                fields.append((key, '<' + cast))
+            else:
+                fields.append((key, '<' + cast[0], (len(cast), )))
+            offsets.append(offset)
+            offset += casts[0][1]
+        return np.dtype(fields), offsets
+
+    def _read_columns(self):
+        """
+        Maps the table section onto a structured numpy array and creates the
+        :class:`DatColumn` instances.
+        """
+        if np is None:
+            raise ImportError('numpy is required for the columnar mode')
+
+        dtype, offsets = self._get_table_dtype()
+
+        if self.table_rows and dtype.itemsize:
+            self.table = np.frombuffer(
+                self._file_raw,
+                dtype=dtype,
+                count=self.table_rows,
+                offset=self._table_offset,
+            )
+        else:
+            self.table = np.zeros(self.table_rows, dtype=dtype)
+
+        self.column_data = OrderedDict()
+        for key, (spec, casts), offset in zip(
+                self.table_columns, self.cast_spec, offsets):
+            self.column_data[key] = DatColumn(
+                reader=self,
+                name=key,
+                casts=casts,
+                data=self.table[key],
+                offset=offset,
+            )
+
     def print_data(self):
         """
         For debugging. Prints out data.
@@ -988,6 +1817,8 @@ class RelationalReader(AbstractFileCache):
             self._language = ''
         else:
             self._language = language + '/'
+        # file name -> DatFile read by preload, but not processed yet
+        self._preloaded = {}
         super().__init__(*args, **kwargs)
 
     def __getitem__(self, item):
@@ -1054,11 +1885,95 @@ class RelationalReader(AbstractFileCache):
         else:
             return self._set_value(value, other, key, offset)
 
+    def _add_error_context(self, function, context):
+        """
+        Wraps a function setting relational values, so specification errors
+        also name the file, column and related file.
+
+        Parameters
+        ----------
+        function : callable
+            Function that receives the value and returns the related value
+        context : dict[str, str]
+            The file name as 'fn', column name as 'rn' and related file name
+            as 'on'
+
+        Returns
+        -------
+        callable
+            The wrapped function
+        """
+        def wrapper(value):
+            try:
+                return function(value)
+            except SpecificationError as e:
+                raise SpecificationError(
+                    e.code,
+                    '%(fn)s:%(rn)s->%(on)s:%(msg)s' % dict(context, msg=e.msg),
+                )
+        return wrapper
+
     def _get_file_instance_args(self, file_name, *args, **kwargs):
         opts = super()._get_file_instance_args(file_name)
         opts['file_name'] = file_name.replace('Data/' + self._language, '')
         return opts
 
+    def _create_instance(self, file_name, *args, **kwargs):
+        try:
+            return self._preloaded.pop(file_name)
+        except KeyError:
+            return super()._create_instance(file_name, *args, **kwargs)
+
+    def preload(self, file_names, workers=0):
+        """
+        Reads the given files in parallel worker processes ahead of accessing
+        them, see :func:`read_dat_files`.
+
+        Relations of the preloaded files are processed once they are
+        accessed as usual. Files that have been read already are skipped.
+
+        Parameters
+        ----------
+        file_names : Iterable[str]
+            The names of the .dat files to read; Data/ is added if missing
+        workers : int
+            Number of worker processes; 0 to use one process per CPU
+
+        Raises
+        ------
+        ValueError
+            if the files are read with DatValue instances, lazily or in
+            columnar mode
+        """
+        if self.read_options.get('use_dat_value', True) or \
+                self.read_options.get('lazy') or \
+                self.read_options.get('columnar'):
+            raise ValueError(
+                'Preloading requires use_dat_value=False and the regular mode'
+            )
+
+        paths = OrderedDict()
+        for file_name in file_names:
+            if not file_name.startswith('Data/'):
+                file_name = 'Data/' + self._language + file_name
+            if file_name not in self.files and file_name not in self._preloaded:
+                paths[self._get_file_instance_args(file_name)['file_name']] = \
+                    file_name
+
+        names = {path: name for name, path in paths.items()}
+        for name, df in read_dat_files(
+                (
+                    (names[path], data) for path, data in
+                    self.file_system.get_files(names)
+                ),
+                workers=workers,
+                specification=self.read_options.get('specification'),
+                x64=self.read_options.get('x64', False),
+                auto_build_index=self.read_options.get(
+                    'auto_build_index', False),
+                ):
+            self._preloaded[paths[name]] = df
+
     def get_file(self, file_name):
         """
         Attempts to return a dat file from the cache and if it isn't available,
@@ -1107,36 +2022,36 @@ class RelationalReader(AbstractFileCache):
                         and not key_offset and key_id:
                     df_other_reader.build_index(key_id)
 
-                index = df.reader.table_columns[key]['index']
-
-                for i, row in enumerate(df.reader.table_data):
-                    try:
-                        df.reader.table_data[i][index] = vf(
-                            row[index],
-                            df_other_reader,
-                            key_id,
-                            key_offset,
-                        )
-                    except SpecificationError as e:
-                        raise SpecificationError(
-                            e.code,
-                            '%(fn)s:%(rn)s->%(on)s:%(msg)s' % {
-                                'fn': file_name,
-                                'rn': key,
-                                'on': spec_row.key,
-                                'msg': e.msg,
-                            },
-                        )
+                convert = self._add_error_context(
+                    partial(
+                        vf,
+                        other=df_other_reader,
+                        key=key_id,
+                        offset=key_offset,
+                    ),
+                    {
+                        'fn': file_name,
+                        'rn': key,
+                        'on': spec_row.key,
+                    },
+                )
             elif spec_row.enum:
-                const_enum = getattr(constants, spec_row.enum)
-                index = df.reader.table_columns[key]['index']
-                for i, row in enumerate(df.reader.table_data):
-                    df.reader.table_data[i][index] = vf(
-                        value=row[index],
-                        other=const_enum,
-                        key=None,
-                        offset=0
-                    )
+                convert = partial(
+                    vf,
+                    other=getattr(constants, spec_row.enum),
+                    key=None,
+                    offset=0,
+                )
+            else:
+                continue
+
+            index = df.reader.table_columns[key]['index']
+            if isinstance(df.reader.table_data, DatRecordList):
+                # Rows are converted once they are decoded
+                df.reader.table_data.add_transform(index, convert)
+            else:
+                for row in df.reader.table_data:
+                    row[index] = convert(row[index])
 
         return df
 
@@ -1159,8 +2074,130 @@ def set_default_spec(version=constants.VERSION.DEFAULT, reload=False):
     reload : bool
         Whether to reload the version.
     """
-    global _default_spec
+    global _default_spec, _default_spec_version
     _default_spec = load(version=version, reload=reload)
+    _default_spec_version = version
+
+
+def read_dat_files(files, workers=0, specification=None, x64=False,
+                   auto_build_index=False):
+    """
+    Reads multiple dat files in parallel in a pool of worker processes.
+
+    The workers decode the rows without :class:`DatValue` instances and send
+    the values back per column in a compact form (see
+    :meth:`DatReader._get_column_values`); the rows are created from those
+    in this process. Only up to twice as many files as there are workers
+    are held in memory at once. Every worker looks up the specification of the files itself,
+    using the default specification of the version set in this process (see
+    :func:`set_default_spec`) unless a specification is given.
+
+    Parameters
+    ----------
+    files : Iterable[tuple[str, bytes]]
+        Pairs of the file name (e.g. Mods.dat) and the contents of the file
+    workers : int
+        Number of worker processes; 0 to use one process per CPU and 1 to
+        read the files in this process
+    specification : Specification or None
+        Specification to use instead of the default specification
+    x64 : bool
+        Whether the files are dat64 files
+    auto_build_index : bool
+        Whether to build the index for unique columns after reading
+
+    Yields
+    ------
+    str
+        The file name
+    DatFile
+        The read file
+
+    Raises
+    ------
+    errors.SpecificationError
+        if a file is not in the specification or does not match it
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    read_options = {
+        'specification': specification,
+        'x64': x64,
+        'auto_build_index': auto_build_index,
+        'use_dat_value': False,
+    }
+
+    if workers == 1:
+        for file_name, raw in files:
+            df = DatFile(file_name)
+            df.read(file_path_or_raw=raw, **read_options)
+            yield file_name, df
+        return
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_dat_worker,
+            initargs=(_default_spec_version, specification)) as executor:
+        # Only keep a few files in flight, so not all of them are held in
+        # memory at once
+        futures = {}
+        files = iter(files)
+        while True:
+            for file_name, raw in islice(files, 2*workers - len(futures)):
+                future = executor.submit(_read_dat_worker, file_name, raw, x64)
+                futures[future] = (file_name, raw)
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_name, raw = futures.pop(future)
+                df = DatFile(file_name)
+                df.reader = DatReader(file_name, **read_options)
+                df.reader._read_column_values(raw, future.result())
+                yield file_name, df
+
+
+def _init_dat_worker(version, specification):
+    """
+    Sets the specification of a worker process of :func:`read_dat_files`.
+
+    Parameters
+    ----------
+    version : constants.VERSION
+        Version of the default specification
+    specification : Specification or None
+        Specification to use instead of the default specification
+    """
+    global _default_spec
+    if specification is None:
+        set_default_spec(version=version)
+    else:
+        _default_spec = specification
+
+
+def _read_dat_worker(file_name, raw, x64):
+    """
+    Reads a dat file in a worker process of :func:`read_dat_files`.
+
+    Parameters
+    ----------
+    file_name : str
+        Name of the file
+    raw : bytes
+        Contents of the file
+    x64 : bool
+        Whether the file is a dat64 file
+
+    Returns
+    -------
+    list[tuple]
+        The columns, see :meth:`DatReader._get_column_values`
+    """
+    reader = DatReader(file_name, use_dat_value=False, x64=x64)
+    reader.read(raw)
+    return reader._get_column_values()
 
 # =============================================================================
 # Init
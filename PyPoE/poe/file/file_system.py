@@ -30,7 +30,11 @@ Classes
 
 .. autoclass: FileSystem
 
+.. autoclass: FileSystemStats
+
 .. autoclass: FileSystemNode
+
+.. autoclass: LazyFileSystemNode
 """
 
 # =============================================================================
@@ -38,29 +42,221 @@ Classes
 # =============================================================================
 
 # Python
+import json
 import os
-from typing import Union
+import re
+import time
+import warnings
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from fnmatch import fnmatchcase
+from typing import Union, Iterable, Iterator, Tuple, Dict, List, Set, Any
 
 # 3rd-party
 import brotli
 
 # self
 from PyPoE.poe.file.shared import FILE_SYSTEM_TYPES, AbstractFileSystemNode
-from PyPoE.poe.file.ggpk import GGPKFile
-from PyPoE.poe.file.bundle import Index
+from PyPoE.poe.file.ggpk import GGPKFile, FileRecord as GGPKFileRecord
+from PyPoE.poe.file.bundle import Bundle, BundleCache, BundleDiskCache, \
+    BundleRecord, DirectoryRecord, FileRecord, Index, PATH_TYPES
 from PyPoE.poe.file.shared import ParserError
+from PyPoE.shared.mixins import ReprMixin
 
 # =============================================================================
 # Globals
 # =============================================================================
 
-__all__ = ['FileSystem']
+__all__ = ['FileSystem', 'FileSystemStats']
 
 # =============================================================================
 # Classes
 # =============================================================================
 
 
+class FileSystemStats(ReprMixin):
+    """
+    Counters and timing histograms of the reads of a :class:`FileSystem`.
+
+    Counters are kept per backend (``resolve``, ``bundle``,
+    ``bundle_disk_cache``, ``ggpk``, ``disk`` and ``dds``), timings per
+    operation (for example ``bundle.decompress``). The timings are sorted
+    into buckets by the upper bounds in :attr:`HISTOGRAM_BOUNDS`.
+
+    Attributes
+    ----------
+    counters : dict[str, collections.Counter]
+        Mapping of backend -> counter name -> value
+    timings : dict[str, dict[str, Any]]
+        Mapping of operation -> count, total and maximum time in seconds and
+        the number of timings per histogram bucket
+    files : collections.Counter
+        Number of reads per file path
+    """
+
+    # Upper bounds in seconds of the histogram buckets; the last bucket holds
+    # all longer timings
+    HISTOGRAM_BOUNDS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+    def __init__(self):
+        self.counters: Dict[str, Counter] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.files: Counter = Counter()
+
+    def reset(self):
+        """
+        Resets all counters and timings.
+        """
+        self.counters.clear()
+        self.timings.clear()
+        self.files.clear()
+
+    def add(self, backend: str, **counts: int):
+        """
+        Adds to the counters of a backend.
+
+        Parameters
+        ----------
+        backend
+            Name of the backend
+        counts
+            Counter name -> value to add
+        """
+        try:
+            counter = self.counters[backend]
+        except KeyError:
+            counter = self.counters[backend] = Counter()
+        counter.update(counts)
+
+    def add_time(self, operation: str, seconds: float):
+        """
+        Adds a timing of an operation.
+
+        Parameters
+        ----------
+        operation
+            Name of the operation
+        seconds
+            Time the operation took
+        """
+        try:
+            timing = self.timings[operation]
+        except KeyError:
+            timing = self.timings[operation] = {
+                'count': 0,
+                'total': 0.0,
+                'max': 0.0,
+                'histogram': [0] * (len(self.HISTOGRAM_BOUNDS) + 1),
+            }
+        timing['count'] += 1
+        timing['total'] += seconds
+        if seconds > timing['max']:
+            timing['max'] = seconds
+        timing['histogram'][bisect_left(self.HISTOGRAM_BOUNDS, seconds)] += 1
+
+    @contextmanager
+    def timer(self, operation: str):
+        """
+        Context manager that adds the time its body took as timing of the
+        given operation.
+
+        Parameters
+        ----------
+        operation
+            Name of the operation
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(operation, time.perf_counter() - start)
+
+    def as_dict(self, top: Union[int, None] = None) -> Dict[str, Any]:
+        """
+        Returns the stats as JSON serializable dictionary.
+
+        Parameters
+        ----------
+        top
+            Number of most read files to include; None for all
+
+        Returns
+        -------
+            Dictionary with the counters, timings and files
+        """
+        labels = ['<=%g' % bound for bound in self.HISTOGRAM_BOUNDS]
+        labels.append('>%g' % self.HISTOGRAM_BOUNDS[-1])
+        return {
+            'counters': {
+                backend: dict(counter)
+                for backend, counter in sorted(self.counters.items())
+            },
+            'timings': {
+                operation: {
+                    'count': timing['count'],
+                    'total': timing['total'],
+                    'max': timing['max'],
+                    'histogram': dict(zip(labels, timing['histogram'])),
+                }
+                for operation, timing in sorted(self.timings.items())
+            },
+            'files': dict(self.files.most_common(top)),
+        }
+
+    def dump(self, path: str, top: Union[int, None] = None):
+        """
+        Writes the stats as JSON file.
+
+        Parameters
+        ----------
+        path
+            Path of the file to write
+        top
+            Number of most read files to include; None for all
+        """
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(top=top), f, indent=4)
+
+    def get_summary(self, top: int = 10) -> str:
+        """
+        Returns a human readable summary of the stats.
+
+        Parameters
+        ----------
+        top
+            Number of most read files to list
+
+        Returns
+        -------
+            The summary
+        """
+        lines = ['Counters:']
+        for backend, counter in sorted(self.counters.items()):
+            lines.append('  %s: %s' % (backend, ', '.join(
+                '%s=%s' % item for item in sorted(counter.items()))))
+
+        lines.append('Timings:')
+        for operation, timing in sorted(self.timings.items()):
+            lines.append(
+                '  %s: count=%s, total=%.3fs, mean=%.3fms, max=%.3fms' % (
+                    operation,
+                    timing['count'],
+                    timing['total'],
+                    timing['total'] / timing['count'] * 1000,
+                    timing['max'] * 1000,
+                )
+            )
+
+        if self.files:
+            lines.append('Most read files:')
+            for path, count in self.files.most_common(top):
+                lines.append('  %s: %s' % (path, count))
+
+        return '\n'.join(lines)
+
+
 class FileSystemNode(AbstractFileSystemNode):
     _REPR_ARGUMENTS_IGNORE = {'parent'}
 
@@ -97,6 +293,40 @@ class FileSystemNode(AbstractFileSystemNode):
         return self._name
 
 
+class LazyFileSystemNode(FileSystemNode):
+    """
+    :class:`FileSystemNode` that creates the nodes of its children on first
+    access from :meth:`FileSystem.scandir`.
+    """
+
+    __slots__ = ['_children', '_complete']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._complete: bool = self.is_file
+
+    @property
+    def children(self) -> Dict[str, 'LazyFileSystemNode']:
+        if not self._complete:
+            for name, (is_file, file_system_type) in sorted(
+                    self.file_system.scandir(self.get_path()).items()):
+                if name not in self._children:
+                    self._children[name] = LazyFileSystemNode(
+                        file_system=self.file_system,
+                        name=name,
+                        parent=self,
+                        file_system_type=file_system_type,
+                        is_file=is_file,
+                    )
+            self._complete = True
+            self.invalidate_index()
+        return self._children
+
+    @children.setter
+    def children(self, children: Dict[str, 'LazyFileSystemNode']):
+        self._children = children
+
+
 class FileSystem:
     """
     The FileSystem class is used to simplify accessing files from the game via
@@ -107,39 +337,320 @@ class FileSystem:
 
     Further decompression of bundles or reading of data will be only be done
     when the get_file method is called.
+
+    Which of the index, GGPK or disk a path resolves to is remembered,
+    including paths that could not be found. The remembered paths are
+    forgotten once the index or GGPK file change, which is checked at most
+    every resolution_check_interval seconds; the index and GGPK are read
+    again in that case.
+
+    Read bundles are kept in a :class:`BundleCache` with a memory budget, so
+    bundles used frequently don't have to be read and decompressed again.
+    Optionally, decompressed bundles are also kept in a
+    :class:`BundleDiskCache`, so further instances can load them without
+    decompressing.
+
+    Attributes
+    ----------
+    bundle_cache : BundleCache
+        Cache of read bundles
+    bundle_disk_cache : BundleDiskCache or None
+        Persistent cache of decompressed bundles
+    decompression_workers : int
+        Number of threads used to decompress the chunks of a bundle
+    resolution_check_interval : float
+        Minimum number of seconds between checks whether the index or GGPK
+        file changed
     """
-    def __init__(self, root_path: str):
+    def __init__(self,
+                 root_path: str,
+                 bundle_cache_size: Union[int, None] =
+                 BundleCache.DEFAULT_MAX_SIZE,
+                 decompression_workers: int = 1,
+                 index_cache_dir: Union[str, None] = None,
+                 ggpk_cache_dir: Union[str, None] = None,
+                 bundle_cache_dir: Union[str, None] = None,
+                 bundle_cache_dir_size: Union[int, None] =
+                 BundleDiskCache.DEFAULT_MAX_SIZE,
+                 resolution_check_interval: float = 1.0,
+                 stats: bool = False):
         """
         Parameters
         ----------
         root_path
             The root game directory path (where PathOfExile.exe is located)
+        bundle_cache_size
+            Memory budget in bytes for read bundles; None for no limit
+        decompression_workers
+            Number of threads used to decompress the chunks of a bundle; 0 to
+            use one thread per CPU
+        index_cache_dir
+            Directory to cache the parsed bundle index in, so further
+            instances can load it without parsing; None to disable
+        ggpk_cache_dir
+            Directory to cache the record table of the GGPK in, so further
+            instances can load it without scanning the GGPK; None to disable
+        bundle_cache_dir
+            Directory to cache decompressed bundles in, so further instances
+            can load them without decompressing; None to disable
+        bundle_cache_dir_size
+            Size limit in bytes for the bundles cached on disk; None for no
+            limit
+        resolution_check_interval
+            Minimum number of seconds between checks whether the index or
+            GGPK file changed
+        stats
+            Whether to record counters and timings of the reads in the
+            stats attribute, see :class:`FileSystemStats`
         """
         self.directory: Union[FileSystemNode, None] = None
+        self.bundle_cache: BundleCache = BundleCache(
+            max_size=bundle_cache_size)
+        self.bundle_disk_cache: Union[BundleDiskCache, None] = None
+        if bundle_cache_dir is not None:
+            self.bundle_disk_cache = BundleDiskCache(
+                bundle_cache_dir, max_size=bundle_cache_dir_size)
+        self.decompression_workers: int = decompression_workers
+        self.resolution_check_interval: float = resolution_check_interval
+        self.index_cache_dir: Union[str, None] = index_cache_dir
+        self.ggpk_cache_dir: Union[str, None] = ggpk_cache_dir
+        self.stats: Union[FileSystemStats, None] = \
+            FileSystemStats() if stats else None
 
         self.root_path: str = root_path
         self.ggpk: Union[GGPKFile, None] = None
+        self.index: Union[Index, None] = None
+
+        # path -> (file system type, record or disk path) or None if missing
+        self._resolved: Dict[str, Union[Tuple[FILE_SYSTEM_TYPES, Union[
+            FileRecord, GGPKFileRecord, str]], None]] = {}
+        self._backing_state: Tuple = ()
+        self._backing_checked: float = 0
+        # directory path -> (sub directory names, directory records)
+        self._bundle_directories: Union[
+            Dict[str, Tuple[Set[str], List[DirectoryRecord]]], None] = None
 
-        ggpk_path = os.path.join(root_path, 'content.ggpk')
-        if os.path.exists(os.path.join(root_path, 'content.ggpk')):
-            self.ggpk = GGPKFile()
-            self.ggpk.read(ggpk_path)
-            self.ggpk.directory_build()
+        self.reload()
 
-        self.index: Union[Index, None] = Index()
+    def reload(self):
+        """
+        Reads the GGPK and index again and clears the remembered paths and
+        read bundles.
+        """
+        self._backing_state = self._get_backing_state()
+        self._backing_checked = time.monotonic()
+        self._resolved.clear()
+        self._bundle_directories = None
+        self.bundle_cache.clear()
+        self.directory = None
+        if self.ggpk is not None:
+            # Release the memory map, so the file is not kept open (and
+            # locked on Windows)
+            self.ggpk.close()
+        self.ggpk = None
+
+        ggpk_path = os.path.join(self.root_path, 'content.ggpk')
+        if os.path.exists(ggpk_path):
+            with self._timer('ggpk.open'):
+                self.ggpk = GGPKFile(cache_dir=self.ggpk_cache_dir)
+                self.ggpk.read(ggpk_path)
+                self.ggpk.directory_build(lazy=True)
+
+        self.index = Index(
+            workers=self.decompression_workers,
+            cache_dir=self.index_cache_dir,
+        )
         try:
-            if self.ggpk:
-                self.index.read(self.ggpk[self.index.PATH].record.extract())
-            else:
-                self.index.read(os.path.join(root_path, self.index.PATH))
+            with self._timer('index.open'):
+                if self.ggpk:
+                    self.index.read(
+                        self.ggpk[self.index.PATH].record.extract())
+                else:
+                    self.index.read(
+                        os.path.join(self.root_path, self.index.PATH))
         except FileNotFoundError:
             self.index = None
 
+    def _timer(self, operation: str):
+        """
+        Returns a context manager that times the operation if stats are
+        enabled.
+
+        Parameters
+        ----------
+        operation
+            Name of the operation
+
+        Returns
+        -------
+            The context manager
+        """
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.timer(operation)
+
+    @contextmanager
+    def _track_decompression(self, bundle: Bundle):
+        """
+        Context manager that counts and times the chunks of the bundle
+        decompressed within its body if stats are enabled.
+
+        Parameters
+        ----------
+        bundle
+            The bundle to track
+        """
+        if self.stats is None:
+            yield
+            return
+
+        def get_chunks():
+            if bundle.is_decompressed:
+                return set(range(bundle.entry_count))
+            return set(bundle.decompressed_chunks)
+
+        before = get_chunks()
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        chunks = get_chunks().difference(before)
+        if chunks:
+            self.stats.add_time('bundle.decompress', seconds)
+            self.stats.add(
+                'bundle',
+                chunks_decompressed=len(chunks),
+                bytes_decompressed=sum(
+                    bundle.get_chunk_size(i) for i in chunks),
+            )
+
+    def _add_read(self,
+                  file_system_type: FILE_SYSTEM_TYPES,
+                  path: str,
+                  data: bytes):
+        """
+        Counts a read file if stats are enabled.
+
+        Parameters
+        ----------
+        file_system_type
+            Where the file is stored
+        path
+            The path of the file
+        data
+            The data of the file
+        """
+        if self.stats is None:
+            return
+        self.stats.add(
+            file_system_type.name.lower(), calls=1, bytes_read=len(data))
+        self.stats.files[path] += 1
+
+    def _get_backing_state(self) -> Tuple:
+        state = []
+        for path in (Index.PATH, 'content.ggpk'):
+            try:
+                stat = os.stat(os.path.join(self.root_path, path))
+            except OSError:
+                state.append(None)
+            else:
+                state.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(state)
+
+    def _check_backing_files(self):
+        """
+        Reloads if the index or GGPK file changed since they were read.
+        """
+        now = time.monotonic()
+        if now - self._backing_checked < self.resolution_check_interval:
+            return
+        self._backing_checked = now
+        if self._get_backing_state() != self._backing_state:
+            self.reload()
+
+    def _resolve(self, path: str) -> Union[Tuple[FILE_SYSTEM_TYPES, Union[
+            FileRecord, GGPKFileRecord, str]], None]:
+        """
+        Resolves where the file of the given path is stored.
+
+        Parameters
+        ----------
+        path
+            The path relative to the root game directory (i.e. root_path)
+
+        Returns
+        -------
+            The file system type and the bundle file record, GGPK file record
+            or disk path of the file, or None if the file can not be found
+        """
+        try:
+            resolved = self._resolved[path]
+        except KeyError:
+            pass
+        else:
+            if self.stats is not None:
+                self.stats.add('resolve', cache_hits=1)
+            return resolved
+
+        if self.stats is not None:
+            self.stats.add('resolve', cache_misses=1)
+
+        resolved = None
+        with self._timer('resolve'):
+            if self.index:
+                fr = self.index.files.get(
+                    self.index.get_hash(path, type=PATH_TYPES.FILE))
+                if fr is not None:
+                    resolved = (FILE_SYSTEM_TYPES.BUNDLE, fr)
+
+            if resolved is None and self.ggpk:
+                try:
+                    node = self.ggpk[path]
+                except FileNotFoundError:
+                    pass
+                else:
+                    if node.is_file:
+                        resolved = (FILE_SYSTEM_TYPES.GGPK, node.record)
+
+            if resolved is None:
+                disk_path = os.path.join(self.root_path, path)
+                if os.path.isfile(disk_path):
+                    resolved = (FILE_SYSTEM_TYPES.DISK, disk_path)
+
+        self._resolved[path] = resolved
+        return resolved
+
+    def clear_resolution_cache(self):
+        """
+        Forgets where paths have been resolved to, for example after files
+        have been added to the game directory.
+        """
+        self._resolved.clear()
+
+    def exists(self, path: str) -> bool:
+        """
+        Returns whether a file exists in the index, GGPK or on disk without
+        reading it.
+
+        Parameters
+        ----------
+        path
+            The path relative to the root game directory (i.e. root_path)
+
+        Returns
+        -------
+            Whether the file exists
+        """
+        self._check_backing_files()
+        return self._resolve(path) is not None
+
     def get_file(self, path: str) -> bytes:
         """
         Retrieves a file contents as binary data via the given path (relative
         to the root directory)
 
+        Files are looked up in the index first, then in the GGPK and lastly
+        in the root directory.
+
         Parameters
         ----------
         path
@@ -149,37 +660,197 @@ class FileSystem:
         -------
             The unbuffered binary file data in bytes
         """
+        self._check_backing_files()
+        resolved = self._resolve(path)
+        if resolved is None:
+            raise FileNotFoundError(
+                'Specified file can not be found in the Index, content.ggpk '
+                'or disk')
+
+        file_system_type, target = resolved
+        if file_system_type == FILE_SYSTEM_TYPES.BUNDLE:
+            bundle = self._get_bundle(target.bundle)
+            with self._track_decompression(bundle):
+                data = target.get_file(bundle)
+            self.bundle_cache.trim()
+        elif file_system_type == FILE_SYSTEM_TYPES.GGPK:
+            with self._timer('ggpk.read'):
+                data = target.get_data()
+        else:
+            try:
+                with self._timer('disk.read'):
+                    with open(target, 'rb') as f:
+                        data = f.read()
+            except FileNotFoundError:
+                # Removed since it was resolved
+                del self._resolved[path]
+                return self.get_file(path)
+
+        self._add_read(file_system_type, path, data)
+        return data
+
+    def get_files(self,
+                  paths: Iterable[str],
+                  ignore_missing: bool = False) -> Iterator[Tuple[str, bytes]]:
+        """
+        Retrieves the contents of multiple files.
+
+        All paths are resolved first. Files stored in bundles are grouped by
+        their bundle and every chunk of a bundle required by any of the
+        requested files is decompressed exactly once. The results are yielded
+        bundle by bundle as they become ready, so the order may differ from
+        the order of the given paths.
+
+        Parameters
+        ----------
+        paths
+            The paths relative to the root game directory (i.e. root_path)
+        ignore_missing
+            Whether to skip files that can not be found instead of raising an
+            error
+
+        Yields
+        ------
+        str
+            The path of the file
+        bytes
+            The unbuffered binary file data
+
+        Raises
+        ------
+        FileNotFoundError
+            if a file can not be found and ignore_missing is False
+        """
+        self._check_backing_files()
+        paths = list(paths)
         if self.index:
+            # Hashes the paths not resolved yet in a single batch
+            self.index.get_hashes(
+                [path for path in paths if path not in self._resolved],
+                type=PATH_TYPES.FILE,
+            )
+
+        bundles: Dict[str, List[Tuple[str, FileRecord]]] = OrderedDict()
+        ggpk_records: Dict[GGPKFileRecord, List[str]] = {}
+        disk_paths = []
+        for path in paths:
+            resolved = self._resolve(path)
+            if resolved is None:
+                if ignore_missing:
+                    continue
+                raise FileNotFoundError(
+                    'Specified file "%s" can not be found in the Index, '
+                    'content.ggpk or disk' % path)
+
+            file_system_type, target = resolved
+            if file_system_type == FILE_SYSTEM_TYPES.BUNDLE:
+                bundles.setdefault(target.bundle.name, []).append(
+                    (path, target))
+            elif file_system_type == FILE_SYSTEM_TYPES.GGPK:
+                ggpk_records.setdefault(target, []).append(path)
+            else:
+                disk_paths.append(path)
+
+        for records in bundles.values():
+            records.sort(key=lambda item: item[1].file_offset)
+            bundle = self._get_bundle(records[0][1].bundle)
+            chunks = set()
+            for path, fr in records:
+                if fr.file_size:
+                    chunks.update(range(*bundle.get_chunk_range(
+                        fr.file_offset, fr.file_size)))
+            with self._track_decompression(bundle):
+                bundle.decompress_chunks(chunks)
+
+            for path, fr in records:
+                data = fr.get_file(bundle)
+                self._add_read(FILE_SYSTEM_TYPES.BUNDLE, path, data)
+                yield path, data
+
+            self.bundle_cache.trim()
+
+        if ggpk_records:
+            # Read the files from the GGPK in the order of their data
+            for record, data in self.ggpk.extract_many(ggpk_records):
+                for path in ggpk_records[record]:
+                    self._add_read(FILE_SYSTEM_TYPES.GGPK, path, data)
+                    yield path, data
+
+        for path in disk_paths:
             try:
-                fr = self.index.get_file_record(path)
+                data = self.get_file(path)
             except FileNotFoundError:
-                pass
+                if ignore_missing:
+                    continue
+                raise
+            yield path, data
+
+    def _get_bundle(self, bundle_record: BundleRecord) -> Bundle:
+        """
+        Returns the read bundle for the given record from the cache or reads
+        it from the GGPK or disk.
+
+        Parameters
+        ----------
+        bundle_record
+            The record of the bundle to get
+
+        Returns
+        -------
+            The read bundle
+        """
+        bundle = self.bundle_cache.get(bundle_record.name)
+        if self.stats is not None:
+            if bundle is None:
+                self.stats.add('bundle', cache_misses=1, bundles_read=1,
+                               bundle_bytes_read=bundle_record.size)
             else:
+                self.stats.add('bundle', cache_hits=1)
+
+        if bundle is None:
+            with self._timer('bundle.read'):
                 if self.ggpk:
-                    fr.bundle.read(
-                        self.ggpk[fr.bundle.ggpk_path].record.extract()
+                    bundle = bundle_record.read(
+                        self.ggpk[bundle_record.ggpk_path].record.extract(),
+                        workers=self.decompression_workers,
                     )
                 else:
-                    fr.bundle.read(os.path.join(
-                        self.root_path, fr.bundle.ggpk_path))
-                return fr.get_file()
+                    bundle = bundle_record.read(
+                        os.path.join(self.root_path, bundle_record.ggpk_path),
+                        workers=self.decompression_workers,
+                    )
+            if self.bundle_disk_cache is not None:
+                self._load_bundle_from_disk_cache(bundle_record.name, bundle)
+            self.bundle_cache.add(bundle_record.name, bundle)
+        return bundle
 
-        # If the file is in the index, this section can't be reached
-        if self.ggpk:
-            try:
-                return self.ggpk[path].record.extract()
-            except FileNotFoundError:
-                pass
+    def _load_bundle_from_disk_cache(self, name: str, bundle: Bundle):
+        """
+        Loads the decompressed data of the bundle from the disk cache, or
+        decompresses the bundle and stores it in the disk cache.
+
+        Parameters
+        ----------
+        name
+            Name of the bundle
+        bundle
+            The read bundle
+        """
+        with self._timer('bundle_disk_cache.load'):
+            loaded = self.bundle_disk_cache.load(name, bundle)
+        if self.stats is not None:
+            self.stats.add('bundle_disk_cache',
+                           hits=int(loaded), misses=int(not loaded))
+        if loaded:
+            return
 
-        # If no GGPK is loaded or the file isn't within the GGPK, lastly the
-        # root directory is tried
         try:
-            with open(os.path.join(self.root_path, path), 'rb') as f:
-                return f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                'Specified file can not be found in the Index, content.ggpk '
-                'or disk')
+            with self._track_decompression(bundle):
+                self.bundle_disk_cache.store(name, bundle)
+        except OSError as e:
+            warnings.warn(
+                'Failed to write bundle cache for "%s": %s' % (name, e)
+            )
 
     def extract_dds(self, data: bytes) -> bytes:
         """
@@ -214,24 +885,382 @@ class FileSystem:
         brotli.error
             If whatever bytes were read were not brotli compressed
         """
+        if self.stats is not None:
+            self.stats.add('dds', calls=1)
         # Already a DDS file, so return it
         if data[:4] == b'DDS ':
             return data
         # Is this a reference?
         elif data[:1] == b'*':
+            if self.stats is not None:
+                self.stats.add('dds', references=1)
             path = data[1:].decode()
             data = self.get_file(path)
             return self.extract_dds(data)
         else:
-            size = int.from_bytes(data[:4], 'little')
-            dec = brotli.decompress(data[4:])
-            if len(dec) != size:
-                raise ParserError(
-                    'Decompressed size does not match size in the header'
-                )
+            dec, seconds = self._decompress_dds(data)
+            if self.stats is not None:
+                self.stats.add_time('dds.decompress', seconds)
+                self.stats.add('dds', bytes_decompressed=len(dec))
             return dec
 
-    def build_directory(self) -> FileSystemNode:
+    @staticmethod
+    def _decompress_dds(data: bytes) -> Tuple[bytes, float]:
+        """
+        Decompresses brotli compressed .dds file data.
+
+        Parameters
+        ----------
+        data
+            The compressed data, prefixed with the uncompressed size
+
+        Returns
+        -------
+            The uncompressed data and the time the decompression took in
+            seconds
+
+        Raises
+        ------
+        ParserError
+            If the uncompressed size does not match the size in the header
+        brotli.error
+            If the data is not brotli compressed
+        """
+        start = time.perf_counter()
+        size = int.from_bytes(data[:4], 'little')
+        dec = brotli.decompress(data[4:])
+        if len(dec) != size:
+            raise ParserError(
+                'Decompressed size does not match size in the header'
+            )
+        return dec, time.perf_counter() - start
+
+    def extract_dds_many(self,
+                         paths: Iterable[str],
+                         workers: int = 0,
+                         ignore_missing: bool = False) -> \
+            Iterator[Tuple[str, bytes]]:
+        """
+        Extracts the .dds files of the given paths, see :meth:`extract_dds`.
+
+        The files are read with :meth:`get_files` and references are
+        followed for all files at once, so every file is read once no matter
+        how many of the paths refer to it. Every referenced file is
+        decompressed once and the brotli decompression runs on a thread
+        pool. The results are yielded as they become ready, so the order
+        may differ from the order of the given paths.
+
+        Parameters
+        ----------
+        paths
+            The paths relative to the root game directory (i.e. root_path)
+        workers
+            Number of threads to decompress the files with; 0 to use one
+            thread per CPU
+        ignore_missing
+            Whether to skip files that can not be found, including files
+            with a reference to a missing file, instead of raising an error
+
+        Yields
+        ------
+        str
+            The path of the file
+        bytes
+            the uncompressed, dereferenced .dds file data
+
+        Raises
+        ------
+        FileNotFoundError
+            if a file can not be found and ignore_missing is False
+        ParserError
+            If a reference is circular or the uncompressed size does not
+            match the size in the header
+        brotli.error
+            If whatever bytes were read were not brotli compressed
+        """
+        paths = list(OrderedDict.fromkeys(paths))
+        # path -> referenced path
+        references: Dict[str, str] = {}
+        # path -> data of files that are not references
+        files: Dict[str, bytes] = {}
+        missing = set()
+        # Paths read already or about to be read
+        requested = set(paths)
+
+        to_read = paths
+        while to_read:
+            read = dict(self.get_files(to_read, ignore_missing=ignore_missing))
+            next_read = OrderedDict()
+            for path in to_read:
+                data = read.get(path)
+                if data is None:
+                    missing.add(path)
+                elif data[:1] == b'*':
+                    target = data[1:].decode()
+                    references[path] = target
+                    if target not in requested:
+                        requested.add(target)
+                        next_read[target] = None
+                else:
+                    files[path] = data
+            to_read = list(next_read)
+
+        if self.stats is not None:
+            self.stats.add('dds', calls=len(paths), references=sum(
+                1 for path in paths if path in references))
+
+        # target path -> requested paths referring to it
+        targets: Dict[str, List[str]] = OrderedDict()
+        for path in paths:
+            target = path
+            chain = set()
+            while target in references:
+                if target in chain:
+                    raise ParserError(
+                        'Circular reference in "%s"' % path
+                    )
+                chain.add(target)
+                target = references[target]
+            if target not in missing:
+                targets.setdefault(target, []).append(path)
+
+        compressed = []
+        for target, target_paths in targets.items():
+            data = files[target]
+            if data[:4] == b'DDS ':
+                for path in target_paths:
+                    yield path, data
+            else:
+                compressed.append(target)
+
+        if workers == 0:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(compressed) <= 1:
+            results = (
+                (target, self._decompress_dds(files[target]))
+                for target in compressed
+            )
+        else:
+            results = self._decompress_dds_threaded(
+                {target: files[target] for target in compressed}, workers)
+
+        for target, (dec, seconds) in results:
+            # Release the compressed data early
+            del files[target]
+            if self.stats is not None:
+                self.stats.add_time('dds.decompress', seconds)
+                self.stats.add('dds', bytes_decompressed=len(dec))
+            for path in targets[target]:
+                yield path, dec
+
+    def _decompress_dds_threaded(self,
+                                 files: Dict[str, bytes],
+                                 workers: int) -> \
+            Iterator[Tuple[str, Tuple[bytes, float]]]:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._decompress_dds, data): target
+                for target, data in files.items()
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _get_bundle_directories(self) -> \
+            Dict[str, Tuple[Set[str], List[DirectoryRecord]]]:
+        """
+        Returns the directory tree of the index, created on first access.
+
+        Only the path of each directory is unpacked, the files of a
+        directory are unpacked when it is listed.
+
+        Returns
+        -------
+            Mapping of directory path -> (names of sub directories, directory
+            records of the files in the directory)
+        """
+        if self._bundle_directories is None:
+            directories = {'': (set(), [])}
+            if self.index:
+                for dir_record in self.index.directories.values():
+                    path = self.index.get_directory_path(dir_record)
+                    directories.setdefault(path, (set(), []))[1].append(
+                        dir_record)
+                    # Register the path with all parent directories
+                    while path:
+                        parent, _, name = path.rpartition('/')
+                        try:
+                            directories[parent][0].add(name)
+                            break
+                        except KeyError:
+                            directories[parent] = ({name}, [])
+                        path = parent
+            self._bundle_directories = directories
+        return self._bundle_directories
+
+    def scandir(self, path: str = '') -> \
+            Dict[str, Tuple[bool, FILE_SYSTEM_TYPES]]:
+        """
+        Lists the contents of a directory merged from the index, GGPK and
+        disk.
+
+        If a name exists in multiple places, the index takes precedence over
+        the GGPK, which takes precedence over the disk.
+
+        Parameters
+        ----------
+        path
+            The directory path relative to the root game directory (i.e.
+            root_path)
+
+        Returns
+        -------
+            Mapping of name -> (whether it is a file, where it is located)
+        """
+        path = path.replace('\\', '/').strip('/')
+        entries = {}
+
+        try:
+            with os.scandir(os.path.join(self.root_path, path)) as it:
+                for entry in it:
+                    entries[entry.name] = (
+                        not entry.is_dir(), FILE_SYSTEM_TYPES.DISK)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        if self.ggpk:
+            try:
+                node = self.ggpk[path] if path else self.ggpk.directory
+            except FileNotFoundError:
+                pass
+            else:
+                if node.is_directory:
+                    for name, child in node.children.items():
+                        entries[name] = (child.is_file, FILE_SYSTEM_TYPES.GGPK)
+
+        if self.index:
+            directories, dir_records = self._get_bundle_directories().get(
+                path, ((), ()))
+            for name in directories:
+                entries[name] = (False, FILE_SYSTEM_TYPES.BUNDLE)
+            for dir_record in dir_records:
+                for name in dir_record.files:
+                    entries[name] = (True, FILE_SYSTEM_TYPES.BUNDLE)
+
+        return entries
+
+    def listdir(self, path: str = '') -> List[str]:
+        """
+        Returns the sorted names of the files and directories in a directory,
+        merged from the index, GGPK and disk.
+
+        Parameters
+        ----------
+        path
+            The directory path relative to the root game directory (i.e.
+            root_path)
+
+        Returns
+        -------
+            Sorted names of the files and directories
+        """
+        return sorted(self.scandir(path))
+
+    def walk(self, top: str = '') -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Walks the directory tree merged from the index, GGPK and disk top-down
+        like :func:`os.walk`.
+
+        The directory names may be modified in place to skip directories.
+
+        Parameters
+        ----------
+        top
+            The directory path to start at relative to the root game directory
+            (i.e. root_path)
+
+        Yields
+        ------
+        str
+            The directory path
+        list[str]
+            Sorted names of the sub directories
+        list[str]
+            Sorted names of the files
+        """
+        stack = [top.replace('\\', '/').strip('/')]
+        while stack:
+            path = stack.pop()
+            directories = []
+            files = []
+            for name, (is_file, _) in sorted(self.scandir(path).items()):
+                (files if is_file else directories).append(name)
+            yield path, directories, files
+            stack.extend(
+                path + '/' + name if path else name
+                for name in reversed(directories)
+            )
+
+    def glob(self, pattern: str) -> List[str]:
+        """
+        Returns the paths of the files and directories matching the glob
+        pattern, merged from the index, GGPK and disk.
+
+        Like :mod:`glob`, wildcards only match within a single path component
+        and ``**`` matches any number of directories. Only the directories
+        required by the pattern are listed.
+
+        Parameters
+        ----------
+        pattern
+            glob pattern relative to the root game directory (i.e. root_path),
+            for example ``Art/2DArt/*.dds`` or ``Data/**/*.dat``
+
+        Returns
+        -------
+            Sorted matching paths
+        """
+        magic = re.compile('[*?[]')
+        parts = pattern.replace('\\', '/').strip('/').split('/')
+        results = set()
+
+        stack = [('', 0)]
+        while stack:
+            path, i = stack.pop()
+            part = parts[i]
+            last = i == len(parts) - 1
+            if part == '**':
+                if last:
+                    for directory, directories, files in self.walk(path):
+                        for name in directories + files:
+                            results.add(
+                                directory + '/' + name if directory else name)
+                    continue
+                # Zero directories
+                stack.append((path, i + 1))
+                entries = self.scandir(path)
+                for name, (is_file, _) in entries.items():
+                    if not is_file:
+                        stack.append(
+                            (path + '/' + name if path else name, i))
+                continue
+
+            entries = self.scandir(path)
+            if magic.search(part):
+                names = [name for name in entries if fnmatchcase(name, part)]
+            else:
+                names = [part] if part in entries else []
+
+            for name in names:
+                child = path + '/' + name if path else name
+                if last:
+                    results.add(child)
+                elif not entries[name][0]:
+                    stack.append((child, i + 1))
+
+        return sorted(results)
+
+    def build_directory(self, lazy: bool = False) -> FileSystemNode:
         """
         Builds a joint directory from the files available on disk, in ggpk and
         in bundles.
@@ -239,10 +1268,27 @@ class FileSystem:
         The directory is not required to retrieve files from the file system
         and serves more educational purposes.
 
+        Parameters
+        ----------
+        lazy
+            Whether to only create the root node and create the nodes of a
+            directory once its children are accessed, see
+            :class:`LazyFileSystemNode`. Otherwise the entire tree is built.
+
         Returns
         -------
             The directory.
         """
+        if lazy:
+            self.directory = LazyFileSystemNode(
+                file_system=self,
+                name='',
+                parent=None,
+                file_system_type=FILE_SYSTEM_TYPES.ROOT,
+                is_file=False,
+            )
+            return self.directory
+
         self.directory = FileSystemNode(
             file_system=self,
             name='',
@@ -36,6 +36,8 @@ Public API
 
     .. automethod:: __getitem__
 
+.. autoclass:: DIFF_TYPES
+
 
 Internal API
 -------------------------------------------------------------------------------
@@ -46,6 +48,8 @@ General
 
     .. automethod:: __getitem__
 
+.. autoclass:: LazyDirectoryNode
+
 Records
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
 
@@ -72,11 +76,14 @@ Miscellaneous
 # =============================================================================
 
 # Python
+import hashlib
 import io
+import mmap
 import struct
 import os
 import warnings
-from typing import Union, Dict
+from enum import IntEnum
+from typing import Union, Dict, List, Iterable, Iterator, Tuple
 
 # 3rd Party
 
@@ -84,6 +91,7 @@ from typing import Union, Dict
 from PyPoE.shared import InheritedDocStringsMeta
 from PyPoE.shared.decorators import doc
 from PyPoE.shared.mixins import ReprMixin
+from PyPoE.shared.murmur2 import murmur2_32
 from PyPoE.poe.file.shared import AbstractFileReadOnly, \
     AbstractFileSystemNode, FILE_SYSTEM_TYPES, ParserError
 
@@ -91,7 +99,10 @@ from PyPoE.poe.file.shared import AbstractFileReadOnly, \
 # Globals
 # =============================================================================
 
-__all__ = ['GGPKFile']
+__all__ = ['GGPKFile', 'DIFF_TYPES']
+
+# Size of the window searched for the next valid tag after an invalid one
+RESYNC_WINDOW = 0x10000
 
 
 # =============================================================================
@@ -111,6 +122,16 @@ class InvalidTagException(GGPKException):
     pass
 
 
+# =============================================================================
+# Enums
+# =============================================================================
+
+
+class DIFF_TYPES(IntEnum):
+    NEW = 1
+    DELETED = 2
+    CHANGED = 3
+
 # =============================================================================
 # Classes
 # =============================================================================
@@ -147,6 +168,24 @@ class BaseRecord(ReprMixin):
         """
         pass
 
+    def read_from(self, data, offset):
+        """
+        Read this record's header from the given data of a GGPKFile.
+
+        Parameters
+        ----------
+        data : mmap.mmap or bytes
+            Data of the GGPKFile
+        offset : int
+            Offset of the record header after length and tag
+
+        Returns
+        -------
+        int
+            Offset after this record
+        """
+        return offset
+
     def write(self, ggpkfile):
         """
         Write this record's header for the given GGPKFile instance.
@@ -211,6 +250,14 @@ class GGPKRecord(BaseRecord):
         for i in range(0, records):
             self.offsets.append(struct.unpack('<q', ggpkfile.read(8))[0])
 
+    @doc(doc=BaseRecord.read_from)
+    def read_from(self, data, offset):
+        records = struct.unpack_from('<i', data, offset)[0]
+        self.offsets = list(
+            struct.unpack_from('<%sq' % records, data, offset + 4)
+        )
+        return offset + 4 + 8 * records
+
     @doc(doc=BaseRecord.write)
     def write(self, ggpkfile):
         # Write length & tag
@@ -283,6 +330,25 @@ class DirectoryRecord(MixinRecord, BaseRecord):
                 offset=struct.unpack('<q', ggpkfile.read(8))[0],
             ))
 
+    @doc(doc=BaseRecord.read_from)
+    def read_from(self, data, offset):
+        self._name_length, self.entries_length = struct.unpack_from(
+            '<ii', data, offset)
+        self.hash = int.from_bytes(data[offset+8:offset+40], 'big')
+        offset += 40
+        # UTF-16 2-byte width, null terminated
+        self._name = data[
+            offset:offset + 2 * (self._name_length - 1)].decode('UTF-16_LE')
+        offset += 2 * self._name_length
+        end = offset + 12 * self.entries_length
+        with memoryview(data) as view:
+            self.entries = [
+                DirectoryRecordEntry(hash=hash, offset=entry_offset)
+                for hash, entry_offset in struct.iter_unpack(
+                    '<Iq', view[offset:end])
+            ]
+        return end
+
     @doc(doc=BaseRecord.write)
     def write(self, ggpkfile):
         # Error Checking & variable preparation
@@ -331,6 +397,24 @@ class FileRecord(MixinRecord, BaseRecord):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
+    def get_data(self, copy: bool = True) -> Union[bytes, memoryview]:
+        """
+        Returns the contents of this file.
+
+        Parameters
+        ----------
+        copy
+            Whether to return a copy of the contents or a read-only
+            memoryview of the memory mapped GGPK file
+
+        Returns
+        -------
+        bytes or memoryview
+            the contents of the file
+        """
+        return self._container.get_data(
+            self.data_start, self.data_length, copy=copy)
+
     def extract(self, buffer=None):
         """
         Extracts this file contents into a memory file object.
@@ -348,10 +432,8 @@ class FileRecord(MixinRecord, BaseRecord):
             memory file buffer object
         """
         if buffer is None:
-            return self._container.get_read_buffer(
-                self._container._file_path_or_raw,
-                self.extract,
-            )
+            # The memory file shares the bytes object until it is written to
+            return io.BytesIO(self.get_data())
 
         # The buffer object is taken care of in get_read_buffer if it's a file
         buffer.seek(self.data_start)
@@ -375,8 +457,7 @@ class FileRecord(MixinRecord, BaseRecord):
         name = self._name if name is None else name 
         path = os.path.join(directory, name)
         with open(path, 'bw') as exfile:
-            # TODO Mem leak?
-            exfile.write(self.extract().read())
+            exfile.write(self.get_data(copy=False))
 
     @doc(doc=BaseRecord.read)
     def read(self, ggpkfile):
@@ -392,6 +473,19 @@ class FileRecord(MixinRecord, BaseRecord):
         
         ggpkfile.seek(self.data_length, os.SEEK_CUR)
 
+    @doc(doc=BaseRecord.read_from)
+    def read_from(self, data, offset):
+        self._name_length = struct.unpack_from('<i', data, offset)[0]
+        self.hash = int.from_bytes(data[offset+4:offset+36], 'big')
+        offset += 36
+        # UTF-16 2-byte width, null terminated
+        self._name = data[
+            offset:offset + 2 * (self._name_length - 1)].decode('UTF-16')
+        self.data_start = offset + 2 * self._name_length
+        # Length 4B - Tag 4B - STRLen 4B - Hash 32B + STR ?B
+        self.data_length = self.length - 44 - self._name_length * 2
+        return self.data_start + self.data_length
+
     @doc(doc=BaseRecord.write)
     def write(self, ggpkfile):
         # Error checking & variable preparation first
@@ -427,6 +521,11 @@ class FreeRecord(BaseRecord):
         self.next_free = struct.unpack('<q', ggpkfile.read(8))[0]
         ggpkfile.seek(self.length -16, os.SEEK_CUR)
 
+    @doc(doc=BaseRecord.read_from)
+    def read_from(self, data, offset):
+        self.next_free = struct.unpack_from('<q', data, offset)[0]
+        return offset + self.length - 8
+
     @doc(doc=BaseRecord.write)
     def write(self, ggpkfile):
         # Write length & tag
@@ -479,7 +578,82 @@ class DirectoryNode(AbstractFileSystemNode):
             return self.record.extract()
         else:
             raise ValueError('Only files can have their data extracted')
-        
+
+
+class LazyDirectoryNode(DirectoryNode):
+    """
+    :class:`DirectoryNode` that creates the nodes of its children on first
+    access.
+
+    Looking up a path via ``__getitem__`` only creates the nodes along
+    that path; the child entries of each directory are matched by the
+    murmur2 hash of the lower case name stored in
+    :attr:`DirectoryRecordEntry.hash`. Accessing :attr:`children` creates
+    the nodes of all children of the directory.
+    """
+
+    __slots__ = ['_children', '_complete', '_entries']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Whether all children have been created
+        self._complete: bool = self.is_file
+        # Mapping of name hash -> entries, created on first lookup
+        self._entries: Union[Dict[int, List[DirectoryRecordEntry]], None] = \
+            None
+
+    @property
+    def children(self) -> Dict[str, 'LazyDirectoryNode']:
+        if not self._complete:
+            records = self.record._container.records
+            for entry in self.record.entries:
+                try:
+                    record = records[entry.offset]
+                except KeyError:
+                    continue
+                if record.name not in self._children:
+                    self._add_child(record, entry.hash)
+            self._complete = True
+            self.invalidate_index()
+        return self._children
+
+    @children.setter
+    def children(self, children: Dict[str, 'LazyDirectoryNode']):
+        self._children = children
+
+    @doc(doc=AbstractFileSystemNode.get_child)
+    def get_child(self, name: str) -> Union['LazyDirectoryNode', None]:
+        child = self._children.get(name)
+        if child is not None or self._complete:
+            return child
+
+        if self._entries is None:
+            self._entries = {}
+            for entry in self.record.entries:
+                self._entries.setdefault(entry.hash, []).append(entry)
+
+        records = self.record._container.records
+        hash = murmur2_32(name.lower().encode('utf-16le'))
+        for entry in self._entries.get(hash, ()):
+            record = records.get(entry.offset)
+            if record is not None and record.name == name:
+                node = self._add_child(record, entry.hash)
+                self.invalidate_index()
+                return node
+        return None
+
+    def _add_child(self,
+                   record: Union[DirectoryRecord, FileRecord],
+                   hash: int) -> 'LazyDirectoryNode':
+        node = LazyDirectoryNode(
+            parent=self,
+            is_file=isinstance(record, FileRecord),
+            record=record,
+            hash=hash,
+        )
+        self._children[record.name] = node
+        return node
+
 
 class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
     """
@@ -487,6 +661,9 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
 
     Attributes
     ----------
+    cache_dir : str or None
+        Directory to store the record table in, so it can be loaded instead
+        of scanning the file again on the next read. None to disable.
     directory : DirectoryNode
         root :class:`DirectoryNode` instance
     records : dict[int, BaseRecord]
@@ -495,9 +672,21 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
 
     EXTENSION = '.ggpk'
 
-    def __init__(self, *args, **kwargs):
+    CACHE_MAGIC = b'PyPoEGPK'
+    CACHE_VERSION = 2
+
+    _RECORD_TYPES = {
+        b'FILE': FileRecord,
+        b'PDIR': DirectoryRecord,
+        b'FREE': FreeRecord,
+        b'GGPK': GGPKRecord,
+    }
+
+    def __init__(self, *args, cache_dir: Union[str, None] = None, **kwargs):
         AbstractFileReadOnly.__init__(self, *args, **kwargs)
+        self.cache_dir: Union[str, None] = cache_dir
         self.directory: Union[DirectoryNode, None] = None
+        self._data: Union[mmap.mmap, bytes, None] = None
         self.records: Dict[int, BaseRecord] = {}
 
     def __getitem__(self, item: str) -> DirectoryNode:
@@ -547,29 +736,49 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
     # Private
     #
 
-    def _read_record(self, records, ggpkfile, offset: int):
-        length = struct.unpack('<i', ggpkfile.read(4))[0]
-        tag = ggpkfile.read(4)
-        
-        '''for recordcls in recordsc:
-            if recordcls.tag == tag:
-                break
-
-        record = recordcls(self, length, offset)'''
-
-        if tag == b'FILE':
-            record = FileRecord(self, length, offset)
-        elif tag == b'FREE':
-            record = FreeRecord(self, length, offset)
-        elif tag == b'PDIR':
-            record = DirectoryRecord(self, length, offset)
-        elif tag == b'GGPK':
-            record = GGPKRecord(self, length, offset)
-        else:
+    def _read_record(self, records, ggpkfile, offset: int) -> int:
+        length, tag = struct.unpack_from('<i4s', ggpkfile, offset)
+
+        try:
+            record = self._RECORD_TYPES[tag](self, length, offset)
+        except KeyError:
             raise InvalidTagException(tag)
 
-        record.read(ggpkfile)
+        next_offset = record.read_from(ggpkfile, offset + 8)
         records[offset] = record
+        return next_offset
+
+    def _find_record(self, data, offset: int) -> int:
+        """
+        Finds the offset of the next record after the invalid record at the
+        given offset.
+
+        Parameters
+        ----------
+        data : mmap.mmap or bytes
+            Data of the GGPKFile
+        offset
+            Offset of the invalid record
+
+        Returns
+        -------
+            Offset of the next record or -1 if there is none
+        """
+        size = len(data)
+        # The tag is preceded by u32 length, so the earliest possible tag
+        # position is 4 bytes after the next byte
+        start = offset + 5
+        while start < size:
+            # Overlap windows by 3 bytes to find tags on the boundary
+            end = start + RESYNC_WINDOW + 3
+            indexes = [
+                data.find(tag, start, end) for tag in self._RECORD_TYPES
+            ]
+            indexes = [index for index in indexes if index != -1]
+            if indexes:
+                return min(indexes) - 4
+            start += RESYNC_WINDOW
+        return -1
 
     def diff(self, other_ggpk, out_file=None):
         """
@@ -579,6 +788,8 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
 
         Optionally writes this list to the specified out_file
 
+        To process the differences as they are found, use :meth:`iter_diff`.
+
         Parameters
         ----------
         other_ggpk : GGPKFile
@@ -604,36 +815,17 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
         ValueError
             if any of the GGPKFile instances do not have their directory build
         """
-        if not isinstance(other_ggpk, GGPKFile):
-            raise TypeError('other_ggpk must a parsed GGPK file instance')
-
-        if not self.is_parsed or  not other_ggpk.is_parsed:
-            raise ValueError('Both ggpk files must be parsed and have their '
-                             'directory build.')
-
-        data = [{'ggpk': self}, {'ggpk': other_ggpk}]
-
-        for gdict in data:
-            gdict['files'] = {}
-
-            def add_file(node, depth):
-                if not isinstance(node.record, FileRecord):
-                    return
-                gdict['files'][node.get_path()] = node.record.hash
-
-            gdict['ggpk'].directory.walk(add_file)
-
-            gdict['set'] = set(gdict['files'].keys())
-
-        new_files = sorted(list(data[0]['set'].difference(data[1]['set'])))
-        deleted_files = sorted(list(data[1]['set'].difference(data[0]['set'])))
-        changed_files = []
-        for fn in sorted(list(data[0]['set'].union(data[1]['set']))):
-                try:
-                    if data[0]['files'][fn] != data[1]['files'][fn]:
-                        changed_files.append(fn)
-                except KeyError:
-                    pass
+        paths = {
+            DIFF_TYPES.NEW: [],
+            DIFF_TYPES.DELETED: [],
+            DIFF_TYPES.CHANGED: [],
+        }
+        for diff_type, path in self.iter_diff(other_ggpk):
+            paths[diff_type].append(path)
+
+        new_files = sorted(paths[DIFF_TYPES.NEW])
+        deleted_files = sorted(paths[DIFF_TYPES.DELETED])
+        changed_files = sorted(paths[DIFF_TYPES.CHANGED])
 
         if out_file:
             with open(out_file, 'w') as f:
@@ -656,7 +848,95 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
 
         return new_files, deleted_files, changed_files
 
-    def build_directory(self, parent: DirectoryNode = None) -> DirectoryNode:
+    def iter_diff(self, other_ggpk: 'GGPKFile') -> \
+            Iterator[Tuple[DIFF_TYPES, str]]:
+        """
+        Yields the file paths that differ between this GGPKFile instance and
+        another GGPKFile instance as they are found.
+
+        Directories are only descended into if the hashes of their records
+        differ, so identical sub trees are skipped entirely. Combined with
+        a lazily built directory, only the nodes of differing directories
+        are created.
+
+        Parameters
+        ----------
+        other_ggpk
+            Other parsed GGPKFile instance to compare against
+
+        Yields
+        ------
+        DIFF_TYPES
+            Whether the file is new in this GGPKFile, was deleted from the
+            other GGPKFile or has changed contents
+        str
+            The file path
+
+        Raises
+        ------
+        TypeError
+            if other_ggpk is not a GGPKFile instance
+        ValueError
+            if any of the GGPKFile instances are not parsed
+        ValueError
+            if any of the GGPKFile instances do not have their directory build
+        """
+        if not isinstance(other_ggpk, GGPKFile):
+            raise TypeError('other_ggpk must a parsed GGPK file instance')
+
+        if not self.is_parsed or not other_ggpk.is_parsed:
+            raise ValueError('Both ggpk files must be parsed and have their '
+                             'directory build.')
+
+        def files(node, path):
+            if node.is_file:
+                yield path
+                return
+            stack = [(node, path)]
+            while stack:
+                node, path = stack.pop()
+                for name, child in sorted(node.children.items(), reverse=True):
+                    child_path = path + '/' + name if path else name
+                    if child.is_file:
+                        yield child_path
+                    else:
+                        stack.append((child, child_path))
+
+        stack = [(self.directory, other_ggpk.directory, '')]
+        while stack:
+            node, other_node, path = stack.pop()
+            if node.record.hash == other_node.record.hash:
+                continue
+
+            children = node.children
+            other_children = other_node.children
+            directories = []
+            for name in sorted(children.keys() | other_children.keys()):
+                child_path = path + '/' + name if path else name
+                child = children.get(name)
+                other_child = other_children.get(name)
+                if other_child is None:
+                    for file_path in files(child, child_path):
+                        yield DIFF_TYPES.NEW, file_path
+                elif child is None:
+                    for file_path in files(other_child, child_path):
+                        yield DIFF_TYPES.DELETED, file_path
+                elif child.is_file != other_child.is_file:
+                    for file_path in files(child, child_path):
+                        yield DIFF_TYPES.NEW, file_path
+                    for file_path in files(other_child, child_path):
+                        yield DIFF_TYPES.DELETED, file_path
+                elif child.is_file:
+                    if child.record.hash != other_child.record.hash:
+                        yield DIFF_TYPES.CHANGED, child_path
+                else:
+                    directories.append((child, other_child, child_path))
+
+            stack.extend(reversed(directories))
+
+    def build_directory(self,
+                        parent: DirectoryNode = None,
+                        lazy: bool = False) -> DirectoryNode:
         """
         Rebuilds the directory or the specified :class:`DirectoryNode`
         If the root directory is rebuild it will be stored in the directory
@@ -666,6 +946,10 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
         ----------
         parent : :class:`DirectoryNode` or None
             parent :class:`DirectoryNode`. If None generate the root directory
+        lazy
+            Whether to only create the root node of the directory and create
+            further nodes on access, see :class:`LazyDirectoryNode`. Only
+            applies if parent is None.
 
 
         Returns
@@ -695,7 +979,7 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
                 raise ParserError('GGPKRecord does not contain a DirectoryRecord,\
                     got %s' % type(record))
 
-            root = DirectoryNode(
+            root = (LazyDirectoryNode if lazy else DirectoryNode)(
                 parent=None,
                 is_file=False,
                 record=record,
@@ -703,6 +987,8 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
             )
 
             self.directory = root
+            if lazy:
+                return root
         else:
             root = parent
 
@@ -732,6 +1018,8 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
         except IndexError:
             pass
 
+        root.invalidate_index()
+
         return root
 
     directory_build = build_directory
@@ -739,56 +1027,326 @@ class GGPKFile(AbstractFileReadOnly, metaclass=InheritedDocStringsMeta):
     def _read(self, buffer, *args, **kwargs):
         """
         Reads the records from the file into object.records.
+
+        Files on disk are memory mapped rather than read.
+        """
+        self.close()
+        try:
+            data = mmap.mmap(buffer.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            if isinstance(buffer, io.BytesIO):
+                data = buffer.getvalue()
+            else:
+                buffer.seek(0, os.SEEK_SET)
+                data = buffer.read()
+
+        # Kept for extracting files, see get_data
+        self._data = data
+
+        cache_path = None
+        if self.cache_dir is not None and isinstance(
+                getattr(buffer, 'name', None), str):
+            cache_path = os.path.join(self.cache_dir, 'ggpk-%s.bin' % (
+                hashlib.sha1(
+                    os.path.abspath(buffer.name).encode('utf-8')
+                ).hexdigest()
+            ))
+            cache_key = self._get_cache_key(buffer, data)
+            try:
+                self.records = self._read_cache(cache_path, cache_key)
+                return
+            except (OSError, ValueError, struct.error):
+                pass
+
+        self.records = self._read_records(data)
+
+        if cache_path is not None:
+            try:
+                self._write_cache(cache_path, cache_key)
+            except OSError as e:
+                warnings.warn(
+                    'Failed to write GGPK cache "%s": %s' % (cache_path, e)
+                )
+
+    def _get_cache_key(self, buffer, data) -> bytes:
+        """
+        Returns the key identifying the current state of the file for the
+        record table cache.
+
+        The key consists of the file size, the modification time, the
+        GGPKRecord and the header of the root DirectoryRecord which includes
+        the hash of the entire directory tree.
+
+        Parameters
+        ----------
+        buffer : io.BufferedReader
+            Opened file
+        data : mmap.mmap or bytes
+            Data of the file
+
+        Returns
+        -------
+            The key
+        """
+        stat = os.fstat(buffer.fileno())
+        key = [struct.pack('<Qq', stat.st_size, stat.st_mtime_ns)]
+        try:
+            length, tag, count = struct.unpack_from('<i4si', data, 0)
+            if tag == b'GGPK':
+                key.append(data[0:length])
+                for offset in struct.unpack_from('<%sq' % count, data, 12):
+                    if data[offset+4:offset+8] == b'PDIR':
+                        key.append(data[offset:offset+48])
+        except struct.error:
+            pass
+        return b''.join(key)
+
+    def _read_cache(self,
+                    path: str,
+                    key: bytes) -> Dict[int, BaseRecord]:
+        """
+        Reads the record table from a cache file written by
+        :meth:`_write_cache`.
+
+        Parameters
+        ----------
+        path
+            Path of the cache file
+        key
+            The current key of the file, see :meth:`_get_cache_key`
+
+        Returns
+        -------
+            mapping of offset -> record instances
+
+        Raises
+        ------
+        OSError
+            if the cache file can not be opened
+        ValueError
+            if the cache file is invalid or stale
+        struct.error
+            if the cache file is truncated
         """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, key_length = struct.unpack_from('<8sII', data, 0)
+        if magic != self.CACHE_MAGIC or version != self.CACHE_VERSION:
+            raise ValueError('Invalid GGPK cache file "%s"' % path)
+        offset = 16
+        if data[offset:offset+key_length] != key:
+            raise ValueError('Stale GGPK cache file "%s"' % path)
+        offset += key_length
+
         records = {}
-        offset = 0
-        size = buffer.seek(0, os.SEEK_END)
+        size = len(data)
+        while offset < size:
+            tag, record_offset, length = struct.unpack_from(
+                '<4sqi', data, offset)
+            offset += 16
+            try:
+                record = self._RECORD_TYPES[tag](self, length, record_offset)
+            except KeyError:
+                raise ValueError('Invalid GGPK cache file "%s"' % path)
+
+            if tag == b'FILE' or tag == b'PDIR':
+                name_length, hash, name_size, count = struct.unpack_from(
+                    '<i32sII', data, offset)
+                offset += 44
+                record._name_length = name_length
+                record.hash = int.from_bytes(hash, 'big')
+                record._name = data[offset:offset+name_size].decode(
+                    'UTF-16_LE')
+                offset += name_size
+                if tag == b'FILE':
+                    record.data_start, record.data_length = \
+                        struct.unpack_from('<qq', data, offset)
+                    offset += 16
+                else:
+                    record.entries = [
+                        DirectoryRecordEntry(
+                            hash=entry_hash, offset=entry_offset)
+                        for entry_hash, entry_offset in struct.iter_unpack(
+                            '<Iq', data[offset:offset+count*12])
+                    ]
+                    if len(record.entries) != count:
+                        raise ValueError(
+                            'Invalid GGPK cache file "%s"' % path)
+                    record.entries_length = count
+                    offset += count*12
+            elif tag == b'FREE':
+                record.next_free = struct.unpack_from('<q', data, offset)[0]
+                offset += 8
+            else:
+                count = struct.unpack_from('<I', data, offset)[0]
+                record.offsets = list(struct.unpack_from(
+                    '<%sq' % count, data, offset + 4))
+                offset += 4 + count*8
+            records[record_offset] = record
+
+        return records
+
+    def _write_cache(self, path: str, key: bytes):
+        """
+        Writes the record table into a cache file.
+
+        Every record is stored as its tag, offset and length followed by the
+        fields of its type, in order of the offsets.
+
+        Parameters
+        ----------
+        path
+            Path of the cache file
+        key
+            The current key of the file, see :meth:`_get_cache_key`
+        """
+        out = [
+            struct.pack(
+                '<8sII', self.CACHE_MAGIC, self.CACHE_VERSION, len(key)),
+            key,
+        ]
+        for offset, record in sorted(self.records.items()):
+            tag = record.tag.encode('ascii')
+            out.append(struct.pack('<4sqi', tag, offset, record.length))
+            if isinstance(record, (FileRecord, DirectoryRecord)):
+                name = record.name.encode('UTF-16_LE')
+                if isinstance(record, FileRecord):
+                    count = 0
+                else:
+                    count = len(record.entries)
+                out.append(struct.pack(
+                    '<i32sII', record._name_length,
+                    record.hash.to_bytes(32, 'big'), len(name), count))
+                out.append(name)
+                if isinstance(record, FileRecord):
+                    out.append(struct.pack(
+                        '<qq', record.data_start, record.data_length))
+                else:
+                    out.extend(
+                        struct.pack('<Iq', entry.hash, entry.offset)
+                        for entry in record.entries
+                    )
+            elif isinstance(record, FreeRecord):
+                out.append(struct.pack('<q', record.next_free))
+            else:
+                out.append(struct.pack(
+                    '<I%sq' % len(record.offsets), len(record.offsets),
+                    *record.offsets))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = '%s.%s.tmp' % (path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            f.write(b''.join(out))
+        os.replace(temp_path, path)
 
-        # Reset Pointer
-        buffer.seek(0, os.SEEK_SET)
+    def _read_records(self, data) -> Dict[int, BaseRecord]:
+        records = {}
+        offset = 0
+        size = len(data)
 
         while offset < size:
             try:
-                self._read_record(
+                offset = self._read_record(
                     records=records,
-                    ggpkfile=buffer,
+                    ggpkfile=data,
                     offset=offset,
                 )
             except InvalidTagException as e:
                 warnings.warn('Invalid tag %s - seeking next valid tag' % e.args)
-                buffer.seek(offset)
+                offset = self._find_record(data, offset)
+                if offset == -1:
+                    break
 
-                not_found = True
-                # Offset by 3 so I can capture things in the middle of chunks
-                offset -= 3
-                while not_found:
-                    chunk = buffer.read(4096)
-                    # TODO: Maybe remove free and GGPK here for speedups
-                    for bytestr in (b'FILE', b'PDIR', b'FREE', b'GGPK'):
-                        index = chunk.find(bytestr)
-                        if index == -1:
-                            continue
-                        else:
-                            # The tag is preceeded by u32 length
-                            offset = buffer.tell() - 4096 + index - 4
-                            buffer.seek(offset)
-                            not_found = False
-                            break
-                    else:
-                        # Offset by 3 again to account for the size of 4
-                        offset += 4093
-                        buffer.seek(offset)
-                        if len(chunk) < 4096:
-                            break
-            else:
-                offset = buffer.tell()
-        self.records = records
+        return records
 
     @doc(prepend=AbstractFileReadOnly.read)
     def read(self, file_path_or_raw, *args, **kwargs):
         super().read(file_path_or_raw, *args, **kwargs)
         self._file_path_or_raw = file_path_or_raw
 
+    def close(self):
+        """
+        Releases the memory map of the file kept for extracting files.
+
+        Files extracted afterwards will open the file again.
+        """
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # Views returned by get_data are still in use; the map is
+                # closed once they are released
+                pass
+        self._data = None
+
+    def get_data(self,
+                 offset: int,
+                 size: int,
+                 copy: bool = True) -> Union[bytes, memoryview]:
+        """
+        Returns a section of the file.
+
+        The file is memory mapped when read, so this is safe to call from
+        multiple threads and doesn't open the file again.
+
+        Parameters
+        ----------
+        offset
+            Offset in the file
+        size
+            Size of the section
+        copy
+            Whether to return a copy of the data. If False a read-only
+            memoryview of the memory mapped file is returned instead.
+
+        Returns
+        -------
+            The data of the section
+        """
+        if self._data is None:
+            def read(buffer):
+                buffer.seek(offset)
+                return buffer.read(size)
+
+            data = self.get_read_buffer(self._file_path_or_raw, read)
+            return data if copy else memoryview(data)
+
+        # The data is either bytes or a memory map opened for reading only,
+        # so the view is read-only
+        view = memoryview(self._data)[offset:offset+size]
+        if copy:
+            return bytes(view)
+        return view
+
+    def extract_many(self,
+                     records: Iterable[FileRecord],
+                     copy: bool = True) -> \
+            Iterator[Tuple[FileRecord, Union[bytes, memoryview]]]:
+        """
+        Extracts the contents of multiple files.
+
+        The records are extracted in the order of their data in the file, so
+        it is read sequentially.
+
+        Parameters
+        ----------
+        records
+            The file records to extract
+        copy
+            Whether to return copies of the data, see :meth:`get_data`
+
+        Yields
+        ------
+        FileRecord
+            The file record
+        bytes or memoryview
+            The contents of the file
+        """
+        for record in sorted(records, key=lambda r: r.data_start):
+            yield record, self.get_data(
+                record.data_start, record.data_length, copy=copy)
+
 
 if __name__ == '__main__':
     import cProfile
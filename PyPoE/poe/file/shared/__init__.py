@@ -50,6 +50,11 @@ Abstract Classes
 
 .. autoclass:: AbstractFileSystemNode
 
+Classes
+-------------------------------------------------------------------------------
+
+.. autoclass:: PathIndex
+
 
 Enums
 -------------------------------------------------------------------------------
@@ -72,9 +77,11 @@ Exceptions & Warnings
 import abc
 import os
 import re
+from bisect import bisect_left
 from enum import IntEnum
+from fnmatch import translate
 from io import BytesIO
-from typing import Union, List, Dict, Callable, Any
+from typing import Union, List, Dict, Callable, Any, Tuple
 
 # self
 from PyPoE.shared.mixins import ReprMixin
@@ -90,6 +97,7 @@ __all__ = [
     'AbstractFile',
     'FILE_SYSTEM_TYPES',
     'AbstractFileSystemNode',
+    'PathIndex',
 ]
 
 # =============================================================================
@@ -316,7 +324,8 @@ class FILE_SYSTEM_TYPES(IntEnum):
 
 
 class AbstractFileSystemNode(ReprMixin):
-    __slots__ = ['parent', 'file_system_type', 'is_file', 'children']
+    __slots__ = ['parent', 'file_system_type', 'is_file', 'children',
+                 '_path_indexes']
 
     def __init__(self,
                 parent: 'FileSystemNode',
@@ -326,6 +335,7 @@ class AbstractFileSystemNode(ReprMixin):
         self.file_system_type: FILE_SYSTEM_TYPES = file_system_type
         self.is_file: bool = is_file
         self.children: Dict[str, 'FileSystemNode'] = {}
+        self._path_indexes: Union[Dict[bool, 'PathIndex'], None] = None
 
     def __getitem__(self, item: str) -> 'AbstractFileSystemNode':
         """
@@ -363,27 +373,91 @@ class AbstractFileSystemNode(ReprMixin):
         if not item:
             return self
 
+        obj = self
+        for partial in self._split_path(item):
+            obj = obj.get_child(partial)
+            if obj is None:
+                raise FileNotFoundError('%s/%s not found' % (
+                    self.get_path(), item
+                ))
+        return obj
+
+    def get_child(self, name: str) -> Union['AbstractFileSystemNode', None]:
+        """
+        Returns the direct child node with the given name.
+
+        Parameters
+        ----------
+        name
+            file or directory name
+
+        Returns
+        -------
+            the child node or None if there is no child with that name
+        """
+        return self.children.get(name)
+
+    def get_index(self, case_sensitive: bool = True) -> 'PathIndex':
+        """
+        Returns the :class:`PathIndex` of this node and all nodes below it.
+
+        The index is created on first access and cached afterwards. If nodes
+        are added or removed afterwards, :meth:`invalidate_index` must be
+        called on their parent.
+
+        Parameters
+        ----------
+        case_sensitive
+            Whether the paths of the index are case sensitive
+
+        Returns
+        -------
+            the path index
+        """
+        if self._path_indexes is not None:
+            try:
+                return self._path_indexes[case_sensitive]
+            except KeyError:
+                pass
+
+        # Lazily built trees create their nodes while being indexed, which
+        # invalidates the index, so it is only stored once complete.
+        index = PathIndex(self, case_sensitive=case_sensitive)
+        if self._path_indexes is None:
+            self._path_indexes = {}
+        self._path_indexes[case_sensitive] = index
+        return index
+
+    def invalidate_index(self):
+        """
+        Removes the cached path indexes of this node and its parents, as
+        their indexes cover the nodes below this node as well.
+        """
+        node = self
+        while node is not None:
+            node._path_indexes = None
+            node = node.parent
+
+    @staticmethod
+    def _split_path(item: str) -> List[str]:
+        """
+        Splits a path into its components.
+
+        Parameters
+        ----------
+        item
+            file path stripped of leading and trailing slashes
+
+        Returns
+        -------
+            list of file or directory names
+        """
         path = []
         partial = item
         while partial:
             partial, result = os.path.split(partial)
             path.insert(0, result)
-
-        obj = self
-        while True:
-            try:
-                partial = path.pop(0)
-            except IndexError:
-                return obj
-
-            for child in obj.children.values():
-                if child.name == partial:
-                    obj = child
-                    break
-            else:
-                raise FileNotFoundError('%s/%s not found' % (
-                    self.get_path(), item
-                ))
+        return path
 
     @property
     def data(self) -> bytes:
@@ -440,6 +514,11 @@ class AbstractFileSystemNode(ReprMixin):
                search_directories: bool = True) -> \
             List['AbstractFileSystemNode']:
         """
+        Returns the nodes below this node whose name matches the given
+        regular expression.
+
+        The search uses the cached :meth:`get_index`. On lazily built trees
+        every directory below this node is loaded.
 
         Parameters
         ----------
@@ -453,30 +532,14 @@ class AbstractFileSystemNode(ReprMixin):
 
         Returns
         -------
-            List of matching :class:`AbstractFileSystemNode` instances
+            List of matching :class:`AbstractFileSystemNode` instances sorted
+            by path
         """
-        if isinstance(regex, str):
-            regex = re.compile(regex)
-
-        nodes = []
-
-        # func = lambda n: nodes.append(n) if re.search(regex, n.name) else None
-        # self.walk(func)
-
-        q = []
-        q.append(self)
-
-        while len(q) > 0:
-            node = q.pop()
-            if ((search_files and node.is_file or
-                 search_directories and node.is_directory)
-                    and re.search(regex, node.name)):
-                nodes.append(node)
-
-            for child in node.children:
-                q.append(child)
-
-        return nodes
+        return self.get_index().search(
+            regex,
+            search_files=search_files,
+            search_directories=search_directories,
+        )
 
     def get_path(self) -> str:
         """
@@ -580,4 +643,180 @@ class AbstractFileSystemNode(ReprMixin):
                 node.extract_to(dir_path)
         else:
             with open(dir_path, 'wb') as f:
-                f.write(bytes(self))
\ No newline at end of file
+                f.write(bytes(self))
+
+
+class PathIndex(ReprMixin):
+    """
+    Index of the full paths of a node and all nodes below it.
+
+    Paths are relative to the indexed node, use forward slashes and don't
+    have leading or trailing slashes; the indexed node itself has the empty
+    path.
+
+    Attributes
+    ----------
+    node : AbstractFileSystemNode
+        The indexed node
+    case_sensitive : bool
+        Whether the paths are case sensitive. If not, all paths are stored
+        and looked up in lower case.
+    nodes : dict[str, AbstractFileSystemNode]
+        Mapping of path -> node
+    paths : list[str]
+        Sorted paths
+    """
+
+    def __init__(self,
+                 node: AbstractFileSystemNode,
+                 case_sensitive: bool = True):
+        """
+        Parameters
+        ----------
+        node
+            The node to index
+        case_sensitive
+            Whether the paths are case sensitive
+        """
+        self.node: AbstractFileSystemNode = node
+        self.case_sensitive: bool = case_sensitive
+        self.nodes: Dict[str, AbstractFileSystemNode] = {}
+
+        stack: List[Tuple[str, AbstractFileSystemNode]] = [('', node)]
+        while stack:
+            path, parent = stack.pop()
+            self.nodes[path] = parent
+            for child in parent.children.values():
+                name = child.name if case_sensitive else child.name.lower()
+                stack.append((path + '/' + name if path else name, child))
+
+        self.paths: List[str] = sorted(self.nodes)
+
+    def __contains__(self, item: str) -> bool:
+        return self._normalize(item) in self.nodes
+
+    def __getitem__(self, item: str) -> AbstractFileSystemNode:
+        """
+        Returns the node for the given path.
+
+        Parameters
+        ----------
+        item
+            file or directory path
+
+        Returns
+        -------
+            the node of the path
+
+        Raises
+        ------
+        FileNotFoundError
+            if the path is not found
+        """
+        try:
+            return self.nodes[self._normalize(item)]
+        except KeyError:
+            raise FileNotFoundError('%s not found' % item)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _normalize(self, path: str) -> str:
+        path = path.replace('\\', '/').strip('/')
+        if not self.case_sensitive:
+            path = path.lower()
+        return path
+
+    def _range(self, prefix: str) -> List[str]:
+        start = bisect_left(self.paths, prefix)
+        end = start
+        while end < len(self.paths) and self.paths[end].startswith(prefix):
+            end += 1
+        return self.paths[start:end]
+
+    def prefix(self, prefix: str) -> List[AbstractFileSystemNode]:
+        """
+        Returns the nodes of all paths starting with the given prefix.
+
+        Parameters
+        ----------
+        prefix
+            path prefix, for example ``Art/2DArt/`` for every node in that
+            directory or ``Data/Mods`` for every node starting with "Mods"
+
+        Returns
+        -------
+            list of nodes sorted by path
+        """
+        prefix = prefix.replace('\\', '/').lstrip('/')
+        if not self.case_sensitive:
+            prefix = prefix.lower()
+        return [self.nodes[path] for path in self._range(prefix)]
+
+    def glob(self, pattern: str) -> List[AbstractFileSystemNode]:
+        """
+        Returns the nodes of all paths matching the given glob pattern.
+
+        The pattern follows :mod:`fnmatch` rules, so wildcards also match
+        slashes.
+
+        Parameters
+        ----------
+        pattern
+            glob pattern, for example ``Data/*.dat``
+
+        Returns
+        -------
+            list of nodes sorted by path
+        """
+        pattern = self._normalize(pattern)
+        regex = re.compile(translate(pattern))
+        # Only the paths starting with the literal part of the pattern can
+        # match
+        prefix = re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+        return [
+            self.nodes[path] for path in self._range(prefix)
+            if regex.match(path)
+        ]
+
+    def search(self,
+               regex: Union[re.Pattern, str],
+               search_files: bool = True,
+               search_directories: bool = True) -> \
+            List[AbstractFileSystemNode]:
+        """
+        Returns the nodes whose name matches the given regular expression.
+
+        Parameters
+        ----------
+        regex
+            regular expression to search the names with
+        search_files
+            Whether file instances should be searched
+        search_directories
+            Whether directory instances should be searched
+
+        Returns
+        -------
+            list of nodes sorted by path
+        """
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        search = regex.search
+
+        # Many names occur multiple times, so every name is only searched once
+        matches: Dict[str, bool] = {}
+        nodes = []
+        for path in self.paths:
+            node = self.nodes[path]
+            if not (search_files and node.is_file or
+                    search_directories and node.is_directory):
+                continue
+            name = node.name
+            try:
+                match = matches[name]
+            except KeyError:
+                match = matches[name] = search(name) is not None
+            if match:
+                nodes.append(node)
+        return nodes
@@ -113,7 +113,9 @@ class SpecificationError(ValueError):
         RUNTIME_ROWSIZE_MISMATCH = 3002
 
     def __init__(self, code, msg):
-        super().__init__()
+        # Pass the arguments on, so the error can be pickled (for example
+        # when raised in a worker process)
+        super().__init__(code, msg)
         self.code = self.ERRORS(code)
         self.msg = msg
 
@@ -130,8 +130,7 @@ class GGPKThread(QThread):
         @wraps(func)
         def temp(*args, **kwargs):
             if not self._size:
-                self._size = kwargs['ggpkfile'].seek(0, os.SEEK_END)
-                kwargs['ggpkfile'].seek(0, os.SEEK_SET)
+                self._size = len(kwargs['ggpkfile'])
             else:
                 #kwargs['offset'])
 
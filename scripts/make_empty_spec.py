@@ -119,8 +119,9 @@ def run():
 
     for fn in new:
         fr = index.get_file_record('Data/' + fn)
-        fr.bundle.read(ggpk[fr.bundle.ggpk_path].record.extract())
-        binary = fr.get_file()
+        bundle = Bundle()
+        bundle.read(ggpk[fr.bundle.ggpk_path].record.extract())
+        binary = fr.get_file(bundle)
         data_offset = binary.find(dat.DAT_FILE_MAGIC_NUMBER)
         n_rows = struct.unpack('<I', binary[0:4])[0]
         length = data_offset - 4
@@ -17,6 +17,7 @@ extras_require = {
     'cli': ['colorama', 'graphviz', 'tqdm', 'mwclient', 'mwparserfromhell', 'rapidfuzz'],
     'ui': ['pyside2==5.14.0'],
     'ui-extra': ['PyOpenGL'],
+    'numpy': ['numpy'],
 }
 
 _full = {'full': set(), 'cli-full': set(), 'ui-full': set()}
@@ -91,7 +92,7 @@ setup(
     # your project is installed. For an analysis of "install_requires" vs pip's
     # requirements files see:
     # https://packaging.python.org/en/latest/requirements.html
-    install_requires=['configobj', 'brotli', 'fnvhash', 'cffi'],
+    install_requires=['configobj', 'brotli', 'cffi'],
 
     # List additional groups of dependencies here (e.g. development
     # dependencies). You can install these using the following syntax,
@@ -0,0 +1,649 @@
+"""
+Tests for PyPoE.poe.file.bundle
+
+Overview
+===============================================================================
+
++----------+------------------------------------------------------------------+
+| Path     | tests/PyPoE/poe/file/test_bundle.py                              |
++----------+------------------------------------------------------------------+
+| Version  | 1.0.0a0                                                          |
++----------+------------------------------------------------------------------+
+| Revision | $Id$                                                             |
++----------+------------------------------------------------------------------+
+| Author   | Omega_K2                                                         |
++----------+------------------------------------------------------------------+
+
+Description
+===============================================================================
+
+Tests for bundle.py
+
+The ooz library is generally not available, so the bundles created here store
+their chunks as-is and the decompression step is replaced with a passthrough.
+
+Agreement
+===============================================================================
+
+See PyPoE/LICENSE
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+
+# Python
+import os
+import random
+import struct
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd Party
+import pytest
+
+# self
+from PyPoE.poe.file import bundle
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# =============================================================================
+# Setup
+# =============================================================================
+
+CHUNK_SIZE = 16
+
+
+class PassthroughBundle(bundle.Bundle):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decompress_calls = []
+
+    def _decompress_chunks(self, chunks, workers=1):
+        self.decompress_calls.append(list(chunks))
+        return ((i, bytes(self.data[i])) for i in chunks)
+
+
+def passthrough_decompress(self, chunks, workers=1):
+    return ((i, bytes(self.data[i])) for i in chunks)
+
+
+def make_bundle(data, chunk_size=CHUNK_SIZE):
+    chunks = [
+        data[i:i+chunk_size] for i in range(0, len(data), chunk_size)
+    ]
+    out = [
+        struct.pack('<III', len(data), len(data), 48 + 4*len(chunks)),
+        struct.pack(
+            '<IIQQIIIIII', bundle.ENCODE_TYPES.KRAKEN, 1, len(data),
+            len(data), len(chunks), chunk_size, 0, 0, 0, 0
+        ),
+        struct.pack('<%sI' % len(chunks), *[len(c) for c in chunks]),
+    ]
+    out.extend(chunks)
+    return b''.join(out)
+
+def make_paths(directory, files):
+    # Base section with the directory as first string, then one path per file
+    out = [struct.pack('<I', 0), struct.pack('<I', 1), directory + b'\x00',
+           struct.pack('<I', 0)]
+    for file_name in files:
+        out.append(struct.pack('<I', 1))
+        out.append(file_name + b'\x00')
+    return b''.join(out)
+
+
+def make_index(directories):
+    """
+    directories is a list of (directory, [(file name, bundle id, offset,
+    size), ...]); there are two bundles named bundle0 and bundle1.
+    """
+    out = [struct.pack('<I', 2)]
+    for i in range(0, 2):
+        name = ('bundle%s' % i).encode()
+        out.append(struct.pack('<I', len(name)) + name + struct.pack('<I', 0))
+
+    files = []
+    path_data = []
+    dir_records = []
+    for directory, dir_files in directories:
+        paths = make_paths(directory, [f[0] for f in dir_files])
+        dir_records.append(struct.pack(
+            '<QIII', bundle.Index().get_hash(directory + b'/'),
+            len(b''.join(path_data)), len(paths), 0
+        ))
+        path_data.append(paths)
+        for file_name, bundle_id, offset, size in dir_files:
+            files.append(struct.pack(
+                '<QIII',
+                bundle.Index().get_hash(directory + file_name),
+                bundle_id, offset, size
+            ))
+
+    out.append(struct.pack('<I', len(files)))
+    out.extend(reversed(files))
+    out.append(struct.pack('<I', len(dir_records)))
+    out.extend(dir_records)
+    out.append(make_bundle(b''.join(path_data)))
+    return make_bundle(b''.join(out))
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def raw_data():
+    return bytes(range(0, 256)) * 2 + b'tail'
+
+
+@pytest.fixture
+def bundle_file(raw_data):
+    b = PassthroughBundle()
+    b.read(make_bundle(raw_data))
+    return b
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestBundle:
+    def test_read(self, bundle_file, raw_data):
+        assert bundle_file.size_decompressed == len(raw_data)
+        assert bundle_file.entry_count == -(-len(raw_data) // CHUNK_SIZE)
+        assert not bundle_file.is_decompressed
+
+    def test_chunk_size(self, bundle_file, raw_data):
+        assert bundle_file.get_chunk_size(0) == CHUNK_SIZE
+        assert bundle_file.get_chunk_size(bundle_file.entry_count - 1) == \
+            len(raw_data) % CHUNK_SIZE
+
+    @pytest.mark.parametrize('offset,size,result', (
+        (0, 1, (0, 1)),
+        (0, CHUNK_SIZE, (0, 1)),
+        (CHUNK_SIZE - 1, 2, (0, 2)),
+        (CHUNK_SIZE * 3, CHUNK_SIZE * 2, (3, 5)),
+        (CHUNK_SIZE * 3 + 1, CHUNK_SIZE * 2, (3, 6)),
+    ))
+    def test_chunk_range(self, bundle_file, offset, size, result):
+        assert bundle_file.get_chunk_range(offset, size) == result
+
+    def test_chunk_range_invalid(self, bundle_file, raw_data):
+        with pytest.raises(ValueError):
+            bundle_file.get_chunk_range(len(raw_data), 1)
+
+    def test_get_data(self, bundle_file, raw_data):
+        offset = CHUNK_SIZE * 2 + 3
+        assert bundle_file.get_data(offset, 20) == raw_data[offset:offset+20]
+        assert bundle_file.decompress_calls == [[2, 3]]
+        # Already decompressed chunks are reused
+        assert bundle_file.get_data(offset, 2) == raw_data[offset:offset+2]
+        assert bundle_file.decompress_calls == [[2, 3]]
+        assert not bundle_file.is_decompressed
+
+    def test_decompress(self, bundle_file, raw_data):
+        bundle_file.get_data(0, 1)
+        bundle_file.decompress()
+        assert bundle_file.is_decompressed
+        assert bundle_file.data == raw_data
+        assert bundle_file.get_data(3, 5) == raw_data[3:8]
+        assert 0 not in bundle_file.decompress_calls[1]
+
+    def test_read_references_buffer(self, bundle_file, raw_data, tmpdir):
+        assert isinstance(bundle_file.data[0], memoryview)
+
+        path = str(tmpdir.join('test.bundle.bin'))
+        with open(path, 'wb') as f:
+            f.write(make_bundle(raw_data))
+        b = PassthroughBundle()
+        b.read(path)
+        assert isinstance(b.data[0], memoryview)
+        assert b.get_data(1, 300) == raw_data[1:301]
+        b.decompress()
+        assert b.data == raw_data
+        assert b._raw is None
+
+    def test_memory_size(self, bundle_file, raw_data):
+        compressed = bundle_file.memory_size
+        assert compressed == bundle_file.size_compressed
+        bundle_file.get_data(0, 1)
+        assert bundle_file.memory_size == compressed + CHUNK_SIZE
+        bundle_file.get_data(len(raw_data) - 1, 1)
+        assert bundle_file.memory_size == compressed + CHUNK_SIZE + \
+            len(raw_data) % CHUNK_SIZE
+
+    def test_memory_size_mapped(self, raw_data, tmpdir):
+        path = str(tmpdir.join('test.bundle.bin'))
+        with open(path, 'wb') as f:
+            f.write(make_bundle(raw_data))
+        b = PassthroughBundle()
+        b.read(path)
+        # Memory mapped compressed data is not resident memory
+        assert b.memory_size == 0
+        b.get_data(0, 1)
+        assert b.memory_size == CHUNK_SIZE
+
+    def test_get_data_no_copy(self, bundle_file, raw_data):
+        offset = CHUNK_SIZE + 3
+        data = bundle_file.get_data(offset, 20, copy=False)
+        assert isinstance(data, memoryview)
+        assert data.readonly
+        assert data == raw_data[offset:offset+20]
+
+        bundle_file.decompress()
+        data = bundle_file.get_data(offset, 20, copy=False)
+        assert isinstance(data, memoryview)
+        assert data.obj is bundle_file.data
+        assert data == raw_data[offset:offset+20]
+
+
+    def test_decompress_threaded(self, raw_data):
+        class ThreadedBundle(bundle.Bundle):
+            def _decompress_chunk(self, chunk):
+                return bytes(self.data[chunk])
+
+        b = ThreadedBundle(workers=4)
+        b.read(make_bundle(raw_data))
+        chunks = list(range(0, b.entry_count))
+        result = list(b._decompress_chunks_threaded(chunks, 4))
+        assert [i for i, data in result] == chunks
+        assert b''.join(data for i, data in result) == raw_data
+
+
+    @pytest.mark.parametrize('chunk_size', (CHUNK_SIZE, 100, 4096))
+    @pytest.mark.parametrize('workers', (1, 4))
+    def test_decompress_into(self, monkeypatch, raw_data, chunk_size,
+                             workers):
+        if getattr(bundle, 'ffi', None) is None:
+            pytest.skip('cffi is not installed')
+
+        class OverrunBundle(bundle.Bundle):
+            # Like the ooz library, writes garbage past the end of the chunk
+            def _decompress_chunk_into(self, chunk, dst):
+                data = bytes(self.data[chunk]) + b'\xff' * 64
+                time.sleep(random.random() / 1000)
+                bundle.ffi.memmove(dst, data, len(data))
+
+        monkeypatch.setattr(bundle, 'ooz', True)
+        b = OverrunBundle(workers=workers)
+        b.read(make_bundle(raw_data, chunk_size=chunk_size))
+        b.decompress()
+        assert b.data == raw_data
+
+class TestBundleCommandline:
+    @pytest.fixture
+    def ooz(self, tmpdir, monkeypatch):
+        # Fake ooz commandline tool that copies the data after the size header
+        # and logs every call
+        log = tmpdir.join('log')
+        script = tmpdir.join('ooz')
+        script.write('\n'.join((
+            '#!' + sys.executable,
+            'import sys',
+            'with open(sys.argv[2], "rb") as f:',
+            '    data = f.read()[8:]',
+            'with open(sys.argv[3], "wb") as f:',
+            '    f.write(data)',
+            'with open(%r, "a") as f:' % str(log),
+            '    f.write(str(len(data)) + "\\n")',
+        )))
+        script.chmod(0o755)
+        monkeypatch.setattr(bundle, 'ooz', None)
+        monkeypatch.setattr(bundle, 'OOZ_COMMAND', str(script))
+        return log
+
+    def test_per_chunk(self, ooz, raw_data):
+        b = bundle.Bundle()
+        b.read(make_bundle(raw_data))
+        b.decompress()
+        assert b.data == raw_data
+        # One call per chunk since the chunks are not oodle block sized
+        assert len(ooz.readlines()) == b.entry_count
+
+    def test_batched_block_size(self, ooz):
+        raw_data = bytes(range(0, 256)) * 2048 + b'tail'
+        b = bundle.Bundle()
+        b.read(make_bundle(raw_data, chunk_size=bundle.OODLE_BLOCK_SIZE))
+        assert b.get_data(5, 10) == raw_data[5:15]
+        b.decompress()
+        assert b.data == raw_data
+        # The first chunk, then the remaining chunks with one call
+        assert ooz.readlines() == [
+            '%s\n' % bundle.OODLE_BLOCK_SIZE,
+            '%s\n' % (len(raw_data) - bundle.OODLE_BLOCK_SIZE),
+        ]
+
+    def test_missing(self, monkeypatch, tmpdir, bundle_file):
+        monkeypatch.setattr(bundle, 'ooz', None)
+        monkeypatch.setattr(
+            bundle, 'OOZ_COMMAND', str(tmpdir.join('missing')))
+        with pytest.raises(OSError):
+            bundle.Bundle._decompress_chunks_cli(bundle_file, [0])
+
+
+class TestBundleCache:
+    def make_cache(self, raw_data, count, max_size):
+        cache = bundle.BundleCache(max_size=max_size)
+        for i in range(0, count):
+            b = PassthroughBundle()
+            b.read(make_bundle(raw_data))
+            cache.add('bundle%s' % i, b)
+        return cache
+
+    def test_hits_misses(self, raw_data):
+        cache = self.make_cache(raw_data, 1, None)
+        assert cache.get('bundle0') is not None
+        assert cache.get('missing') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.reset_stats()
+        assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+    def test_eviction(self, raw_data):
+        cache = self.make_cache(raw_data, 3, len(raw_data) * 2)
+        assert cache.evictions == 1
+        assert 'bundle0' not in cache
+        assert cache.size <= cache.max_size
+
+    def test_lru_order(self, raw_data):
+        cache = self.make_cache(raw_data, 2, len(raw_data) * 2)
+        cache.get('bundle0')
+        b = PassthroughBundle()
+        b.read(make_bundle(raw_data))
+        cache.add('bundle2', b)
+        assert 'bundle0' in cache
+        assert 'bundle1' not in cache
+
+    def test_trim_after_decompression(self, raw_data):
+        cache = self.make_cache(raw_data, 2, len(raw_data) * 3)
+        assert cache.evictions == 0
+        cache.get('bundle0').decompress()
+        cache.get('bundle1').decompress()
+        # Once fully decompressed only the joined data is held
+        cache.trim()
+        assert len(cache) == 2
+        assert cache.size == len(raw_data) * 2
+
+    def test_size_tracks_used(self, raw_data):
+        cache = self.make_cache(raw_data, 2, None)
+        size = cache.size
+        cache.get('bundle0').get_data(0, 1)
+        assert cache.size == size + CHUNK_SIZE
+        cache.clear()
+        assert cache.size == 0
+
+    def test_keeps_most_recent(self, raw_data):
+        cache = self.make_cache(raw_data, 2, 1)
+        assert len(cache) == 1
+        assert 'bundle1' in cache
+
+
+class TestBundleDiskCache:
+    @pytest.fixture
+    def cache(self, tmpdir):
+        return bundle.BundleDiskCache(str(tmpdir.join('cache')))
+
+    def read(self, data):
+        b = PassthroughBundle()
+        b.read(make_bundle(data))
+        return b
+
+    def test_store_load(self, cache, raw_data):
+        b = self.read(raw_data)
+        assert not cache.load('Folder/bundle', b)
+        cache.store('Folder/bundle', b)
+        assert b.is_decompressed
+
+        b = self.read(raw_data)
+        assert cache.load('Folder/bundle', b)
+        assert b.is_decompressed
+        assert b.data[:] == raw_data
+        assert b.get_data(3, 5) == raw_data[3:8]
+        assert b.decompress_calls == []
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_changed_bundle(self, cache, raw_data):
+        cache.store('bundle', self.read(raw_data))
+        changed = raw_data[:-1] + b'x'
+        b = self.read(changed)
+        assert not cache.load('bundle', b)
+        assert b.get_data(0, len(changed)) == changed
+
+    def test_prune(self, cache, raw_data):
+        cache.max_size = len(raw_data) * 2
+        for i in range(3):
+            b = self.read(raw_data)
+            path = cache.get_path('bundle%s' % i, b)
+            cache.store('bundle%s' % i, b)
+            os.utime(path, (i, i))
+        cache.store('bundle3', self.read(raw_data))
+        assert sorted(os.listdir(cache.path)) == sorted(
+            os.path.basename(cache.get_path(name, self.read(raw_data)))
+            for name in ('bundle2', 'bundle3')
+        )
+
+        cache.clear()
+        assert os.listdir(cache.path) == []
+
+
+class TestIndexRecordTable:
+    class Parent:
+        bundles = {0: 'bundle0', 1: 'bundle1'}
+
+    def make_table(self, hashes):
+        raw = b'junk' + b''.join(
+            struct.pack('<QIII', h, i % 2, i * 100, i + 1)
+            for i, h in enumerate(hashes)
+        )
+        return bundle.IndexRecordTable(
+            bundle.FileRecord, raw, self.Parent(), 4, len(hashes))
+
+    @pytest.mark.parametrize('hashes', (
+        [1, 5, 2**64 - 1],
+        [2**64 - 1, 7, 3, 2**40],
+        [],
+    ))
+    def test_lookup(self, hashes):
+        table = self.make_table(hashes)
+        assert len(table) == len(hashes)
+        assert list(table) == sorted(hashes)
+        for i, h in enumerate(hashes):
+            assert h in table
+            record = table[h]
+            assert record.hash == h
+            assert record.bundle == self.Parent.bundles[i % 2]
+            assert record.file_offset == i * 100
+            assert record.file_size == i + 1
+
+    def test_same_record(self):
+        table = self.make_table([1, 5])
+        record = table[5]
+        assert table[5] is record
+        assert table[1] is not record
+
+    def test_missing(self):
+        table = self.make_table([1, 5])
+        assert 3 not in table
+        assert 6 not in table
+        with pytest.raises(KeyError):
+            table[3]
+        with pytest.raises(KeyError):
+            table[6]
+
+
+class TestIndex:
+    directories = [
+        (b'Art/', [(b'a.dds', 0, 0, 10), (b'b.dds', 1, 5, 20)]),
+        (b'Data/', [(b'Mods.dat', 1, 100, 7)]),
+    ]
+
+    def check_index(self, index):
+        assert [b.name for b in index.bundles.values()] == \
+            ['bundle0', 'bundle1']
+        record = index.get_file_record('Art/b.dds')
+        assert record.bundle.name == 'bundle1'
+        assert (record.file_offset, record.file_size) == (5, 20)
+        assert index.get_file_record('Data/Mods.dat').file_offset == 100
+        with pytest.raises(FileNotFoundError):
+            index.get_file_record('Art/c.dds')
+
+        directory = index.get_dir_record('Art/')
+        assert directory.paths == ['Art/a.dds', 'Art/b.dds']
+        assert index.get_dir_record('Art/') is directory
+        assert directory.path == 'Art'
+        assert directory.files == ['a.dds', 'b.dds']
+
+    def test_read(self, monkeypatch):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        index = bundle.Index()
+        index.read(make_index(self.directories))
+        self.check_index(index)
+
+    def test_directory_path(self, monkeypatch):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        index = bundle.Index()
+        index.read(make_index(self.directories))
+
+        def fail(*args, **kwargs):
+            raise AssertionError('All paths of the directory were unpacked')
+
+        monkeypatch.setattr(bundle.Index, '_make_paths', fail)
+        assert index.get_directory_path(index.get_dir_record('Art/')) == 'Art'
+        assert index.get_directory_path(index.get_dir_record('Data/')) == \
+            'Data'
+
+    def test_cache(self, monkeypatch, tmpdir):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        raw = make_index(self.directories)
+        index = bundle.Index(cache_dir=str(tmpdir))
+        index.read(raw)
+        self.check_index(index)
+        assert len(tmpdir.listdir()) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Index was parsed despite the cache')
+
+        monkeypatch.setattr(bundle.Index, '_parse', fail)
+        index = bundle.Index(cache_dir=str(tmpdir))
+        index.read(raw)
+        self.check_index(index)
+
+    def test_cache_invalid(self, monkeypatch, tmpdir):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        raw = make_index(self.directories)
+        bundle.Index(cache_dir=str(tmpdir)).read(raw)
+        tmpdir.listdir()[0].write_binary(b'garbage')
+
+        index = bundle.Index(cache_dir=str(tmpdir))
+        index.read(raw)
+        self.check_index(index)
+
+
+    @pytest.mark.parametrize('fraction', (0.05, 0.2, 0.5, 0.8, 0.99))
+    def test_cache_truncated(self, monkeypatch, tmpdir, fraction):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        raw = make_index(self.directories)
+        bundle.Index(cache_dir=str(tmpdir)).read(raw)
+        cache_file = tmpdir.listdir()[0]
+        data = cache_file.read_binary()
+        cache_file.write_binary(data[:int(len(data) * fraction)])
+
+        index = bundle.Index(cache_dir=str(tmpdir))
+        index.read(raw)
+        self.check_index(index)
+        # The cache is written again
+        assert cache_file.read_binary() == data
+
+    def test_cache_inconsistent(self, monkeypatch, tmpdir):
+        monkeypatch.setattr(
+            bundle.Bundle, '_decompress_chunks', passthrough_decompress)
+        raw = make_index(self.directories)
+        bundle.Index(cache_dir=str(tmpdir)).read(raw)
+        cache_file = tmpdir.listdir()[0]
+        data = bytearray(cache_file.read_binary())
+        # Shorten the file hash section by one byte
+        spans_offset = 20 + 2*8
+        length = struct.unpack_from('<Q', data, spans_offset + 8)[0]
+        struct.pack_into('<Q', data, spans_offset + 8, length - 1)
+        cache_file.write_binary(bytes(data))
+
+        index = bundle.Index(cache_dir=str(tmpdir))
+        index.read(raw)
+        self.check_index(index)
+
+
+class TestHash:
+    # Reference values from the fnvhash package
+    values = (
+        (b'', 0xcbf29ce484222325),
+        (b'a', 0xaf63dc4c8601ec8c),
+        (b'foobar', 0x85944171f73967e8),
+    )
+
+    @pytest.mark.parametrize('data,result', values)
+    def test_fnv1a_64(self, data, result):
+        assert bundle.fnv1a_64(data) == result
+
+    def test_fnv1a_64_many(self):
+        data = [v[0] for v in self.values]
+        assert bundle.fnv1a_64_many(data) == [v[1] for v in self.values]
+
+    @pytest.mark.skipif(numpy is None, reason='numpy is not installed')
+    def test_fnv1a_64_many_numpy(self):
+        data = [
+            ('Data/File%s.dat' % ('x' * (i % 37))).encode() for i in range(200)
+        ] + [b'', b'y' * 1000]
+        assert bundle.fnv1a_64_many(data) == \
+            [bundle.fnv1a_64(value) for value in data]
+
+    def test_get_hash(self, monkeypatch):
+        monkeypatch.setattr(bundle.Index, '_hash_cache', OrderedDict())
+        index = bundle.Index()
+        assert index.get_hash('Data/Mods.dat') == \
+            bundle.fnv1a_64(b'data/mods.dat++')
+        assert index.get_hash(b'Data/') == bundle.fnv1a_64(b'Data++')
+        assert ('Data/Mods.dat', None) in bundle.Index._hash_cache
+        with pytest.raises(TypeError):
+            index.get_hash(1)
+
+    def test_get_hashes(self, monkeypatch):
+        monkeypatch.setattr(bundle.Index, '_hash_cache', OrderedDict())
+        index = bundle.Index()
+        paths = ['Data/A.dat', 'Data/B.dat', 'Data/A.dat', 'Data/']
+        hashes = index.get_hashes(paths)
+        assert hashes == [index.get_hash(path) for path in paths]
+        assert len(bundle.Index._hash_cache) == 3
+
+    def test_hash_cache_size(self, monkeypatch):
+        monkeypatch.setattr(bundle.Index, '_hash_cache', OrderedDict())
+        monkeypatch.setattr(bundle.Index, 'HASH_CACHE_SIZE', 2)
+        index = bundle.Index()
+        index.get_hashes(['a', 'b'])
+        index.get_hash('a')
+        index.get_hash('c')
+        assert list(bundle.Index._hash_cache) == [('a', None), ('c', None)]
+
+    def test_hash_cache_threads(self, monkeypatch):
+        monkeypatch.setattr(bundle.Index, '_hash_cache', OrderedDict())
+        monkeypatch.setattr(bundle.Index, 'HASH_CACHE_SIZE', 8)
+        index = bundle.Index()
+        paths = ['Data/%s.dat' % i for i in range(32)]
+        expected = [bundle.fnv1a_64(index._get_hash_data(p)) for p in paths]
+
+        def work(i):
+            assert index.get_hashes(paths[i % 4:]) == expected[i % 4:]
+            return [index.get_hash(path) for path in paths] == expected
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(work, range(200)))
+        assert len(bundle.Index._hash_cache) <= 8
@@ -38,6 +38,7 @@ TODO
 
 # Python
 import os
+import pickle
 import struct
 
 # 3rd Party
@@ -363,6 +364,334 @@ def test_dat_file(testspec_dat_file):
         assert row['ref|ref|ref|int'] == 0x1337, 'Value mismatch - nested pointers'
 
 
+#
+# Row decoders
+#
+
+class TestRowDecoder:
+    def test_matches_interpreter(self, testspec_dat_file):
+        dr = dat.DatFile('TestSpec.dat').read(
+            testspec_dat_file, specification=test_load(), use_dat_value=False)
+        assert dr._row_decoder is not None
+        rows = dr.table_data
+        dr._row_decoder = None
+        assert [dr._process_row(i) for i in range(dr.table_rows)] == rows
+
+    def test_cache(self):
+        spec = test_load()
+        a = dat.DatReader('TestSpec.dat', specification=spec,
+                          use_dat_value=False)._get_row_decoder()
+        b = dat.DatReader('TestSpec.dat', specification=spec,
+                          use_dat_value=False)._get_row_decoder()
+        assert a is b
+        c = dat.DatReader('TestSpec.dat64', specification=spec,
+                          use_dat_value=False, x64=True)._get_row_decoder()
+        assert c is not a
+        d = dat.DatReader('TestSpec.dat', specification=test_load(),
+                          use_dat_value=False)._get_row_decoder()
+        assert d is not a
+
+    @pytest.mark.parametrize('options', (
+        {'use_dat_value': True},
+        {'use_dat_value': False, 'columnar': True},
+    ))
+    def test_not_compiled(self, testspec_dat_file, monkeypatch, options):
+        if options.get('columnar') and dat.np is None:
+            pytest.skip('numpy is not installed')
+        dr = dat.DatReader('TestSpec.dat', specification=test_load(),
+                           **options)
+        monkeypatch.setattr(dr, '_compile_row_decoder', None)
+        dr.read(testspec_dat_file)
+        assert dr._row_decoder is None
+
+    @pytest.mark.parametrize('x64', (False, True))
+    def test_compile_default_spec(self, x64):
+        for file_name in dat._default_spec:
+            if x64:
+                file_name = file_name.replace('.dat', '.dat64')
+            dr = dat.DatReader(file_name, use_dat_value=False, x64=x64)
+            assert callable(dr._get_row_decoder())
+
+
+#
+# Strings
+#
+
+class TestStrings:
+    # Strings ending with \x00 followed by strings starting with \x00
+    strings = ['', 'a', '\u0100', 'Hello world', '\u0100\u0100', 'b']
+
+    @pytest.fixture
+    def string_file(self):
+        data = b''.join(
+            string.encode('utf-16le') + b'\x00\x00\x00\x00'
+            for string in self.strings
+        )
+        return struct.pack('<I', 0) + dat.DAT_FILE_MAGIC_NUMBER + data
+
+    def read(self, raw, **kwargs):
+        dr = dat.DatReader('TestSpec.dat', specification=test_load(), **kwargs)
+        # The file has no rows, only the data section is used
+        dr.cast_size = 0
+        dr.read(raw)
+        return dr
+
+    def legacy_read_string(self, raw, offset):
+        offset_new = raw.find(b'\x00\x00\x00\x00', offset)
+        if offset == offset_new:
+            return '', offset_new
+        while (offset_new-offset) % 2:
+            offset_new = raw.find(b'\x00\x00\x00\x00', offset_new+1)
+        return raw[offset:offset_new].decode('utf-16'), offset_new
+
+    def test_terminators(self, string_file):
+        if dat.np is None:
+            pytest.skip('numpy is not installed')
+        dr = self.read(string_file)
+        offsets = dat.np.arange(dr.data_offset + 8, len(string_file) - 4)
+        terminators = dr._find_string_terminators(offsets)
+        for offset in offsets.tolist():
+            assert terminators[offset] == \
+                self.legacy_read_string(string_file, offset)[1]
+
+    @pytest.mark.parametrize('use_numpy', (True, False))
+    def test_read_strings(self, string_file, monkeypatch, use_numpy):
+        if use_numpy:
+            if dat.np is None:
+                pytest.skip('numpy is not installed')
+        else:
+            monkeypatch.setattr(dat, 'np', None)
+        dr = self.read(string_file)
+        for offset in range(dr.data_offset + 8, len(string_file) - 4):
+            assert dr._read_string(offset) == \
+                self.legacy_read_string(string_file, offset)
+
+    def test_table_terminators(self, testspec_dat_file):
+        if dat.np is None:
+            pytest.skip('numpy is not installed')
+        df = dat.DatFile('TestSpec.dat')
+        dr = df.read(testspec_dat_file, specification=test_load(),
+                     use_dat_value=False)
+        # Only the string of the ref|string column is looked up
+        assert dr._string_terminators == {
+            dr.data_offset + 8: dr.data_offset + 8 + len(test_str_enc) - 4,
+        }
+
+    def test_strings(self, string_file):
+        dr = self.read(string_file)
+        offset = dr.data_offset + 8
+        for string in self.strings:
+            assert dr._read_string(offset)[0] == string
+            offset += len(string.encode('utf-16le')) + 4
+
+    def test_cache(self, string_file):
+        dr = self.read(string_file, lazy=True)
+        offset = dr.data_offset + 10
+        value = dr._read_string(offset)
+        assert value == self.legacy_read_string(string_file, offset)
+        assert dr._read_string(offset) is value
+        assert dr._string_terminators is None
+
+        # Reading again clears the cache
+        dr.read(string_file)
+        assert dr._read_string(offset) is not value
+
+
+#
+# Lazy mode
+#
+
+class TestLazy:
+    def test_rows(self, rr_temp_dir):
+        kwargs = {
+            'specification': load(os.path.join(spec_dir, 'rr_test.py')),
+            'use_dat_value': False,
+        }
+        path = os.path.join(rr_temp_dir, 'Data', 'Main.dat')
+        eager = dat.DatFile('Main.dat').read(path, **kwargs)
+        dr = dat.DatFile('Main.dat').read(path, lazy=True, **kwargs)
+
+        assert isinstance(dr.table_data, dat.DatRecordList)
+        assert dr.table_data.decoded_rows == 0
+        assert len(dr.table_data) == 3
+
+        row = dr[1]
+        assert row == eager[1]
+        assert row.rowid == 1
+        assert dr.table_data.decoded_rows == 1
+        assert dr[1] is row
+        assert dr[-1] == eager[2]
+        assert dr[0:2] == eager.table_data[0:2]
+        assert list(dr) == eager.table_data
+        with pytest.raises(IndexError):
+            dr[3]
+
+    def test_cache_size(self, rr_temp_dir):
+        dr = dat.DatFile('Main.dat').read(
+            os.path.join(rr_temp_dir, 'Data', 'Main.dat'),
+            specification=load(os.path.join(spec_dir, 'rr_test.py')),
+            lazy=True,
+        )
+        dr.table_data.cache_size = 1
+        dr[0]
+        dr[1]
+        # Only the most recent row is kept
+        assert dr.table_data.decoded_rows == 1
+
+        row = dr[0]
+        dr[2]
+        assert dr.table_data.decoded_rows == 2
+        assert dr[0] is row
+
+    def test_build_index(self, rr_temp_dir):
+        dr = dat.DatFile('Main.dat').read(
+            os.path.join(rr_temp_dir, 'Data', 'Main.dat'),
+            specification=load(os.path.join(spec_dir, 'rr_test.py')),
+            use_dat_value=False,
+            lazy=True,
+        )
+        dr.build_index('ForeignKeyCellValue')
+        assert dr.index['ForeignKeyCellValue'][20] == [dr[1]]
+
+    @pytest.mark.parametrize('use_dat_value', (True, False))
+    def test_relational_reader(self, rr_temp_dir, use_dat_value):
+        rr = dat.RelationalReader(
+            path_or_file_system=rr_temp_dir,
+            read_options={
+                'specification': load(os.path.join(spec_dir, 'rr_test.py')),
+                'use_dat_value': use_dat_value,
+                'lazy': True,
+            },
+        )
+        main = rr['Main.dat']
+        assert main.table_data.decoded_rows == 0
+        for column, values in TestRelationalReader.relations_expected.items():
+            for i, row in enumerate(main):
+                expected = values[i]
+                if expected is not None:
+                    expected = rr['Other.dat'][expected]
+                assert row[column] == expected
+        for i, row in enumerate(main):
+            assert row['ConstTest'] == MOD_DOMAIN(i + 1)
+
+
+#
+# Columnar mode
+#
+
+@pytest.mark.skipif(dat.np is None, reason='numpy is not installed')
+class TestColumnar:
+    def test_values(self, testspec_dat_file):
+        spec = test_load()
+        row = dat.DatFile('TestSpec.dat').read(
+            testspec_dat_file, specification=spec, use_dat_value=False)[0]
+        dr = dat.DatFile('TestSpec.dat').read(
+            testspec_dat_file, specification=spec, use_dat_value=False,
+            columnar=True)
+
+        assert dr.table_data == []
+        assert list(dr.column_data) == list(dr.table_columns)
+        for name, column in dr.column_data.items():
+            assert column[0] == row[name], 'Value mismatch - %s' % name
+            assert column.to_list() == [row[name]]
+        assert dr.column_data['int'].data.dtype == dat.np.int32
+        assert dr.column_data['ulong'].data.dtype == dat.np.uint64
+        assert dr.column_data['ref|list|int'].data.tolist() == [[3, 34]]
+
+    def test_null_mask(self, rr_temp_dir):
+        df = dat.DatFile('Main.dat')
+        dr = df.read(
+            os.path.join(rr_temp_dir, 'Data', 'Main.dat'),
+            specification=load(os.path.join(spec_dir, 'rr_test.py')),
+            use_dat_value=False,
+            columnar=True,
+        )
+        column = dr.column_data['ForeignKeyNone']
+        assert column.mask.tolist() == [False, False, True]
+        assert column.to_list() == [0, 1, None]
+        assert list(column) == [0, 1, None]
+        assert column[-1] is None
+        assert column.masked().sum() == 1
+        assert dr.column_data['ConstTest'].to_list() == [1, 2, 3]
+
+    def test_dat_value(self, testspec_dat_file):
+        dr = dat.DatFile('TestSpec.dat').read(
+            testspec_dat_file, specification=test_load(), columnar=True)
+        value = dr.column_data['ref|string'][0]
+        assert isinstance(value, dat.DatValue)
+        assert value.get_value() == test_str
+
+
+class TestReadDatFiles:
+    @pytest.mark.parametrize('workers', (1, 2))
+    def test_read(self, rr_temp_dir, workers):
+        spec = load(os.path.join(spec_dir, 'rr_test.py'))
+        files = []
+        for file_name in ('Main.dat', 'Other.dat'):
+            with open(os.path.join(rr_temp_dir, 'Data', file_name), 'rb') as f:
+                files.append((file_name, f.read()))
+
+        result = dict(dat.read_dat_files(
+            files, workers=workers, specification=spec, auto_build_index=True,
+        ))
+
+        assert set(result) == {'Main.dat', 'Other.dat'}
+        for file_name, raw in files:
+            df = dat.DatFile(file_name)
+            df.read(raw, specification=spec, use_dat_value=False)
+            reader = result[file_name].reader
+            assert reader.table_data == df.reader.table_data
+            assert reader[0].rowid == 0
+            assert reader[0].parent is reader
+
+        other = result['Other.dat'].reader
+        assert other.index['Value'][20] is other[1]
+
+    def test_bounded(self, rr_temp_dir):
+        with open(os.path.join(rr_temp_dir, 'Data', 'Other.dat'), 'rb') as f:
+            raw = f.read()
+        spec = load(os.path.join(spec_dir, 'rr_test.py'))
+        read = []
+
+        def files():
+            for i in range(10):
+                read.append(i)
+                yield 'Other.dat', raw
+
+        result = dat.read_dat_files(files(), workers=2, specification=spec)
+        next(result)
+        assert len(read) <= 4
+        assert len(list(result)) == 9
+
+    @pytest.mark.parametrize('use_numpy', (True, False))
+    def test_column_values(self, testspec_dat_file, monkeypatch, use_numpy):
+        if use_numpy:
+            if dat.np is None:
+                pytest.skip('numpy is not installed')
+        else:
+            monkeypatch.setattr(dat, 'np', None)
+        spec = test_load()
+        dr = dat.DatReader(
+            'TestSpec.dat', specification=spec, use_dat_value=False)
+        dr.read(testspec_dat_file)
+        columns = pickle.loads(pickle.dumps(dr._get_column_values()))
+        kinds = [column[0] for column in columns]
+        if use_numpy:
+            assert kinds.count('array') == len(test_data)
+            assert 'strings' in kinds
+            assert 'list' in kinds
+        else:
+            assert set(kinds) == {'values'}
+
+        other = dat.DatReader(
+            'TestSpec.dat', specification=spec, use_dat_value=False)
+        # The values are not decoded again
+        monkeypatch.setattr(other, '_process_row', None)
+        monkeypatch.setattr(other, '_get_table_dtype', None)
+        other._read_column_values(testspec_dat_file, columns)
+        assert other.table_data == dr.table_data
+
+
 class TestSpecificationErrors:
     errors = (
         (
@@ -400,6 +729,16 @@ class TestSpecificationErrors:
 
     )
 
+    def test_pickle(self):
+        e = dat.SpecificationError(
+            dat.SpecificationError.ERRORS.RUNTIME_MISSING_SPECIFICATION,
+            'message',
+        )
+        e = pickle.loads(pickle.dumps(e))
+        assert e.code == \
+            dat.SpecificationError.ERRORS.RUNTIME_MISSING_SPECIFICATION
+        assert e.msg == 'message'
+
     @pytest.mark.parametrize('file_name,error', errors)
     def test_validation_errors(self, file_name, error):
         with pytest.raises(dat.SpecificationError) as e:
@@ -501,4 +840,27 @@ class TestRelationalReader():
 
     def test_getitem(self, rr_instance):
         assert rr_instance['Main.dat'] == \
-               rr_instance.get_file('Data/Main.dat').reader
\ No newline at end of file
+               rr_instance.get_file('Data/Main.dat').reader
+
+    def test_preload(self, rr_temp_dir):
+        rr = dat.RelationalReader(
+            path_or_file_system=rr_temp_dir,
+            read_options={
+                'specification': load(os.path.join(
+                    spec_dir, 'rr_test.py'
+                )),
+                'use_dat_value': False,
+            },
+        )
+        rr.preload(['Main.dat', 'Other.dat'], workers=2)
+        assert set(rr._preloaded) == {'Data/Main.dat', 'Data/Other.dat'}
+        assert not rr.files
+
+        for i, row in enumerate(rr['Main.dat']):
+            assert row['ForeignKey'] == rr['Other.dat'][i]
+        assert not rr._preloaded
+
+    def test_preload_dat_value(self, rr_temp_dir):
+        rr = dat.RelationalReader(path_or_file_system=rr_temp_dir)
+        with pytest.raises(ValueError):
+            rr.preload(['Main.dat'])
@@ -0,0 +1,372 @@
+"""
+Tests for PyPoE.poe.file.file_system
+
+Overview
+===============================================================================
+
++----------+------------------------------------------------------------------+
+| Path     | tests/PyPoE/poe/file/test_file_system.py                         |
++----------+------------------------------------------------------------------+
+| Version  | 1.0.0a0                                                          |
++----------+------------------------------------------------------------------+
+| Revision | $Id$                                                             |
++----------+------------------------------------------------------------------+
+| Author   | Omega_K2                                                         |
++----------+------------------------------------------------------------------+
+
+Description
+===============================================================================
+
+Tests for file_system.py
+
+Uses a game directory with bundles created by the helpers of test_bundle.py.
+
+Agreement
+===============================================================================
+
+See PyPoE/LICENSE
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+
+# Python
+import json
+import os
+
+# 3rd Party
+import brotli
+import pytest
+
+# self
+from PyPoE.poe.file import bundle
+from PyPoE.poe.file.file_system import FileSystem, LazyFileSystemNode
+from PyPoE.poe.file.shared import FILE_SYSTEM_TYPES, ParserError
+from test_bundle import CHUNK_SIZE, make_bundle, make_index, \
+    passthrough_decompress
+
+# =============================================================================
+# Setup
+# =============================================================================
+
+BUNDLE_DATA = [
+    bytes(range(0, 256)) * 2,
+    bytes(reversed(range(0, 256))) * 2,
+]
+
+DIRECTORIES = [
+    (b'Art/', [
+        (b'a.dds', 0, 0, 10),
+        (b'b.dds', 1, CHUNK_SIZE * 3 + 5, 20),
+        (b'c.dds', 0, CHUNK_SIZE * 10, CHUNK_SIZE * 2),
+    ]),
+    (b'Data/', [
+        (b'Mods.dat', 1, 100, 7),
+        (b'Empty.dat', 1, 50, 0),
+    ]),
+]
+
+FILES = {
+    directory.decode() + name.decode():
+        BUNDLE_DATA[bundle_id][offset:offset+size]
+    for directory, files in DIRECTORIES
+    for name, bundle_id, offset, size in files
+}
+FILES['disk.txt'] = b'on disk'
+
+DDS_PLAIN = b'DDS ' + bytes(range(60))
+DDS_DECOMPRESSED = b'DDS ' + bytes(reversed(range(100)))
+
+DDS_FILES = {
+    'Textures/plain.dds': DDS_PLAIN,
+    'Textures/compressed.dds': len(DDS_DECOMPRESSED).to_bytes(4, 'little') +
+    brotli.compress(DDS_DECOMPRESSED),
+    'Textures/ref.dds': b'*Textures/compressed.dds',
+    'Textures/ref_ref.dds': b'*Textures/ref.dds',
+    'Textures/ref_plain.dds': b'*Textures/plain.dds',
+    'Textures/missing_ref.dds': b'*Textures/missing.dds',
+    'Textures/loop_a.dds': b'*Textures/loop_b.dds',
+    'Textures/loop_b.dds': b'*Textures/loop_a.dds',
+}
+
+DDS_EXPECTED = {
+    'Textures/plain.dds': DDS_PLAIN,
+    'Textures/compressed.dds': DDS_DECOMPRESSED,
+    'Textures/ref.dds': DDS_DECOMPRESSED,
+    'Textures/ref_ref.dds': DDS_DECOMPRESSED,
+    'Textures/ref_plain.dds': DDS_PLAIN,
+}
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def decompress_calls(monkeypatch):
+    calls = []
+
+    def decompress(self, chunks, workers=1):
+        calls.append(list(chunks))
+        return passthrough_decompress(self, chunks, workers)
+
+    monkeypatch.setattr(bundle.Bundle, '_decompress_chunks', decompress)
+    return calls
+
+
+@pytest.fixture
+def root_path(tmpdir):
+    bundles = tmpdir.mkdir('Bundles2')
+    bundles.join('_.index.bin').write_binary(make_index(DIRECTORIES))
+    for i, data in enumerate(BUNDLE_DATA):
+        bundles.join('bundle%s.bundle.bin' % i).write_binary(make_bundle(data))
+    tmpdir.join('disk.txt').write_binary(FILES['disk.txt'])
+    return str(tmpdir)
+
+
+@pytest.fixture
+def file_system(root_path, decompress_calls):
+    fs = FileSystem(root_path)
+    decompress_calls.clear()
+    return fs
+
+
+@pytest.fixture
+def dds_file_system(root_path, decompress_calls):
+    textures = os.path.join(root_path, 'Textures')
+    os.mkdir(textures)
+    for name, data in DDS_FILES.items():
+        with open(os.path.join(root_path, name), 'wb') as f:
+            f.write(data)
+    return FileSystem(root_path, stats=True)
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+class TestFileSystem:
+    @pytest.mark.parametrize('path', FILES)
+    def test_get_file(self, file_system, path):
+        assert file_system.get_file(path) == FILES[path]
+
+    def test_get_file_missing(self, file_system):
+        with pytest.raises(FileNotFoundError):
+            file_system.get_file('Art/missing.dds')
+
+    def test_get_files(self, file_system, decompress_calls):
+        result = dict(file_system.get_files(list(FILES)))
+        assert result == FILES
+        # Only the required chunks, each bundle at once
+        assert sorted(decompress_calls) == [[0, 10, 11], [3, 4, 6]]
+
+    def test_get_files_missing(self, file_system):
+        with pytest.raises(FileNotFoundError):
+            dict(file_system.get_files(['Art/a.dds', 'Art/missing.dds']))
+
+        result = dict(file_system.get_files(
+            ['Art/a.dds', 'Art/missing.dds'], ignore_missing=True))
+        assert result == {'Art/a.dds': FILES['Art/a.dds']}
+
+    def test_bundle_disk_cache(self, root_path, decompress_calls, tmpdir):
+        cache_dir = str(tmpdir.join('cache'))
+        fs = FileSystem(root_path, bundle_cache_dir=cache_dir)
+        decompress_calls.clear()
+        assert fs.get_file('Art/a.dds') == FILES['Art/a.dds']
+        # Bundles are decompressed entirely to be stored
+        assert decompress_calls == [list(range(0, 32))]
+        assert len(os.listdir(cache_dir)) == 1
+
+        fs = FileSystem(root_path, bundle_cache_dir=cache_dir)
+        decompress_calls.clear()
+        assert fs.get_file('Art/a.dds') == FILES['Art/a.dds']
+        assert fs.get_file('Art/c.dds') == FILES['Art/c.dds']
+        assert decompress_calls == []
+        assert fs.bundle_disk_cache.hits == 1
+
+    def test_exists(self, file_system, decompress_calls):
+        for path in FILES:
+            assert file_system.exists(path)
+        assert not file_system.exists('Art/missing.dds')
+        assert not file_system.exists('Art')
+        assert decompress_calls == []
+
+    def test_resolution_cache(self, file_system, root_path):
+        assert not file_system.exists('new.txt')
+        with open(os.path.join(root_path, 'new.txt'), 'wb') as f:
+            f.write(b'new')
+        # Misses are remembered
+        assert not file_system.exists('new.txt')
+        file_system.clear_resolution_cache()
+        assert file_system.get_file('new.txt') == b'new'
+
+        os.remove(os.path.join(root_path, 'new.txt'))
+        with pytest.raises(FileNotFoundError):
+            file_system.get_file('new.txt')
+
+    def test_resolution_cache_reload(self, file_system, root_path):
+        file_system.resolution_check_interval = 0
+        index = file_system.index
+        assert file_system.get_file('Art/a.dds') == FILES['Art/a.dds']
+        assert not file_system.exists('Art/new.dds')
+
+        index_path = os.path.join(root_path, bundle.Index.PATH)
+        with open(index_path, 'wb') as f:
+            f.write(make_index(
+                DIRECTORIES + [(b'Art/', [(b'new.dds', 0, 20, 5)])]))
+        assert file_system.get_file('Art/new.dds') == BUNDLE_DATA[0][20:25]
+        assert file_system.index is not index
+
+    def test_reload_closes_ggpk(self, file_system):
+        class GGPK:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        ggpk = file_system.ggpk = GGPK()
+        file_system.reload()
+        assert ggpk.closed
+        assert file_system.ggpk is None
+
+    def test_listdir(self, file_system, root_path, decompress_calls):
+        os.mkdir(os.path.join(root_path, 'Art'))
+        with open(os.path.join(root_path, 'Art', 'disk.dds'), 'wb') as f:
+            f.write(b'')
+        assert file_system.listdir() == ['Art', 'Bundles2', 'Data', 'disk.txt']
+        assert file_system.listdir('Art/') == \
+            ['a.dds', 'b.dds', 'c.dds', 'disk.dds']
+        assert file_system.listdir('Data') == ['Empty.dat', 'Mods.dat']
+        assert file_system.listdir('missing') == []
+        assert decompress_calls == []
+
+    def test_scandir(self, file_system):
+        entries = file_system.scandir()
+        assert entries['Art'] == (False, FILE_SYSTEM_TYPES.BUNDLE)
+        assert entries['disk.txt'] == (True, FILE_SYSTEM_TYPES.DISK)
+        assert file_system.scandir('Art')['a.dds'] == \
+            (True, FILE_SYSTEM_TYPES.BUNDLE)
+
+    def test_walk(self, file_system):
+        result = list(file_system.walk())
+        assert result[0] == ('', ['Art', 'Bundles2', 'Data'], ['disk.txt'])
+        assert result[1] == ('Art', [], ['a.dds', 'b.dds', 'c.dds'])
+        assert [path for path, _, _ in result] == \
+            ['', 'Art', 'Bundles2', 'Data']
+
+        # Pruning
+        result = []
+        for path, directories, files in file_system.walk():
+            directories[:] = [d for d in directories if d != 'Bundles2']
+            result.extend(path + '/' + f if path else f for f in files)
+        assert sorted(result) == sorted(FILES)
+
+    @pytest.mark.parametrize('pattern,expected', (
+        ('Art/*.dds', ['Art/a.dds', 'Art/b.dds', 'Art/c.dds']),
+        ('Art/[ab].dds', ['Art/a.dds', 'Art/b.dds']),
+        ('*/Mods.dat', ['Data/Mods.dat']),
+        ('**/*.dat', ['Data/Empty.dat', 'Data/Mods.dat']),
+        ('*.txt', ['disk.txt']),
+        ('Data/**', ['Data/Empty.dat', 'Data/Mods.dat']),
+        ('Missing/*.dds', []),
+    ))
+    def test_glob(self, file_system, pattern, expected):
+        assert file_system.glob(pattern) == expected
+
+    def test_build_directory(self, file_system):
+        root = file_system.build_directory()
+        assert root['Art/a.dds'].data == FILES['Art/a.dds']
+        assert root['disk.txt'].data == FILES['disk.txt']
+
+    def test_build_directory_lazy(self, file_system):
+        root = file_system.build_directory(lazy=True)
+        assert isinstance(root, LazyFileSystemNode)
+        assert root._children == {}
+        node = root['Art/b.dds']
+        assert node.data == FILES['Art/b.dds']
+        # Only the directories along the path are listed
+        assert set(root._children) == {'Art', 'Bundles2', 'Data', 'disk.txt'}
+        assert root._children['Data']._children == {}
+        assert sorted(root['Data'].children) == ['Empty.dat', 'Mods.dat']
+
+
+class TestFileSystemStats:
+    def test_disabled(self, file_system):
+        assert file_system.stats is None
+        assert file_system.get_file('Art/a.dds') == FILES['Art/a.dds']
+
+    def test_counters(self, root_path, decompress_calls):
+        fs = FileSystem(root_path, stats=True)
+        assert fs.get_file('Art/a.dds') == FILES['Art/a.dds']
+        assert fs.get_file('Art/a.dds') == FILES['Art/a.dds']
+        assert fs.get_file('disk.txt') == FILES['disk.txt']
+        dict(fs.get_files(['Data/Mods.dat']))
+
+        counters = fs.stats.counters
+        assert counters['resolve'] == {'cache_hits': 1, 'cache_misses': 3}
+        assert counters['bundle']['calls'] == 3
+        assert counters['bundle']['bytes_read'] == 27
+        assert counters['bundle']['cache_hits'] == 1
+        assert counters['bundle']['cache_misses'] == 2
+        assert counters['bundle']['chunks_decompressed'] == 2
+        assert counters['bundle']['bytes_decompressed'] == CHUNK_SIZE * 2
+        assert counters['disk'] == {'calls': 1, 'bytes_read': 7}
+        assert fs.stats.files['Art/a.dds'] == 2
+        assert fs.stats.timings['bundle.decompress']['count'] == 2
+        assert sum(fs.stats.timings['disk.read']['histogram']) == 1
+
+    def test_dump(self, root_path, decompress_calls, tmpdir):
+        fs = FileSystem(root_path, stats=True)
+        fs.get_file('Art/a.dds')
+        path = str(tmpdir.join('stats.json'))
+        fs.stats.dump(path)
+        with open(path) as f:
+            data = json.load(f)
+        assert data['counters']['bundle']['calls'] == 1
+        assert data['files'] == {'Art/a.dds': 1}
+        assert sum(data['timings']['resolve']['histogram'].values()) == 1
+        assert 'Art/a.dds: 1' in fs.stats.get_summary()
+
+        fs.stats.reset()
+        assert fs.stats.as_dict() == {
+            'counters': {}, 'timings': {}, 'files': {}}
+
+
+class TestExtractDDSMany:
+    @pytest.mark.parametrize('workers', (1, 2))
+    def test_extract_dds_many(self, dds_file_system, workers):
+        result = dict(dds_file_system.extract_dds_many(
+            DDS_EXPECTED, workers=workers))
+        assert result == DDS_EXPECTED
+        # Shared textures are read and decompressed once
+        assert dds_file_system.stats.files['Textures/compressed.dds'] == 1
+        assert dds_file_system.stats.timings['dds.decompress']['count'] == 1
+
+    def test_reference_before_target(self, dds_file_system):
+        paths = [
+            'Textures/ref_ref.dds', 'Textures/ref.dds',
+            'Textures/compressed.dds',
+        ]
+        result = dict(dds_file_system.extract_dds_many(paths))
+        assert result == {path: DDS_EXPECTED[path] for path in paths}
+        for path in paths:
+            assert dds_file_system.stats.files[path] == 1
+
+    def test_matches_extract_dds(self, dds_file_system):
+        for path, data in dds_file_system.extract_dds_many(DDS_EXPECTED):
+            assert dds_file_system.extract_dds(
+                dds_file_system.get_file(path)) == data
+
+    def test_missing(self, dds_file_system):
+        paths = ['Textures/plain.dds', 'Textures/missing_ref.dds']
+        with pytest.raises(FileNotFoundError):
+            dict(dds_file_system.extract_dds_many(paths))
+
+        result = dict(dds_file_system.extract_dds_many(
+            paths, ignore_missing=True))
+        assert result == {'Textures/plain.dds': DDS_PLAIN}
+
+    def test_circular(self, dds_file_system):
+        with pytest.raises(ParserError):
+            dict(dds_file_system.extract_dds_many(['Textures/loop_a.dds']))
@@ -34,13 +34,18 @@ See PyPoE/LICENSE
 # =============================================================================
 
 # Python
+import hashlib
 import os
+import struct
+from io import BytesIO
 from tempfile import TemporaryDirectory
 
 # 3rd Party
 import pytest
 
 # self
+from PyPoE.poe.file import ggpk
+from PyPoE.shared.murmur2 import murmur2_32
 
 # =============================================================================
 # Setup
@@ -50,11 +55,426 @@ DDS_UNCOMPRESSED = 'Art/Textures/Characters/Adventurer/' \
                    'adventurerPalid_colour.dds'
 DDS_COMPRESSED = 'Art/2DArt/BuffIcons/AssassinsMark.dds'
 
+TREE = {
+    'Art': {
+        'a.dds': b'a' * 10,
+        'Textures': {
+            'b.dds': b'b' * 5,
+        },
+    },
+    'Data': {
+        'Mods.dat': b'mods',
+        'Empty.dat': b'',
+    },
+    'root.txt': b'root',
+}
+
+
+def make_name(name):
+    return struct.pack('<i', len(name) + 1), \
+        name.encode('UTF-16_LE') + b'\x00\x00'
+
+
+def make_hash(data):
+    return hashlib.sha256(data).digest()
+
+
+def make_file(name, data):
+    name_length, name_raw = make_name(name)
+    return b''.join([
+        struct.pack('<i', 44 + len(name_raw) + len(data)), b'FILE',
+        name_length, make_hash(data), name_raw, data,
+    ])
+
+
+def make_directory(name, entries, hash):
+    name_length, name_raw = make_name(name)
+    entries_raw = b''.join(
+        struct.pack('<Iq', murmur2_32(entry_name.lower().encode('UTF-16_LE')),
+                    offset)
+        for entry_name, offset in entries
+    )
+    return b''.join([
+        struct.pack('<i', 48 + len(name_raw) + len(entries_raw)), b'PDIR',
+        name_length, struct.pack('<i', len(entries)), hash,
+        name_raw, entries_raw,
+    ])
+
+
+def make_ggpk(tree, garbage=b''):
+    """
+    Lays out the GGPK record, the children of each directory followed by the
+    directory itself and a free record. garbage is inserted before the root
+    directory record.
+    """
+    out = [b'']
+    offset = 28
+
+    def add_children(node):
+        # The directory hash covers the names and hashes of its children
+        entries = []
+        hashes = []
+        for child in node:
+            child_offset, child_hash = add(child, node[child])
+            entries.append((child, child_offset))
+            hashes.append(child.encode() + child_hash)
+        return entries, make_hash(b''.join(hashes))
+
+    def add(name, node):
+        nonlocal offset
+        if isinstance(node, bytes):
+            raw = make_file(name, node)
+            hash = make_hash(node)
+        else:
+            entries, hash = add_children(node)
+            raw = make_directory(name, entries, hash)
+        out.append(raw)
+        offset += len(raw)
+        return offset - len(raw), hash
+
+    entries, hash = add_children(tree)
+    out.append(garbage)
+    offset += len(garbage)
+    root_offset = offset
+    out.append(make_directory('', entries, hash))
+    offset += len(out[-1])
+    out.append(struct.pack('<i', 32) + b'FREE' + struct.pack('<q', 0) +
+               b'\x00' * 16)
+    out[0] = struct.pack('<i', 28) + b'GGPK' + struct.pack(
+        '<iqq', 2, root_offset, offset)
+    return b''.join(out)
+
+
+def read_records_legacy(raw):
+    # Reads the records with the buffer based record readers
+    buffer = BytesIO(raw)
+    records = {}
+    offset = 0
+    while offset < len(raw):
+        buffer.seek(offset)
+        length, tag = struct.unpack('<i4s', buffer.read(8))
+        record = ggpk.GGPKFile._RECORD_TYPES[tag](None, length, offset)
+        record.read(buffer)
+        records[offset] = record
+        offset = buffer.tell()
+    return records
+
+
+def record_values(record):
+    return {
+        key: getattr(record, key) for key in record.__slots__
+        if key not in ('_container', 'entries') and hasattr(record, key)
+    }
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def ggpk_raw():
+    return make_ggpk(TREE)
+
+
+@pytest.fixture
+def ggpk_file(ggpk_raw, tmpdir):
+    path = str(tmpdir.join('content.ggpk'))
+    with open(path, 'wb') as f:
+        f.write(ggpk_raw)
+    g = ggpk.GGPKFile()
+    g.read(path)
+    return g
+
 # =============================================================================
 # Tests
 # =============================================================================
 
 
+class TestGGPKFile:
+    def test_read(self, ggpk_file, ggpk_raw):
+        legacy = read_records_legacy(ggpk_raw)
+        assert list(ggpk_file.records) == list(legacy)
+        for offset, record in ggpk_file.records.items():
+            assert type(record) is type(legacy[offset])
+            assert record_values(record) == record_values(legacy[offset])
+            if isinstance(record, ggpk.DirectoryRecord):
+                assert [(e.hash, e.offset) for e in record.entries] == \
+                    [(e.hash, e.offset) for e in legacy[offset].entries]
+
+    def test_read_raw(self, ggpk_file, ggpk_raw):
+        g = ggpk.GGPKFile()
+        g.read(ggpk_raw)
+        assert list(g.records) == list(ggpk_file.records)
+
+    def test_read_invalid_tag(self, ggpk_raw):
+        g = ggpk.GGPKFile()
+        with pytest.warns(UserWarning):
+            g.read(make_ggpk(TREE, garbage=b'\x10\x00\x00\x00JUNK1234'))
+        assert len(g.records) == len(read_records_legacy(ggpk_raw))
+
+    def test_cache(self, ggpk_file, tmpdir):
+        cache_dir = str(tmpdir.join('cache'))
+        g = ggpk.GGPKFile(cache_dir=cache_dir)
+        g.read(ggpk_file._file_path_or_raw)
+        assert len(os.listdir(cache_dir)) == 1
+
+        g = ggpk.GGPKFile(cache_dir=cache_dir)
+        g._read_records = None
+        g.read(ggpk_file._file_path_or_raw)
+        assert list(g.records) == list(ggpk_file.records)
+        for offset, record in g.records.items():
+            assert record_values(record) == \
+                record_values(ggpk_file.records[offset])
+        g.directory_build()
+        assert g['Art/a.dds'].record.extract().read() == b'a' * 10
+
+    def test_cache_stale(self, ggpk_file, tmpdir):
+        cache_dir = str(tmpdir.join('cache'))
+        path = ggpk_file._file_path_or_raw
+        ggpk.GGPKFile(cache_dir=cache_dir).read(path)
+
+        tree = dict(TREE, **{'new.txt': b'new'})
+        with open(path, 'wb') as f:
+            f.write(make_ggpk(tree))
+        g = ggpk.GGPKFile(cache_dir=cache_dir)
+        g.read(path)
+        g.directory_build()
+        assert g['new.txt'].record.extract().read() == b'new'
+
+    def test_cache_invalid(self, ggpk_file, tmpdir):
+        cache_dir = tmpdir.join('cache')
+        path = ggpk_file._file_path_or_raw
+        ggpk.GGPKFile(cache_dir=str(cache_dir)).read(path)
+        for cache_file in cache_dir.listdir():
+            cache_file.write_binary(cache_file.read_binary()[:-10])
+
+        g = ggpk.GGPKFile(cache_dir=str(cache_dir))
+        g.read(path)
+        assert list(g.records) == list(ggpk_file.records)
+
+    def test_cache_old_version(self, ggpk_file, tmpdir):
+        cache_dir = tmpdir.join('cache')
+        path = ggpk_file._file_path_or_raw
+        ggpk.GGPKFile(cache_dir=str(cache_dir)).read(path)
+        for cache_file in cache_dir.listdir():
+            data = cache_file.read_binary()
+            cache_file.write_binary(
+                data[:8] + struct.pack('<I', 1) + data[12:])
+
+        g = ggpk.GGPKFile(cache_dir=str(cache_dir))
+        read_records = g._read_records
+        called = []
+        g._read_records = lambda data: called.append(1) or read_records(data)
+        g.read(path)
+        assert called
+        assert list(g.records) == list(ggpk_file.records)
+
+    def test_get_data(self, ggpk_file):
+        ggpk_file.directory_build()
+        record = ggpk_file['Art/a.dds'].record
+        assert record.get_data() == b'a' * 10
+        view = record.get_data(copy=False)
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view == b'a' * 10
+        view.release()
+        assert record.extract().read() == b'a' * 10
+
+        ggpk_file.close()
+        assert record.get_data() == b'a' * 10
+
+    def test_get_data_raw(self, ggpk_raw):
+        g = ggpk.GGPKFile()
+        g.read(ggpk_raw)
+        g.directory_build()
+        assert g['root.txt'].record.get_data() == b'root'
+
+    def test_extract_many(self, ggpk_file):
+        ggpk_file.directory_build()
+        records = [
+            ggpk_file[path].record
+            for path in ('root.txt', 'Data/Mods.dat', 'Art/a.dds')
+        ]
+        result = list(ggpk_file.extract_many(records))
+        assert [r.name for r, data in result] == \
+            [r.name for r in sorted(records, key=lambda r: r.data_start)]
+        assert {r.name: data for r, data in result} == {
+            'root.txt': b'root', 'Mods.dat': b'mods', 'a.dds': b'a' * 10,
+        }
+
+    def test_build_directory(self, ggpk_file):
+        ggpk_file.directory_build()
+        assert ggpk_file['Art/Textures/b.dds'].record.extract().read() == \
+            b'b' * 5
+        assert ggpk_file['Data/Empty.dat'].record.extract().read() == b''
+        assert ggpk_file['root.txt'].record.extract().read() == b'root'
+
+    def test_build_directory_lazy(self, ggpk_file):
+        root = ggpk_file.directory_build(lazy=True)
+        assert isinstance(root, ggpk.LazyDirectoryNode)
+        assert root._children == {}
+
+        node = ggpk_file['Art/Textures/b.dds']
+        assert node.record.extract().read() == b'b' * 5
+        assert node.get_path() == 'Art/Textures/b.dds'
+        assert list(root._children) == ['Art']
+        assert list(root._children['Art']._children) == ['Textures']
+
+        with pytest.raises(FileNotFoundError):
+            ggpk_file['Art/missing.dds']
+        with pytest.raises(FileNotFoundError):
+            ggpk_file['art/a.dds']
+
+        # Accessing the children creates the remaining nodes
+        assert sorted(root.children) == ['Art', 'Data', 'root.txt']
+        assert sorted(root['Art'].children) == ['Textures', 'a.dds']
+        assert root['Art']['Textures'] is node.parent
+
+    def test_build_directory_lazy_walk(self, ggpk_file):
+        paths = []
+        ggpk_file.directory_build(lazy=True).walk(
+            lambda node, depth: paths.append(node.get_path())
+        )
+        expected = []
+        ggpk_file.directory_build().walk(
+            lambda node, depth: expected.append(node.get_path())
+        )
+        assert sorted(paths) == sorted(expected)
+
+
+class TestDirectoryNode:
+    @pytest.fixture(params=[False, True], ids=['eager', 'lazy'])
+    def root(self, request, ggpk_file):
+        return ggpk_file.directory_build(lazy=request.param)
+
+    def test_getitem(self, root):
+        assert root['Art/Textures/b.dds'].name == 'b.dds'
+        assert root['Art']['Textures/b.dds'] is root['/Art/Textures/b.dds/']
+        assert root[''] is root
+        with pytest.raises(FileNotFoundError):
+            root['Art/a.dds/b.dds']
+
+    def test_index(self, root):
+        index = root.get_index()
+        assert root.get_index() is index
+        assert len(index) == 9
+        assert index['Art/Textures/b.dds'] is root['Art/Textures/b.dds']
+        assert index['Art\\a.dds'] is root['Art/a.dds']
+        assert index[''] is root
+        assert 'art/a.dds' not in index
+        with pytest.raises(FileNotFoundError):
+            index['art/a.dds']
+
+    def test_index_case_insensitive(self, root):
+        index = root.get_index(case_sensitive=False)
+        assert index['ART/A.DDS'] is root['Art/a.dds']
+        assert [n.name for n in index.glob('data/*.DAT')] == \
+            ['Empty.dat', 'Mods.dat']
+
+    def test_prefix(self, root):
+        index = root.get_index()
+        assert [n.get_path() for n in index.prefix('Art/')] == \
+            ['Art/Textures', 'Art/Textures/b.dds', 'Art/a.dds']
+        assert [n.get_path() for n in index.prefix('Data/M')] == \
+            ['Data/Mods.dat']
+        assert index.prefix('Missing') == []
+
+    def test_glob(self, root):
+        index = root.get_index()
+        assert [n.get_path() for n in index.glob('*.dds')] == \
+            ['Art/Textures/b.dds', 'Art/a.dds']
+        assert [n.get_path() for n in index.glob('Data/[E]*')] == \
+            ['Data/Empty.dat']
+
+    def test_search(self, root):
+        assert [n.get_path() for n in root.search(r'\.dat$')] == \
+            ['Data/Empty.dat', 'Data/Mods.dat']
+        assert [n.get_path() for n in root.search(
+            't', search_files=False)] == ['Art', 'Art/Textures', 'Data']
+        assert [n.get_path() for n in root['Art'].search(
+            'b', search_directories=False)] == ['Art/Textures/b.dds']
+
+    def test_search_live(self, ggpk_file):
+        root = ggpk_file.directory_build()
+        assert root._path_indexes is None
+        root.get_index()
+        art = root['Art']
+        art.children['Mods.dat'] = ggpk.DirectoryNode(
+            record=root['Data/Mods.dat'].record, parent=art, is_file=True,
+            hash=0)
+        # Invalidating a node also invalidates the indexes of its parents
+        art.invalidate_index()
+        assert [n.get_path() for n in root.search(r'\.dat$')] == \
+            ['Art/Mods.dat', 'Data/Empty.dat', 'Data/Mods.dat']
+
+    def test_index_cached(self, root):
+        # Creating the nodes of lazy trees must not discard the new index
+        index = root.get_index()
+        assert root.get_index() is index
+
+    def test_invalidate_index(self, root):
+        index = root.get_index()
+        root.invalidate_index()
+        assert root.get_index() is not index
+
+
+class TestDiff:
+    def read(self, tree, lazy=False):
+        g = ggpk.GGPKFile()
+        g.read(make_ggpk(tree))
+        g.directory_build(lazy=lazy)
+        return g
+
+    @pytest.fixture
+    def other_tree(self):
+        return {
+            'Art': {
+                'a.dds': b'changed',
+                'Textures': {
+                    'b.dds': b'b' * 5,
+                },
+                'Removed': {
+                    'c.dds': b'c',
+                    'Deeper': {
+                        'd.dds': b'd',
+                    },
+                },
+            },
+            'Data': {
+                'Mods.dat': b'mods',
+                'Empty.dat': b'',
+            },
+            'root.txt': {
+                'now a directory.txt': b'',
+            },
+        }
+
+    def test_diff(self, other_tree):
+        g = self.read(TREE)
+        other = self.read(other_tree)
+        assert g.diff(other) == (
+            ['root.txt'],
+            ['Art/Removed/Deeper/d.dds', 'Art/Removed/c.dds',
+             'root.txt/now a directory.txt'],
+            ['Art/a.dds'],
+        )
+
+    def test_iter_diff_prunes(self, other_tree):
+        g = self.read(TREE, lazy=True)
+        other = self.read(other_tree, lazy=True)
+        events = list(g.iter_diff(other))
+        assert (ggpk.DIFF_TYPES.CHANGED, 'Art/a.dds') in events
+        assert len(events) == 5
+        # Identical directories are never expanded
+        assert g['Data']._children == {}
+        assert g['Art']['Textures']._children == {}
+
+    def test_iter_diff_identical(self):
+        g = self.read(TREE, lazy=True)
+        assert list(g.iter_diff(self.read(TREE, lazy=True))) == []
+        assert g.directory._children == {}
+
+
 # These tests will raise errors if something is wrong, like decompression
 # errors
 class TestDDSExtract: